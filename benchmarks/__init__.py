@@ -0,0 +1,3 @@
+"""
+Benchmarks of cubingtools' hot paths. Run ``python -m benchmarks --help`` from the repository root.
+"""
@@ -0,0 +1,57 @@
+"""
+Measures how long ``import cubingtools`` takes in a fresh interpreter, and checks it against a budget.
+
+>>> python -m benchmarks.importtime --budget 60     # exit code 1 if the median is over 60 ms
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+########################################################################################################################
+
+def importTimes(module: str = "cubingtools", runs: int = 10) -> list[float]:
+    """Returns the cumulative import time of ``module`` (in seconds) in each of ``runs`` fresh interpreters."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    out = []
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                              env=env, capture_output=True, text=True, check=True)
+        # lines look like "import time:  self [us] | cumulative | module", the module itself coming last
+        for line in reversed(proc.stderr.splitlines()):
+            fields = [f.strip() for f in line.split('|')]
+            if len(fields) == 3 and fields[2] == module:
+                out.append(int(fields[1]) / 1e6)
+                break
+        else:
+            raise RuntimeError(f"No import time reported for {module}")
+    return out
+
+def importCase(module: str = "cubingtools", runs: int = 10) -> dict:
+    """Returns import times in the same shape as ``run.timeCase`` results."""
+    times = importTimes(module, runs)
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "number": 1,
+        "repeat": runs,
+    }
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.importtime", description=__doc__.strip().split('\n')[0])
+    parser.add_argument("--budget", type=float, default=60.0, help="maximum median import time, in milliseconds")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--module", default="cubingtools")
+    args = parser.parse_args(argv)
+
+    res = importCase(args.module, args.runs)
+    print(f"import {args.module}: median {res['median'] * 1e3:.1f} ms, best {res['min'] * 1e3:.1f} ms "
+          f"(budget {args.budget:.0f} ms)")
+    return 0 if res["median"] * 1e3 <= args.budget else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
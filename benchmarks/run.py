@@ -0,0 +1,111 @@
+"""
+Runs the benchmark suite, writes the results as JSON, and compares them against a stored baseline.
+Run from the repository root with cubingtools installed (e.g. ``pip install -e .``).
+
+>>> python -m benchmarks --json results.json                          # run everything
+>>> python -m benchmarks --baseline benchmarks/baseline.json          # fail on slowdowns
+>>> python -m benchmarks --filter turn/ --quick --save-baseline benchmarks/baseline.json
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import timeit
+from typing import Callable
+
+import cubingtools
+from .suite import cases
+from .importtime import importCase
+
+########################################################################################################################
+
+def timeCase(fn: Callable[[], object], repeat: int = 5, minTime: float = 0.2) -> dict:
+    """
+    Times a callable, returning seconds per call.
+
+    :param fn: The operation to time.
+    :param repeat: How many timed rounds to run.
+    :param minTime: The least time each round takes (the number of calls per round is picked to reach it).
+    """
+    timer = timeit.Timer(fn)
+    number = 1
+    while (t := timer.timeit(number)) < minTime:
+        number = max(number * 2, int(number * minTime / t) + 1) if t > 0 else number * 10
+    times = [t / number for t in timer.repeat(repeat, number)]
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "number": number,
+        "repeat": repeat,
+    }
+
+def runSuite(pattern: str = '', repeat: int = 5, minTime: float = 0.2, log=None) -> dict:
+    """Runs every case whose name contains ``pattern``, returning the full JSON report."""
+    results = {}
+    for name, fn in cases().items():
+        if pattern not in name: continue
+        results[name] = timeCase(fn, repeat, minTime)
+        if log: log(f"{name:<28} {results[name]['min'] * 1e6:12.2f} us")
+    if pattern in "import/cubingtools":
+        results["import/cubingtools"] = importCase(runs=repeat * 2)
+        if log: log(f"{'import/cubingtools':<28} {results['import/cubingtools']['min'] * 1e6:12.2f} us")
+    return {
+        "meta": {
+            "cubingtools": cubingtools.__version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+
+def compare(current: dict, baseline: dict, threshold: float = 1.25) -> list[dict]:
+    """
+    Returns the cases of ``current`` slower than in ``baseline`` by more than ``threshold`` times (by best time).
+    Cases missing from either report are skipped.
+    """
+    slower = []
+    for name, res in current["results"].items():
+        if (base := baseline["results"].get(name)) is None: continue
+        ratio = res["min"] / base["min"] if base["min"] > 0 else float('inf')
+        if ratio > threshold:
+            slower.append({"name": name, "baseline": base["min"], "current": res["min"], "ratio": ratio})
+    return slower
+
+########################################################################################################################
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark cubingtools' hot paths.")
+    parser.add_argument("--filter", default='', help="only run cases whose name contains this")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="compare against this results file, failing on regressions")
+    parser.add_argument("--save-baseline", help="also write the results to this baseline file")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio counted as a regression")
+    parser.add_argument("--quick", action="store_true", help="fewer, shorter rounds (noisier)")
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print('\n'.join(name for name in cases() if args.filter in name))
+        return 0
+
+    repeat, minTime = (3, 0.05) if args.quick else (5, 0.2)
+    report = runSuite(args.filter, repeat, minTime, log=print)
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, 'w') as f: json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f: baseline = json.load(f)
+        slower = compare(report, baseline, args.threshold)
+        for s in slower:
+            print(f"REGRESSION {s['name']}: {s['baseline'] * 1e6:.2f} us -> {s['current'] * 1e6:.2f} us "
+                  f"({s['ratio']:.2f}x)", file=sys.stderr)
+        return 1 if slower else 0
+    return 0
@@ -0,0 +1,68 @@
+"""
+The benchmark cases: each maps a name to a zero-argument callable timing one operation.
+"""
+
+from __future__ import annotations
+from typing import Callable
+
+from cubingtools import CubeN, Algorithm, Metric, size, order, equiv, scramble_batch, apply_many
+from cubingtools.move import Move
+from cubingtools.algorithm import simplified, reduced
+
+########################################################################################################################
+
+T_PERM = "R U R' U' R' F R2 U' R' U' R U R' F'"
+# last-layer algorithms under every pair of U-layer adjustments: 64 algorithms sharing long prefixes
+AUF = ("", "U", "U2", "U'")
+CORPUS = [f"{pre} {alg} {post}" for pre in AUF for post in AUF
+          for alg in (T_PERM, "R U R' U' R' F R F'", "R U R' U R U2 R'", "F R U R' U' F'")]
+LONG_ALG = ' '.join([T_PERM, "R R' U2 U2 L2 R L' x y' M2 E S'", "3Rw' Uw2 f r' u", T_PERM])
+
+# one representative move of each kind CubeN._turn expands differently, with the smallest size it fits
+TURNS = {
+    "face": ("R", 2),
+    "face-d": ("D'", 2),
+    "wide": ("Rw", 3),
+    "deep-wide": ("3Fw2", 4),
+    "slice": ("M", 3),
+    "lower": ("r", 3),
+    "rotation": ("x", 2),
+}
+TURN_SIZES = (3, 7, 20)
+
+def cases() -> dict[str, Callable[[], object]]:
+    """Returns every benchmark case, in a stable order."""
+    out = {
+        "Move.parse": lambda: Move.parse("3Rw'"),
+        "Algorithm._parse": lambda: Algorithm(LONG_ALG),
+        "simplified": _withAlg(simplified),
+        "reduced": _withAlg(reduced),
+    }
+    for metric in Metric:
+        out[f"size/{metric}"] = _withAlg(lambda alg, m=metric: size(alg, m))
+
+    for n in TURN_SIZES:
+        for kind, (mv, smallest) in TURNS.items():
+            if n >= smallest: out[f"turn/{n}/{kind}"] = _turnCase(n, Move.parse(mv))
+
+    out["order"] = lambda: order(Algorithm("R U"))
+    out["equiv"] = lambda: equiv(Algorithm(T_PERM), -Algorithm(T_PERM))
+    for n in (3, 7):
+        out[f"scramble/{n}"] = _scrambleCase(n)
+    out["scramble_batch/3x1000"] = lambda: scramble_batch(3, 1000, seed=0)
+    out["apply_many/3x64"] = lambda: apply_many(CubeN(3), CORPUS)
+    out["CubeN/construct"] = lambda: CubeN(3)
+    out["CubeN/copy"] = (CubeN(3) >> T_PERM).copy
+    return out
+
+def _withAlg(f: Callable[[Algorithm], object]) -> Callable[[], object]:
+    alg = Algorithm(LONG_ALG)
+    return lambda: f(alg)
+
+def _turnCase(n: int, move: Move) -> Callable[[], None]:
+    cube = CubeN(n)
+    return lambda: cube._turn(move)
+
+def _scrambleCase(n: int) -> Callable[[], object]:
+    cube = CubeN(n)
+    return cube.scramble
@@ -1,12 +1,57 @@
-from .algorithm import Algorithm
+import importlib
+
+from .algorithm import Algorithm, FrozenAlgorithm, simplified, reduced
+from .move import Move
+from .error import InvalidAlgorithmError
 from .cube import CubeN
-from .algorithmExtensions import *
+from .algorithmExtensions import order, equiv
 from .metric import Metric, size
+from .canonical import canonical_sequences
+from .facelets import apply_many
+from .profiling import profile
+
+# the solvers and searches need NumPy and lookup tables, so they are only imported on first use
+_LAZY = {
+    "solve": ".solver",
+    "Cube2": ".cube2",
+    "scramble_random_state": ".scrambler",
+    "find_algorithms": ".search",
+    "canonical_state": ".symmetry",
+    "canonical_algorithm": ".symmetry",
+    "recognize": ".cases",
+    "CubeBatch": ".batch",
+    "scramble_batch": ".batch",
+    "SparseCube": ".sparse",
+    "MoveGroup": ".group",
+    "optimized": ".peephole",
+}
+
+# submodules loaded on first access, like the functions above
+_SUBMODULES = {"aio"}
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    elif (module := _LAZY.get(name)) is not None:
+        value = getattr(importlib.import_module(module, __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY) | _SUBMODULES)
 
 __version__ = "0.1.0"
+# only the eagerly imported names, so ``from cubingtools import *`` stays as light as ``import cubingtools``; the
+# lazy ones above are imported by name (``from cubingtools import solve``)
 __all__ = [
-    "Algorithm",
+    "Algorithm", "FrozenAlgorithm", "Move",
+    "simplified", "reduced",
     "CubeN",
     "order", "equiv",
-    "Metric", "size"
-]
\ No newline at end of file
+    "Metric", "size",
+    "canonical_sequences",
+    "apply_many",
+    "profile",
+]
@@ -0,0 +1,121 @@
+"""DO NOT IMPORT. Loading, building and on-disk caching of the lookup tables used by the solvers."""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from .cubie import rankPerms
+
+########################################################################################################################
+
+_CACHE_ENV = "CUBINGTOOLS_CACHE"
+
+_LOADED: dict[str, dict[str, np.ndarray]] = {}
+
+def cacheDir() -> Path:
+    """
+    Returns the directory lookup tables are cached in.
+
+    .. Notes::
+    Defaults to ``~/.cache/cubingtools``, and can be overridden with the ``CUBINGTOOLS_CACHE`` environment variable.
+    """
+    env = os.environ.get(_CACHE_ENV)
+    if env: return Path(env)
+    return Path.home() / ".cache" / "cubingtools"
+
+def loadOrBuild(name: str, build: Callable[[], dict[str, np.ndarray]]) -> dict[str, np.ndarray]:
+    """
+    Returns the named set of tables, loading it from memory or disk if possible and building (then saving) it otherwise.
+
+    :param name: Unique (versioned) name of the table set, used as the cache file name.
+    :param build: Zero-argument function building the tables from scratch.
+
+    .. Notes::
+    Tables are kept in memory after their first load, so every caller in a process shares one copy. Failing to
+    write the cache file (e.g. on a read-only file system) is not an error, the tables are simply rebuilt next time.
+    """
+    if name in _LOADED:
+        return _LOADED[name]
+
+    path = cacheDir() / f"{name}.npz"
+    tables = None
+    if path.exists():
+        try:
+            with np.load(path) as data:
+                tables = {k: data[k] for k in data.files}
+        except (OSError, ValueError):
+            tables = None
+
+    if tables is None:
+        tables = build()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # write to a temporary file first so concurrent processes never read a half-written table
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".npz")
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **tables)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    _LOADED[name] = tables
+    return tables
+
+def bfs(size: int, start: int, neighbours: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+    """
+    Vectorized breadth-first search over a coordinate space, returning the distance of every coordinate from ``start``.
+
+    :param size: The number of coordinates.
+    :param start: The coordinate at distance 0.
+    :param neighbours: Maps an array of ``k`` coordinates to a ``(k, moves)`` array of their neighbours.
+
+    :rtype: np.ndarray
+    :returns: An ``int8`` array of distances, with ``-1`` for unreachable coordinates.
+    """
+    dist = np.full(size, -1, dtype=np.int8)
+    dist[start] = 0
+    frontier = np.array([start], dtype=np.int64)
+    depth = 0
+    while frontier.size:
+        nxt = np.unique(neighbours(frontier).ravel())
+        nxt = nxt[dist[nxt] == -1]
+        depth += 1
+        dist[nxt] = depth
+        frontier = nxt
+    return dist
+
+########################################################################################################################
+
+def moveArrays(moves) -> tuple[np.ndarray, ...]:
+    """Stacks the ``cp``, ``co``, ``ep`` and ``eo`` arrays of a sequence of cubie moves."""
+    return tuple(np.array([getattr(m, a) for m in moves], dtype=np.int64) for a in ('cp', 'co', 'ep', 'eo'))
+
+def orientationMoves(size: int, pieces: int, base: int, mp: np.ndarray, mo: np.ndarray) -> np.ndarray:
+    """Move table of an orientation coordinate (the first ``pieces-1`` orientations as digits in ``base``)."""
+    coord = np.arange(size)
+    ori = np.zeros((size, pieces), dtype=np.int64)
+    for i in range(pieces - 2, -1, -1):
+        ori[:, i] = coord % base
+        coord //= base
+    ori[:, -1] = -ori[:, :-1].sum(axis=1) % base
+
+    weights = base ** np.arange(pieces - 2, -1, -1)
+    table = np.empty((size, len(mp)), dtype=np.int32)
+    for m in range(len(mp)):
+        table[:, m] = ((ori[:, mp[m]] + mo[m]) % base)[:, :-1] @ weights
+    return table
+
+def permutationMoves(perms: np.ndarray, mp: np.ndarray) -> np.ndarray:
+    """Move table of a permutation coordinate, given every permutation (by rank) and the moves' permutations."""
+    table = np.empty((len(perms), len(mp)), dtype=np.int32)
+    for m in range(len(mp)):
+        table[:, m] = rankPerms(perms[:, mp[m]])
+    return table
+
+def pruning(moveA: np.ndarray, moveB: np.ndarray) -> np.ndarray:
+    """Distance table over the product of two coordinates, indexed ``a * len(moveB) + b``."""
+    nb = len(moveB)
+    return bfs(len(moveA) * nb, 0, lambda idx: moveA[idx // nb] * nb + moveB[idx % nb])
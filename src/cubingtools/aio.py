@@ -0,0 +1,235 @@
+"""
+An asyncio facade over scrambling and solving, so an event loop never blocks on cube work.
+
+>>> from cubingtools import aio
+>>> alg = await aio.scramble(3, random_state=True)
+>>> solution = await aio.solve(cube)
+>>> async with aio.Service(workers=4, maxPending=256) as service:
+...     algs = await asyncio.gather(*(service.scramble(3) for _ in range(1000)))
+
+.. Notes::
+Requests go through a ``Service``: they are queued, grouped into batches and run in a bounded pool of worker
+processes, each of which loads the solver tables once, when it starts. At most ``maxPending`` requests are queued
+or running at once; further callers wait for room (backpressure). Cancelling a caller drops its request if it has not
+reached a worker yet, and discards its result otherwise. ``Service(inProcess=True)`` runs the same machinery on
+threads of the current process instead, which is what the tests use.
+"""
+
+from __future__ import annotations
+import asyncio
+import os
+import random
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable
+
+from .algorithm import Algorithm
+from .cube import CubeN
+
+########################################################################################################################
+# run inside the workers, so everything sent to and from them is plain (picklable) data
+
+def _scrambleItem(n: int, length: int | None, randomState: bool, seed: int) -> str:
+    if randomState:
+        from .scrambler import _scrambleChunk
+        if n not in (2, 3):
+            raise ValueError(f"Random-state scrambles exist only for 2x2 and 3x3 cubes (got n={n})")
+        return _scrambleChunk(n, [seed])[0]
+    return str(CubeN(n).scramble(length, random.Random(seed)))
+
+def _solveItem(n: int, cols: str, snap: tuple[str, ...], maxLength: int | None) -> str:
+    from .solver import solve
+    cube = CubeN(n, cols)
+    cube.restore(snap)
+    return str(solve(cube, maxLength))
+
+_WORK = {
+    "scramble": _scrambleItem,
+    "solve": _solveItem,
+}
+
+def _runBatch(batch: list[tuple[str, tuple]]) -> list[tuple[bool, object]]:
+    """Runs a batch of requests, returning ``(True, result)`` or ``(False, exception)`` for each."""
+    out = []
+    for op, args in batch:
+        try:
+            out.append((True, _WORK[op](*args)))
+        except Exception as e:
+            out.append((False, e))
+    return out
+
+def _warmWorker(sizes: tuple[int, ...]) -> None:
+    if not sizes: return
+    from .solver import getSolver
+    for n in sizes: getSolver(n)
+
+########################################################################################################################
+
+class Service:
+    def __init__(self, workers: int | None = None, *, maxPending: int = 1024, batchSize: int = 32,
+                 batchDelay: float = 0.001, warm: Iterable[int] = (2, 3), inProcess: bool = False):
+        """
+        A pool of workers serving scramble and solve requests from coroutines.
+
+        :param workers: The number of worker processes (or threads), defaults to the number of CPUs.
+        :param maxPending: The most requests queued or running at once, before callers have to wait.
+        :param batchSize: The most requests sent to a worker at a time.
+        :param batchDelay: How long (in seconds) to wait for more requests before sending out a partial batch.
+        :param warm: The cube sizes whose solver tables each worker loads when it starts.
+        :param inProcess: Run the workers as threads of this process instead of as separate processes.
+
+        .. Notes::
+        Nothing is started until the first request. A service belongs to the event loop of its first request; used
+        from a new loop (e.g. a later ``asyncio.run``) it restarts its queue there, keeping its workers.
+        """
+        if maxPending < 1 or batchSize < 1:
+            raise ValueError("maxPending and batchSize must be positive")
+        self.workers = workers or os.cpu_count() or 1
+        self.maxPending = maxPending
+        self.batchSize = batchSize
+        self.batchDelay = batchDelay
+        self.warm = tuple(warm)
+        self.inProcess = inProcess
+        self._executor: Executor | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue | None = None
+        self._pending: asyncio.Semaphore | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._dispatcher: asyncio.Task | None = None
+        self._batches: set[asyncio.Task] = set()
+
+    async def __aenter__(self) -> Service:
+        self._start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def _start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop: return
+        if self._executor is None:
+            if self.inProcess:
+                self._executor = ThreadPoolExecutor(self.workers, initializer=_warmWorker, initargs=(self.warm,))
+            else:
+                self._executor = ProcessPoolExecutor(self.workers, initializer=_warmWorker, initargs=(self.warm,))
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._pending = asyncio.Semaphore(self.maxPending)
+        # two batches per worker keep every worker busy while the next batch is on its way
+        self._slots = asyncio.Semaphore(2 * self.workers)
+        self._batches = set()
+        self._dispatcher = loop.create_task(self._dispatch())
+
+    async def _submit(self, op: str, args: tuple) -> str:
+        self._start()
+        await self._pending.acquire()
+        future = self._loop.create_future()
+        future.add_done_callback(lambda _: self._pending.release())
+        self._queue.put_nowait((future, op, args))
+        # cancelling the caller cancels the future, which the dispatcher then skips
+        return await future
+
+    async def _dispatch(self) -> None:
+        """Groups queued requests into batches and hands them to the workers, as long as the service runs."""
+        queue, batch = self._queue, []
+        try:
+            while True:
+                batch = [await queue.get()]
+                if self.batchDelay and queue.qsize() < self.batchSize - 1:
+                    await asyncio.sleep(self.batchDelay)
+                while len(batch) < self.batchSize and not queue.empty():
+                    batch.append(queue.get_nowait())
+                batch = [request for request in batch if not request[0].done()]
+                if not batch: continue
+                await self._slots.acquire()
+                task = self._loop.create_task(self._run(batch))
+                self._batches.add(task)
+                task.add_done_callback(self._batches.discard)
+                batch = []
+        except asyncio.CancelledError:
+            for future, _, _ in batch: future.cancel()
+            raise
+
+    async def _run(self, batch: list[tuple[asyncio.Future, str, tuple]]) -> None:
+        try:
+            results = await self._loop.run_in_executor(self._executor, _runBatch, [(op, args) for _, op, args in batch])
+        except asyncio.CancelledError:
+            for future, _, _ in batch: future.cancel()
+            raise
+        except Exception as e:
+            # e.g. a worker process died: every request of the batch fails with it
+            for future, _, _ in batch:
+                if not future.done(): future.set_exception(e)
+        else:
+            for (future, _, _), (ok, value) in zip(batch, results):
+                if future.done(): continue
+                if ok: future.set_result(value)
+                else: future.set_exception(value)
+        finally:
+            self._slots.release()
+
+    async def scramble(self, n: int = 3, length: int | None = None, random_state: bool = False,
+                       seed: int | None = None) -> Algorithm:
+        """
+        Returns a scramble for an ``n``x``n`` cube, generated by a worker.
+
+        :param n: The cube size.
+        :param length: The number of moves of a random-move scramble, defaults to ``CubeN.scramble``'s.
+        :param random_state: Return a random-state scramble instead (only for 2x2 and 3x3 cubes).
+        :param seed: Seed making the scramble reproducible.
+
+        :rtype: Algorithm
+        """
+        if seed is None: seed = random.getrandbits(64)
+        return Algorithm(await self._submit("scramble", (n, length, random_state, seed)))
+
+    async def solve(self, cube: CubeN, max_length: int | None = None) -> Algorithm:
+        """
+        Returns an algorithm solving a 2x2 or 3x3 cube, found by a worker (see ``solver.solve``).
+
+        :param cube: The cube to solve (it is not modified, and may be changed while the request runs).
+        :param max_length: If given, the solution is at most this many (HTM) moves long.
+
+        :rtype: Algorithm
+        """
+        return Algorithm(await self._submit("solve", (cube.size, cube.cols, cube.snapshot(), max_length)))
+
+    async def close(self) -> None:
+        """Stops the service: queued requests are cancelled, running ones awaited, and the workers shut down."""
+        # a service last used from a finished event loop has nothing left to stop but its workers
+        if self._dispatcher is not None and self._loop is asyncio.get_running_loop():
+            self._dispatcher.cancel()
+            while not self._queue.empty():
+                self._queue.get_nowait()[0].cancel()
+            await asyncio.gather(self._dispatcher, *self._batches, return_exceptions=True)
+        self._dispatcher = None
+        self._loop = None
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.to_thread(executor.shutdown, cancel_futures=True)
+
+########################################################################################################################
+
+_DEFAULT: Service | None = None
+
+def service() -> Service:
+    """Returns the shared service used by the module level ``scramble`` and ``solve``, creating it if needed."""
+    global _DEFAULT
+    if _DEFAULT is None: _DEFAULT = Service()
+    return _DEFAULT
+
+async def scramble(n: int = 3, length: int | None = None, random_state: bool = False,
+                   seed: int | None = None) -> Algorithm:
+    """``Service.scramble`` on the shared service."""
+    return await service().scramble(n, length, random_state, seed)
+
+async def solve(cube: CubeN, max_length: int | None = None) -> Algorithm:
+    """``Service.solve`` on the shared service."""
+    return await service().solve(cube, max_length)
+
+async def shutdown() -> None:
+    """Closes the shared service, if it was started."""
+    global _DEFAULT
+    if _DEFAULT is not None:
+        await _DEFAULT.close()
+        _DEFAULT = None
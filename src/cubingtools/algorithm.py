@@ -4,10 +4,13 @@ which can be performed on cubes.
 """
 
 from __future__ import annotations
+import inspect
 import operator
 import re
+from functools import wraps
 from .move import Move
 from .error import InvalidAlgorithmError
+from . import profiling as _profiling
 
 ########################################################################################################################
 
@@ -17,6 +20,45 @@ _ALGORITHM_LEXER_REGEX = re.compile(rf"^(\s*({_VALID_MOVE_STRING})\s*)*$")
 
 ########################################################################################################################
 
+# an orientation is the face held at each of the positions UFRBLD; a quarter rotation moves the faces along a cycle
+_ROTATION_CYCLES = {'x': "UFDB", 'y': "FRBL", 'z': "ULDR"}
+_ORIENT_FACES = "UFRBLD"
+_OPPOSITE_FACE = {'U': 'D', 'D': 'U', 'F': 'B', 'B': 'F', 'R': 'L', 'L': 'R'}
+# slices follow the L, D and F faces
+_SLICE_AXIS = {'M': 'L', 'E': 'D', 'S': 'F'}
+
+def _rotated(orient: str, rot: str) -> str:
+    """The orientation after a clockwise quarter rotation ``rot``: each position of a cycle takes the next's face."""
+    cyc = _ROTATION_CYCLES[rot]
+    return ''.join(
+        orient[_ORIENT_FACES.index(cyc[(cyc.index(p) + 1) % 4])] if p in cyc else orient[i]
+        for i, p in enumerate(_ORIENT_FACES)
+    )
+
+def _orientationTables() -> tuple[dict[tuple[str, str], str], dict[str, list[Move]]]:
+    """The orientation reached by each quarter rotation from each of the 24 orientations, and the shortest
+    rotation sequence reaching each orientation from the standard one."""
+    step = {}
+    reach = {_ORIENT_FACES: []}
+    frontier = [_ORIENT_FACES]
+    while frontier:
+        nxt = []
+        for orient in frontier:
+            for rot in _ROTATION_CYCLES:
+                o = orient
+                for mod in (1, 2, 3):
+                    o = _rotated(o, rot)
+                    if mod == 1: step[orient, rot] = o
+                    if o not in reach:
+                        reach[o] = reach[orient] + [Move(1, rot, mod)]
+                        nxt.append(o)
+        frontier = nxt
+    return step, reach
+
+_ORIENT_STEP, _ORIENT_REACH = _orientationTables()
+
+########################################################################################################################
+
 class Algorithm:
     def __init__(self, moves: Move | list[Move] | str | None = None):
         """
@@ -42,9 +84,58 @@ class Algorithm:
             case _:
                 raise TypeError(f'Cannot construct an Algorithm with type {type(moves)}')
 
-        # for what N can this be executed on an NxN cube?
-        self.degree = 2
-        if self._movs: self.degree = max(m.degree for m in self._movs)
+        # whether the moves are known to be simplified, and the degree once computed (see the ``degree`` property)
+        self._simple = len(self._movs) <= 1
+        self._degree = None
+
+    @property
+    def degree(self) -> int:
+        """For what N can this be executed on an NxN cube?"""
+        if self._degree is None:
+            self._degree = max((m.degree for m in self._movs), default=2)
+        return self._degree
+
+    def _simpleMoves(self) -> list[Move]:
+        """Returns the moves of the algorithm, simplified (remembering when they already are)."""
+        if not self._simple:
+            movs = self._movs
+            if any(a.mov == b.mov and a.width == b.width for a, b in zip(movs, movs[1:])):
+                return simplified(self)._movs
+            self._simple = True
+        return self._movs
+
+    def _extend(self, movs: list[Move]) -> None:
+        """
+        Appends simplified moves to the (simplified) moves of this algorithm, in place.
+
+        .. Notes::
+        As both sides are simplified, moves can only cancel or merge where they meet: at most one merge, or a run of
+        cancellations, happens before the rest of ``movs`` is appended as is.
+        """
+        if movs is self._movs: movs = movs.copy()
+        stk, i, cancelled = self._movs, 0, False
+        while stk and i < len(movs):
+            top, move = stk[-1], movs[i]
+            if top.mov != move.mov or top.width != move.width: break
+            stk.pop()
+            cancelled = True
+            i += 1
+            if (total := (top.mod + move.mod) % 4) != 0:
+                stk.append(Move(move.width, move.mov, total))
+                break
+        stk.extend(movs[i:] if i else movs)
+        if cancelled:
+            self._degree = None
+        elif self._degree is not None and movs:
+            self._degree = max(self._degree, max(m.degree for m in movs))
+
+    @staticmethod
+    def _joined(left: list[Move], right: list[Move]) -> 'Algorithm':
+        """Returns the concatenation of two simplified move lists, cancelling only where they meet."""
+        out = Algorithm(list(left))
+        out._simple = True
+        out._extend(right)
+        return out
 
     def __eq__(self, other: 'Algorithm') -> bool:
         """
@@ -61,7 +152,9 @@ class Algorithm:
 
     def inverse(self) -> 'Algorithm':
         """Returns the inverse of the algorithm."""
-        return Algorithm([-move for move in self._movs[::-1]])
+        out = Algorithm([-move for move in self._movs[::-1]])
+        out._simple = self._simple
+        return out
 
     def __neg__(self) -> 'Algorithm':
         return self.inverse()
@@ -94,9 +187,31 @@ class Algorithm:
         Concatenates two algorithms and simplifies the output.
 
         :param other: The other algorithm to concatenate.
+
+        .. Notes::
+        Operands are simplified first (once: an algorithm remembers being simplified), after which moves can only
+        cancel where the two algorithms meet.
+        """
+        otherAlgo = Algorithm._coerceToAlgo(other)
+        return Algorithm._joined(self._simpleMoves(), otherAlgo._simpleMoves())
+
+    def extend(self, other: 'Move | str | Algorithm') -> None:
+        """
+        Concatenates another algorithm to this one in place, simplifying the output.
+
+        :param other: The other algorithm to concatenate.
+
+        >>> alg.extend("U R")   # as alg = alg + "U R", but without copying alg
+
+        .. Notes::
+        Only the join is simplified, so appending a single move takes amortized constant time. Unlike ``+=``, which
+        builds a new algorithm, this changes the algorithm for every name bound to it.
         """
         otherAlgo = Algorithm._coerceToAlgo(other)
-        return simplified(Algorithm(self._movs + otherAlgo._movs))
+        if not self._simple:
+            self._movs = self._simpleMoves().copy()
+            self._simple, self._degree = True, None
+        self._extend(otherAlgo._simpleMoves())
 
     def __sub__(self, other: 'Move | str | Algorithm') -> 'Algorithm':
         """
@@ -108,15 +223,15 @@ class Algorithm:
         For algorithms ``A`` and ``B`` we have ``A-B==A+(-B)``
         """
         otherAlgo = Algorithm._coerceToAlgo(other)
-        return simplified(Algorithm(self._movs + (-otherAlgo)._movs))
+        return Algorithm._joined(self._simpleMoves(), (-otherAlgo)._simpleMoves())
 
     def __radd__(self, other: 'Move | str | Algorithm') -> 'Algorithm':
         otherAlgo = Algorithm._coerceToAlgo(other)
-        return simplified(Algorithm(otherAlgo._movs + self._movs))
+        return Algorithm._joined(otherAlgo._simpleMoves(), self._simpleMoves())
 
     def __rsub__(self, other: 'Move | str | Algorithm') -> 'Algorithm':
         otherAlgo = Algorithm._coerceToAlgo(other)
-        return simplified(Algorithm(otherAlgo._movs + (-self)._movs))
+        return Algorithm._joined(otherAlgo._simpleMoves(), (-self)._simpleMoves())
 
     def __mul__(self, times: int) -> 'Algorithm':
         """Repeats the algorithm a specified number of times and simplifies the output."""
@@ -144,6 +259,7 @@ class Algorithm:
 
         >>> self._parse("U R2 F' 3Rw2 (R U')3 D") -> Algorithm(...)
         """
+        if _profiling.ACTIVE is not None: _profiling.ACTIVE.parses['Algorithm'] += 1
         tokens = Algorithm._tokenize(algStr)
         stk = []
         for t in tokens:
@@ -156,10 +272,10 @@ class Algorithm:
                         raise InvalidAlgorithmError(f"Invalid multiplier in token: {tail}")
                 # pop til '(' and remove it
                 inner = []
-                while stk[-1] != '(':
-                    inner.append(stk.pop())
+                while not stk or stk[-1] != '(':
                     if not stk:
                         raise InvalidAlgorithmError("Unmatched ')' in algorithm string.")
+                    inner.append(stk.pop())
                 stk.pop()
                 # repeat inner alg and push stk
                 innerAlg = Algorithm(inner[::-1])
@@ -177,10 +293,12 @@ class Algorithm:
     def simplify(self):
         """Simplifies the algorithm in place."""
         self._movs = simplified(self)._movs.copy()
+        self._simple, self._degree = True, None
 
     def reduce(self):
         """Reduces the algorithm in place."""
         self._movs = reduced(self)._movs.copy()
+        self._simple, self._degree = True, None
 
     def commutator(self, other: 'Algorithm') -> 'Algorithm':
         """
@@ -211,8 +329,122 @@ class Algorithm:
         """Returns the mirror of the algorithm, making right-handed algorithms left-handed and vice versa."""
         return Algorithm([m.mirror() for m in self._movs])
 
+    def without_rotations(self) -> 'Algorithm':
+        """
+        Returns an equivalent algorithm whose only rotations are at its end.
+
+        :rtype: Algorithm
+        :returns: The algorithm with every rotation removed and the moves after it relabelled to the faces they
+            turn, followed by (at most two) rotations restoring the final orientation.
+
+        >>> Algorithm("R x U y' F").without_rotations() -> Algorithm("R F L x y'")
+
+        .. Notes::
+        This is a single pass over the moves, tracking the current orientation through a precomputed table of the
+        24 orientations. Rotations turn every sticker of a cube, so removing them makes large cubes much cheaper to
+        turn, and lets ``simplified`` and ``reduced`` cancel moves on either side of a former rotation.
+        """
+        orient = _ORIENT_FACES
+        out = []
+        for m in self._movs:
+            mov = str(m.mov)
+            if mov in _ROTATION_CYCLES:
+                for _ in range(m.mod): orient = _ORIENT_STEP[orient, mov]
+            elif mov in _SLICE_AXIS:
+                face = orient[_ORIENT_FACES.index(_SLICE_AXIS[mov])]
+                (slc, axis), = [(s, a) for s, a in _SLICE_AXIS.items() if face in (a, _OPPOSITE_FACE[a])]
+                out.append(Move(m.width, slc, m.mod if face == axis else -m.mod))
+            else:
+                face = orient[_ORIENT_FACES.index(mov.upper())]
+                out.append(Move(m.width, face if mov.isupper() else face.lower(), m.mod))
+        return Algorithm(out + _ORIENT_REACH[orient])
+
+    def frozen(self) -> 'FrozenAlgorithm':
+        """Returns an immutable copy of the algorithm, which caches everything derived from it."""
+        return self if isinstance(self, FrozenAlgorithm) else FrozenAlgorithm(self)
+
+########################################################################################################################
+
+class FrozenAlgorithm(Algorithm):
+    def __init__(self, moves: 'Move | list[Move] | str | Algorithm | None' = None):
+        """
+        An immutable ``Algorithm``. Its inverse, simplified and reduced forms, sizes, order and compiled
+        permutations (used by ``equiv``) are computed on first use and then kept, so asking again is a lookup.
+
+        :param moves: As for ``Algorithm``, or an ``Algorithm`` to copy.
+
+        >>> sune = FrozenAlgorithm("R U R' U R U2 R'")
+        >>> size(sune, "QTM") ; size(sune, "QTM")    # the second call is a lookup
+
+        .. Notes::
+        ``simplify``, ``reduce``, ``extend`` and ``+=`` do not modify a frozen algorithm: the first three raise
+        ``TypeError`` and ``+=`` returns a new frozen algorithm. Like ``Algorithm``, it is unhashable (so it cannot be
+        a dict key or set member): ``==`` compares the effect on a cube, which different moves can share, so no hash
+        of the moves would agree with it. Key on ``str(alg)`` or ``tuple(alg)`` instead.
+        """
+        if isinstance(moves, Algorithm):
+            super().__init__(list(moves._movs))
+            self._simple, self._degree = moves._simple, moves._degree
+        else:
+            super().__init__(list(moves) if isinstance(moves, list) else moves)
+        self._memo = {}
+
+    def _memoized(self, key, compute):
+        """Returns ``compute()``, computing it only the first time ``key`` is asked for."""
+        try:
+            return self._memo[key]
+        except KeyError:
+            value = self._memo[key] = compute()
+            return value
+
+    def __repr__(self) -> str:
+        return f'FrozenAlgorithm("{self}")'
+
+    def inverse(self) -> 'FrozenAlgorithm':
+        """Returns the inverse of the algorithm."""
+        def compute():
+            out = FrozenAlgorithm(super(FrozenAlgorithm, self).inverse())
+            out._memo['inverse'] = self
+            return out
+        return self._memoized('inverse', compute)
+
+    def __iadd__(self, other: 'Move | str | Algorithm') -> 'FrozenAlgorithm':
+        return FrozenAlgorithm(self + other)
+
+    def simplify(self):
+        raise TypeError("A FrozenAlgorithm cannot be modified, use simplified() instead")
+
+    def extend(self, other: 'Move | str | Algorithm'):
+        raise TypeError("A FrozenAlgorithm cannot be modified, use + instead")
+
+    def reduce(self):
+        raise TypeError("A FrozenAlgorithm cannot be modified, use reduced() instead")
+
+    def perm(self, n: int) -> tuple[int, ...]:
+        """Returns the sticker permutation of the algorithm on an NxN cube (see ``facelets``)."""
+        from .facelets import algorithmPerm
+        return self._memoized(('perm', n), lambda: algorithmPerm(n, self))
+
+def _memoizedOnFrozen(f):
+    """Makes a function of an algorithm remember its results on frozen algorithms (algorithm results are frozen)."""
+    signature = inspect.signature(f)
+    first = next(iter(signature.parameters))
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        alg = args[0] if args else kwargs.get(first)
+        if not isinstance(alg, FrozenAlgorithm): return f(*args, **kwargs)
+        # key on every argument after the algorithm, defaults filled in, so positional and keyword calls agree
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        def compute():
+            out = f(*bound.args, **bound.kwargs)
+            return FrozenAlgorithm(out) if isinstance(out, Algorithm) else out
+        return alg._memoized((f.__name__, *list(bound.arguments.values())[1:]), compute)
+    return wrapper
+
 ########################################################################################################################
 
+@_memoizedOnFrozen
 def simplified(alg: Algorithm) -> Algorithm:
     """
     Returns the naive (adjacent-canceller) simplification of a given algorithm.
@@ -237,7 +469,9 @@ def simplified(alg: Algorithm) -> Algorithm:
                     stk.append(Move(move.width, move.mov, total))
                 continue
         stk.append(move)
-    return Algorithm(stk)
+    out = Algorithm(stk)
+    out._simple = True
+    return out
 
 ########################################################################################################################
 
@@ -251,6 +485,7 @@ def _commutes(a: Move, b: Move) -> bool:
     """Returns True if moves ``a`` and ``b`` always commute."""
     return any(a.mov in grp and b.mov in grp for grp in _AXIS_GROUPS.values())
 
+@_memoizedOnFrozen
 def reduced(alg: Algorithm) -> Algorithm:
     """
     Returns a reduced form of the algorithm by merging non-adjacent moves that
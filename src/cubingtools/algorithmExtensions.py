@@ -2,7 +2,9 @@
 
 from .cube import *
 from .algorithm import *
+from .algorithm import _memoizedOnFrozen
 
+@_memoizedOnFrozen
 def order(alg: Algorithm, n: int | None = None) -> int:
     """
     Returns the order of an algorithm on an NxN cube.
@@ -24,6 +26,12 @@ def order(alg: Algorithm, n: int | None = None) -> int:
 
 def equiv(alg1: Algorithm, alg2: Algorithm) -> bool:
     degree = max(alg1.degree, alg2.degree)
+    if isinstance(alg1, FrozenAlgorithm) and isinstance(alg2, FrozenAlgorithm):
+        # compose the remembered permutations instead of turning a cube: the result is solved when every face
+        # only holds stickers from a single face
+        from .facelets import compose
+        p, nn = compose(alg1.perm(degree), alg2.inverse().perm(degree)), degree * degree
+        return all(len({i // nn for i in p[k*nn:(k+1)*nn]}) == 1 for k in range(6))
     cube = CubeN(degree)
     cube >> alg1 >> -alg2
     return cube.isSolved()
\ No newline at end of file
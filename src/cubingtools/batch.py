@@ -0,0 +1,129 @@
+"""
+Many NxN cubes held in one NumPy array, for generating random-move scrambles in bulk.
+
+>>> algs, batch = scramble_batch(3, count=1_000_000, seed=42)
+>>> batch.cube(0) -> CubeN(...)    # the state algs[0] leaves a solved cube in
+
+.. Notes::
+Row ``k`` of ``CubeBatch.codes`` is the flat state of cube ``k`` as colour indices (see ``facelets`` and
+``serialize.cubeCodes``). Each step of a scramble draws one move for every row at once and applies it with a single
+gather, so the Python overhead is per step rather than per cube and move.
+"""
+
+from __future__ import annotations
+from functools import lru_cache
+
+import numpy as np
+
+from .algorithm import Algorithm
+from .cube import CubeN, _scrambleAutomaton
+from .facelets import movePerm
+from .serialize import cubeFromCodes
+
+########################################################################################################################
+
+# rows scrambled at a time, bounding the size of the temporary index arrays (and fixing the order random numbers are
+# drawn in, so results only depend on the seed)
+_CHUNK = 1 << 15
+
+@lru_cache(maxsize=None)
+def _scrambleTables(n: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The scramble automaton of an NxN cube as arrays: the allowed moves of each state (padded), how many there are,
+    the state after each move, and the sticker permutation of each move.
+    """
+    fsm = _scrambleAutomaton(n)
+    states = len(fsm.transitions)
+    counts = np.array([len(fsm.allowed(s)) for s in range(states)], dtype=np.int64)
+    allowed = np.zeros((states, counts.max()), dtype=np.int64)
+    for s in range(states): allowed[s, :counts[s]] = fsm.allowed(s)
+    after = np.array([fsm.stateAfter(i) for i in range(len(fsm.moves))], dtype=np.int64)
+    index = np.int16 if 6 * n * n <= np.iinfo(np.int16).max else np.int32
+    perms = np.array([movePerm(n, m) for m in fsm.moves], dtype=index)
+    return allowed, counts, after, perms
+
+class CubeBatch:
+    def __init__(self, n: int = 3, count: int = 1, cols: str = 'wgrboy'):
+        """
+        A batch of ``count`` solved NxN cubes.
+
+        :param n: Size of the cubes.
+        :param count: Number of cubes.
+        :param cols: Symbol (color) on each face of the cubes (In the order UFRBLD).
+        """
+        CubeN(n, cols)   # validates n and cols
+        if count < 0: raise ValueError("count must be non-negative")
+        self.size = n
+        self.cols = cols
+        self.codes = np.tile(np.repeat(np.arange(6, dtype=np.uint8), n * n), (count, 1))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def cube(self, k: int) -> CubeN:
+        """Returns cube ``k`` of the batch as a ``CubeN``."""
+        return cubeFromCodes(self.codes[k], self.size, self.cols)
+
+    def cubes(self) -> list[CubeN]:
+        """Returns every cube of the batch as a ``CubeN``."""
+        return [self.cube(k) for k in range(len(self))]
+
+    def scramble(self, m: int | None = None, seed: int | np.random.Generator | None = None) -> list[Algorithm]:
+        """
+        Scrambles every cube of the batch with its own random moves, returning the scramble of each.
+
+        :param m: The number of moves per scramble, defaults to ``8*n`` (as for ``CubeN.scramble``).
+        :param seed: Seed (or NumPy ``Generator``) making the scrambles reproducible.
+
+        :rtype: list[Algorithm]
+
+        .. Notes::
+        Moves follow the same canonical-sequence automaton as ``CubeN.scramble``, so no scramble repeats a base move
+        or cancels across commuting moves. Unlike ``CubeN.scramble``, a scramble may (rarely) come back to a state
+        it went through: checking that would take a set of states per cube.
+        """
+        moves = m or 8 * self.size
+        allowed, counts, after, perms = _scrambleTables(self.size)
+        rng = np.random.default_rng(seed)
+        fsm = _scrambleAutomaton(self.size)
+
+        algs = []
+        for start in range(0, len(self), _CHUNK):
+            codes = self.codes[start:start + _CHUNK]
+            rows = len(codes)
+            state = np.zeros(rows, dtype=np.int64)
+            seq = np.empty((rows, moves), dtype=np.int64)
+            for t in range(moves):
+                pick = (rng.random(rows) * counts[state]).astype(np.int64)
+                seq[:, t] = mv = allowed[state, pick]
+                state = after[mv]
+                codes = np.take_along_axis(codes, perms[mv], axis=1)
+            self.codes[start:start + rows] = codes
+            algs.extend(_algorithms(fsm.moves, seq))
+        return algs
+
+def _algorithms(moves: list, seq: np.ndarray) -> list[Algorithm]:
+    out = []
+    for row in seq.tolist():
+        alg = Algorithm([moves[i] for i in row])
+        alg._simple = True   # canonical sequences never have adjacent moves of one base
+        out.append(alg)
+    return out
+
+def scramble_batch(n: int = 3, count: int = 1, m: int | None = None, seed: int | np.random.Generator | None = None,
+                   cols: str = 'wgrboy') -> tuple[list[Algorithm], CubeBatch]:
+    """
+    Returns ``count`` random-move scrambles of NxN cubes, and the states they leave solved cubes in.
+
+    :param n: The cube size.
+    :param count: The number of scrambles.
+    :param m: The number of moves per scramble, defaults to ``8*n``.
+    :param seed: Seed (or NumPy ``Generator``) making the scrambles reproducible.
+    :param cols: The colour scheme of the cubes.
+
+    :rtype: tuple[list[Algorithm], CubeBatch]
+
+    >>> algs, batch = scramble_batch(4, count=10_000, seed=1)
+    """
+    batch = CubeBatch(n, count, cols)
+    return batch.scramble(m, seed), batch
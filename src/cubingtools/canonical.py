@@ -0,0 +1,127 @@
+"""
+Canonical move sequences: a finite automaton deciding which moves may follow which, so that tree searches over
+moves never visit two sequences that are trivially the same (like ``R L R'`` and ``L``, or ``U D`` and ``D U``).
+"""
+
+from __future__ import annotations
+import re
+from typing import Iterable, Iterator
+
+from .algorithm import Algorithm, _commutes
+from .move import Move
+
+########################################################################################################################
+
+def parseMoveset(moveset: str | Iterable[Move | str]) -> list[Move]:
+    """
+    Returns every move generated by a move set: each generator together with its powers.
+
+    :param moveset: Generators as a string (e.g. ``"<R, U, F>"`` or ``"R U F"``) or an iterable of moves.
+
+    >>> parseMoveset("<R, U2>") -> [R, R2, R', U2]
+    """
+    if isinstance(moveset, str):
+        moveset = [t for t in re.split(r"[\s,<>]+", moveset) if t]
+    out, seen = [], set()
+    for g in moveset:
+        g = g if isinstance(g, Move) else Move.parse(g)
+        for mod in ((2,) if g.mod == 2 else (1, 2, 3)):
+            if (key := (g.width, g.mov, mod)) not in seen:
+                seen.add(key)
+                out.append(Move(g.width, g.mov, mod))
+    return out
+
+def _canFollow(a: Move, b: Move) -> bool:
+    """
+    Whether ``b`` may directly follow ``a``: never the same base move twice in a row, and moves on a common axis
+    (which commute) only in one fixed order.
+    """
+    if a.mov == b.mov and a.width == b.width: return False
+    if _commutes(a, b): return (str(a.mov), a.width) < (str(b.mov), b.width)
+    return True
+
+class MoveAutomaton:
+    start = 0
+
+    def __init__(self, moves: Iterable[Move]):
+        """
+        The "allowed next move" automaton of a list of moves.
+
+        :param moves: The moves sequences are made of (typically every power of some generators).
+
+        >>> fsm = MoveAutomaton(parseMoveset("<R, L, U>"))
+        >>> [str(Algorithm([fsm.moves[i] for i in seq])) for seq in fsm.sequences(2)] -> ["R U", "R U2", ...]
+
+        .. Notes::
+        Within a run of moves on one axis, base moves must appear in strictly increasing order. As moves on an axis
+        all commute, every sequence has exactly one canonical reordering, and runs never repeat a base move, so the
+        last move played is all the automaton has to remember. State 0 is the start state, and state ``k > 0``
+        means the last move had base ``bases[k-1]``.
+        """
+        self.moves = list(moves)
+        self.bases = []
+        baseOf = {}
+        for m in self.moves:
+            if (key := (m.mov, m.width)) not in baseOf:
+                baseOf[key] = len(self.bases) + 1
+                self.bases.append(Move(m.width, m.mov, 1))
+        self._stateOf = [baseOf[(m.mov, m.width)] for m in self.moves]
+
+        # transitions[state][i] is the state after moves[i], or -1 if moves[i] may not be played there
+        self.transitions = [list(self._stateOf)]
+        for b in self.bases:
+            self.transitions.append([s if _canFollow(b, m) else -1 for m, s in zip(self.moves, self._stateOf)])
+        self._allowed = [[i for i, s in enumerate(row) if s >= 0] for row in self.transitions]
+
+    def stateAfter(self, i: int) -> int:
+        """Returns the state reached by playing ``moves[i]`` (from any state allowing it)."""
+        return self._stateOf[i]
+
+    def step(self, state: int, i: int) -> int:
+        """Returns the state after playing ``moves[i]`` in ``state``, or -1 if that is not allowed."""
+        return self.transitions[state][i]
+
+    def allowed(self, state: int) -> list[int]:
+        """Returns the indices of the moves allowed in ``state``."""
+        return self._allowed[state]
+
+    def accepts(self, seq: Iterable[int]) -> bool:
+        """Checks that a sequence of move indices is canonical."""
+        state = self.start
+        for i in seq:
+            if (state := self.transitions[state][i]) < 0: return False
+        return True
+
+    def sequences(self, k: int, state: int = 0) -> Iterator[tuple[int, ...]]:
+        """Generates every canonical sequence of ``k`` move indices (starting from ``state``)."""
+        if k == 0:
+            yield ()
+            return
+        row = self.transitions[state]
+        for i in self._allowed[state]:
+            for rest in self.sequences(k - 1, row[i]):
+                yield (i,) + rest
+
+    def count(self, k: int) -> int:
+        """Returns the number of canonical sequences of ``k`` moves, without enumerating them."""
+        ways = [1] + [0] * len(self.bases)
+        for _ in range(k):
+            nxt = [0] * len(ways)
+            for state, w in enumerate(ways):
+                if w:
+                    for i in self._allowed[state]: nxt[self._stateOf[i]] += w
+            ways = nxt
+        return sum(ways)
+
+def canonical_sequences(moveset: str | Iterable[Move | str], k: int) -> Iterator[Algorithm]:
+    """
+    Generates every canonical sequence of ``k`` moves from a move set.
+
+    :param moveset: The generators, e.g. ``"<R, U, F>"`` (their powers are used too, see ``parseMoveset``).
+    :param k: The length of the sequences.
+
+    >>> len(list(canonical_sequences("<R, L>", 2))) -> 9   # L R, L R2, ... but never R L
+    """
+    fsm = MoveAutomaton(parseMoveset(moveset))
+    for seq in fsm.sequences(k):
+        yield Algorithm([fsm.moves[i] for i in seq])
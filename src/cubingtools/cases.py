@@ -0,0 +1,262 @@
+"""
+Recognition of 3x3 last-layer cases (OLL, PLL and ZBLL) in constant time, with algorithms solving them.
+
+>>> match = recognize(CubeN() >> "R U R' U' R' F R2 U' R' U' R U R' F'", "PLL")
+>>> match.case.name -> 'T'
+>>> match.algorithms[0] -> Algorithm(...)    # solves this very cube, AUFs included
+
+.. Notes::
+Every last-layer state (F2L solved, any pieces of the U layer anywhere) belongs to exactly one case of a set, two
+states being the same case when they only differ by turns of U before or after (which also covers looking at the
+cube from another side, as ``y`` acts on the last layer like ``U``). The cases are found by enumerating all
+last-layer states of a set and grouping them under these AUFs. Each set's index maps the signature of the 21
+last-layer stickers, in each of its AUF variants, straight to its case, so recognizing a cube is one dictionary
+lookup. Indexes are built on first use and cached on disk (see ``_tables``).
+
+Cases come with the well known algorithms of ``_KNOWN`` (which also name the cases they solve). Cases without one
+get a solution found by the 3x3 solver when the index is built: correct, but not finger-friendly.
+"""
+
+from __future__ import annotations
+from functools import lru_cache
+from itertools import permutations, product
+from typing import NamedTuple
+
+import numpy as np
+
+from .algorithm import Algorithm
+from .cube import CubeN
+from .cubie import permParity
+from .facelets import algorithmPerm, flatten
+from .pieces import pieceIndex
+from .serialize import cubeFromCodes
+from ._tables import loadOrBuild
+
+########################################################################################################################
+
+CASE_SETS = ("OLL", "PLL", "ZBLL")
+
+# the last-layer stickers: the U face, then the top rows of F, R, B and L
+_LL = np.array([*range(9), 9, 10, 11, 18, 19, 20, 27, 28, 29, 36, 37, 38])
+_NOT_LL = np.setdiff1d(np.arange(54), _LL)
+_HOME = np.arange(54) // 9
+_SIX_POWERS = 6 ** np.arange(len(_LL), dtype=np.int64)
+_TWO_POWERS = 2 ** np.arange(len(_LL), dtype=np.int64)
+
+# algorithms naming the cases they solve (only their effect on the last layer matters)
+_KNOWN = {
+    "OLL": {
+        "OLL 1": "R U2 R2 F R F' U2 R' F R F'",
+        "OLL 2": "F R U R' U' F' f R U R' U' f'",
+        "OLL 21": "R U2 R' U' R U R' U' R U' R'",
+        "OLL 22": "R U2 R2 U' R2 U' R2 U2 R",
+        "OLL 23": "R2 D' R U2 R' D R U2 R",
+        "OLL 24": "r U R' U' r' F R F'",
+        "OLL 25": "F' r U R' U' r' F R",
+        "OLL 26": "R U2 R' U' R U' R'",
+        "OLL 27": "R U R' U R U2 R'",
+        "OLL 28": "r U R' U' r' R U R U' R'",
+        "OLL 33": "R U R' U' R' F R F'",
+        "OLL 37": "F R' F' R U R U' R'",
+        "OLL 43": "f' L' U' L U f",
+        "OLL 44": "f R U R' U' f'",
+        "OLL 45": "F R U R' U' F'",
+        "OLL 48": "F R U R' U' R U R' U' F'",
+        "OLL 51": "f R U R' U' R U R' U' f'",
+        "OLL 57": "R U R' U' M' U R U' r'",
+    },
+    "PLL": {
+        "Aa": "x R' U R' D2 R U' R' D2 R2 x'",
+        "Ab": "x R2 D2 R U R' D2 R U' R x'",
+        "E": "x' R U' R' D R U R' D' R U R' D R U' R' D' x",
+        "F": "R' U' F' R U R' U' R' F R2 U' R' U' R U R' U R",
+        "Ga": "R2 U R' U R' U' R U' R2 U' D R' U R D'",
+        "Gb": "R' U' R U D' R2 U R' U R U' R U' R2 D",
+        "Gc": "R2 U' R U' R U R' U R2 U D' R U' R' D",
+        "Gd": "R U R' U' D R2 U' R U' R' U R' U R2 D'",
+        "H": "M2 U M2 U2 M2 U M2",
+        "Ja": "x R2 F R F' R U2 r' U r U2 x'",
+        "Jb": "R U R' F' R U R' U' R' F R2 U' R'",
+        "Na": "R U R' U R U R' F' R U R' U' R' F R2 U' R' U2 R U' R'",
+        "Nb": "R' U R U' R' F' U' F R U R' F R' F' R U' R",
+        "Ra": "R U' R' U' R U R D R' U' R D' R' U2 R'",
+        "Rb": "R2 F R U R U' R' F' R U2 R' U2 R",
+        "T": "R U R' U' R' F R2 U' R' U' R U R' F'",
+        "Ua": "M2 U M U2 M' U M2",
+        "Ub": "M2 U' M U2 M' U' M2",
+        "V": "R' U R' U' R D' R' D R' U D' R2 U' R2 D R2",
+        "Y": "F R U' R' U' R U R' F' R U R' U' R' F R F'",
+        "Z": "M' U M2 U M2 U M' U2 M2",
+    },
+    "ZBLL": {},
+}
+
+########################################################################################################################
+
+class Case(NamedTuple):
+    set: str
+    id: int
+    name: str | None
+    algorithms: tuple[str, ...]   # each solves the case's reference state (its lowest signature)
+
+class Match(NamedTuple):
+    case: Case
+    before: int   # quarter turns of U done before the reference state, and after it, to reach the cube
+    after: int
+
+    @property
+    def algorithms(self) -> list[Algorithm]:
+        """The case's algorithms, with the AUFs solving the matched cube."""
+        return [_uTurns(-self.after) + Algorithm(alg) + _uTurns(-self.before) for alg in self.case.algorithms]
+
+def _uTurns(k: int) -> Algorithm:
+    return Algorithm(["U", "U2", "U'"][k % 4 - 1]) if k % 4 else Algorithm()
+
+########################################################################################################################
+
+def _signatures(caseSet: str, codes: np.ndarray) -> np.ndarray:
+    """The signatures of ``(k, 54)`` arrays of face indices: which last-layer stickers show U for OLL, else all
+    of their faces."""
+    ll = codes[..., _LL].astype(np.int64)
+    return (ll == 0) @ _TWO_POWERS if caseSet == "OLL" else ll @ _SIX_POWERS
+
+def _states(caseSet: str) -> np.ndarray:
+    """
+    Returns the sticker permutations (see ``facelets``) of the last-layer states enumerated for a case set: all
+    orientations for OLL, all permutations for PLL, and both with the edges oriented and some corner twisted for ZBLL.
+    """
+    index = pieceIndex(3)
+    corners, edges = index.corners[:4], index.midges[:4]
+    perms = [(cp, ep) for cp in permutations(range(4)) for ep in permutations(range(4))
+             if permParity(cp) == permParity(ep)]
+    twists = [co for co in product(range(3), repeat=4) if sum(co) % 3 == 0]
+    flips = [eo for eo in product(range(2), repeat=4) if sum(eo) % 2 == 0]
+    match caseSet:
+        case "OLL":  states = [((0, 1, 2, 3), co, (0, 1, 2, 3), eo) for co in twists for eo in flips]
+        case "PLL":  states = [(cp, (0,) * 4, ep, (0,) * 4) for cp, ep in perms]
+        case "ZBLL": states = [(cp, co, ep, (0,) * 4) for cp, ep in perms for co in twists if any(co)]
+        case _: raise ValueError(f"Unknown case set {caseSet!r}, expected one of {CASE_SETS}")
+
+    out = np.tile(np.arange(54, dtype=np.int16), (len(states), 1))
+    for row, (cp, co, ep, eo) in zip(out, states):
+        for slot in range(4):
+            row[corners[slot]] = np.roll(corners[cp[slot]], -co[slot])
+            row[edges[slot]] = np.roll(edges[ep[slot]], -eo[slot])
+    return out
+
+def _aufVariants(perms: np.ndarray) -> np.ndarray:
+    """The ``(k, 16, 54)`` permutations of ``U^a``, then each state, then ``U^b``, as variant ``4a + b``."""
+    u = [np.array(algorithmPerm(3, _uTurns(k)), dtype=np.int16) for k in range(4)]
+    return np.stack([u[a][perms][:, u[b]] for a in range(4) for b in range(4)], axis=1)
+
+def _faceCodes(cube: CubeN) -> np.ndarray | None:
+    """The face each sticker of a 3x3 belongs to, going by the centres (None if two centres share a colour)."""
+    flat = flatten(cube)
+    face = {flat[9*f + 4]: f for f in range(6)}
+    if len(face) < 6: return None
+    return np.array([face.get(s, -1) for s in flat])
+
+def _lookup(caseSet: str, entries: dict[int, int], cube: CubeN) -> tuple[int, int, int] | None:
+    """Returns the case, and the AUFs before and after its reference state, of a cube (None if it has none)."""
+    codes = _faceCodes(cube)
+    if codes is None or (codes[_NOT_LL] != _HOME[_NOT_LL]).any(): return None
+    entry = entries.get(int(_signatures(caseSet, codes)))
+    if entry is None: return None
+    case, variant = divmod(entry, 16)
+    return case, variant // 4, variant % 4
+
+def _buildIndex(caseSet: str) -> dict[str, np.ndarray]:
+    variants = _aufVariants(_states(caseSet))
+    signatures = _signatures(caseSet, _HOME[variants])
+    # a case is identified by the lowest signature of its states, the signature of one of them without AUFs
+    caseKeys = np.unique(signatures.min(axis=1)).tolist()
+
+    entries, references = {}, []
+    for case, key in enumerate(caseKeys):
+        ref = np.flatnonzero(signatures[:, 0] == key)[0]
+        references.append(variants[ref, 0])
+        for v, sig in enumerate(signatures[ref].tolist()):
+            entries.setdefault(sig, case * 16 + v)
+
+    names = [""] * len(caseKeys)
+    algs = [[] for _ in caseKeys]
+    for name, alg in _KNOWN[caseSet].items():
+        match = _lookup(caseSet, entries, CubeN(3) >> -Algorithm(alg))
+        if match is None: raise ValueError(f"The {name} algorithm does not solve a {caseSet} case")
+        case, before, after = match
+        names[case] = name
+        # the algorithm solves U^before, the reference state, U^after: make it solve the reference state itself
+        algs[case].append(str(_uTurns(after) + Algorithm(alg) + _uTurns(before)))
+
+    skip = entries.get(int(_signatures(caseSet, _HOME)), -16) // 16
+    for case, ref in enumerate(references):
+        if case == skip:
+            names[case], algs[case] = "skip", [""]
+        elif not algs[case]:
+            from .solver import solve
+            algs[case].append(str(solve(cubeFromCodes(_HOME[ref], 3, 'wgrboy'))))
+
+    order = sorted(entries)
+    return {
+        "signatures": np.array(order, dtype=np.int64),
+        "entries": np.array([entries[k] for k in order], dtype=np.int32),
+        "names": np.array(names),
+        "algorithms": np.array(['\n'.join(a) for a in algs]),
+    }
+
+########################################################################################################################
+
+class CaseIndex:
+    def __init__(self, caseSet: str, tables: dict[str, np.ndarray]):
+        """
+        The cases of one case set, and the index recognizing them. Use ``caseIndex(caseSet)``, which caches them.
+
+        :param caseSet: One of ``CASE_SETS``.
+        :param tables: The index arrays built by ``_buildIndex``.
+        """
+        self.set = caseSet
+        self.cases = tuple(
+            Case(caseSet, k, name or None, tuple(algs.split('\n')))
+            for k, (name, algs) in enumerate(zip(tables["names"].tolist(), tables["algorithms"].tolist()))
+        )
+        self._entries = dict(zip(tables["signatures"].tolist(), tables["entries"].tolist()))
+
+    def __len__(self) -> int:
+        return len(self.cases)
+
+    def __getitem__(self, name: str) -> Case:
+        """Returns the case with the given name."""
+        for case in self.cases:
+            if case.name == name: return case
+        raise KeyError(name)
+
+    def recognize(self, cube: CubeN) -> Match | None:
+        """
+        Returns the case of a 3x3 cube in this set.
+
+        :param cube: The cube, F2L solved and U layer on top (colours are read relative to the centres).
+
+        :rtype: Match | None
+        :returns: The case and AUFs of the cube, or None if its F2L is not solved or its last layer not in the set.
+        """
+        if cube.size != 3: raise ValueError(f"Last-layer cases exist only for 3x3 cubes (got n={cube.size})")
+        match = _lookup(self.set, self._entries, cube)
+        if match is None: return None
+        case, before, after = match
+        return Match(self.cases[case], before, after)
+
+@lru_cache(maxsize=None)
+def caseIndex(caseSet: str) -> CaseIndex:
+    """Returns the index of a case set (``OLL``, ``PLL`` or ``ZBLL``), loading or building it on first use."""
+    caseSet = caseSet.upper()
+    if caseSet not in CASE_SETS:
+        raise ValueError(f"Unknown case set {caseSet!r}, expected one of {CASE_SETS}")
+    return CaseIndex(caseSet, loadOrBuild(f"cases-{caseSet.lower()}-v1", lambda: _buildIndex(caseSet)))
+
+def recognize(cube: CubeN, caseSet: str = "PLL") -> Match | None:
+    """
+    Returns the last-layer case of a 3x3 cube (see ``CaseIndex.recognize``).
+
+    >>> recognize(CubeN() >> "R U2 R' U' R U' R'", "OLL").case.name -> 'OLL 27'
+    """
+    return caseIndex(caseSet).recognize(cube)
@@ -0,0 +1,161 @@
+"""
+The ``cubingtools`` command line tool: bulk operations on newline-delimited algorithms, streamed stdin to stdout.
+
+>>> printf "R U R' U' R U R' U'\\nR R'\\n" | cubingtools simplify
+>>> cubingtools size --metric QTM --format json < algs.txt > sizes.ndjson
+>>> cubingtools scramble --size 3 --count 1000000 --jobs 8 > scrambles.txt
+
+Each input line gives one output line, in input order. With ``--format tsv`` (the default) a line is the input, a
+tab and the result, or the input, two tabs and an error message. With ``--format json`` it is a JSON object with
+``input`` and either ``result`` or ``error``. Bad lines are reported and skipped; they do not stop the batch.
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import re
+import sys
+from functools import partial
+from itertools import islice
+from multiprocessing import Pool
+from typing import Callable, Iterable, Iterator, TextIO
+
+from .algorithm import Algorithm, simplified, reduced
+from .algorithmExtensions import order, equiv
+from .cube import CubeN
+from .metric import Metric, size
+from .error import InvalidMoveError, InvalidAlgorithmError, InvalidCubeError
+
+########################################################################################################################
+
+_ERRORS = (InvalidMoveError, InvalidAlgorithmError, InvalidCubeError, ValueError)
+_FACELETS = re.compile(r"[URFDLB]+")
+
+# lines handed to a worker process at a time
+_CHUNK = 256
+
+def _simplify(line: str, args) -> str:
+    return str(simplified(Algorithm(line)))
+
+def _reduce(line: str, args) -> str:
+    return str(reduced(Algorithm(line)))
+
+def _size(line: str, args) -> int:
+    return size(Algorithm(line), args.metric)
+
+def _order(line: str, args) -> int:
+    return order(Algorithm(line), args.size)
+
+def _equiv(line: str, args) -> bool:
+    first, sep, second = line.partition('\t')
+    if not sep: raise ValueError("Expected two algorithms separated by a tab")
+    return equiv(Algorithm(first), Algorithm(second))
+
+def _solve(line: str, args) -> str:
+    """Solves a facelet string (see ``serialize.toFacelets``), or the state a scramble leaves a solved cube in."""
+    from .solver import solve
+    if _FACELETS.fullmatch(line) and len(line) in (24, 54):
+        from .serialize import fromFacelets
+        cube = fromFacelets(line)
+    else:
+        cube = CubeN(args.size) >> line
+    return str(solve(cube, args.max_length))
+
+def _scramble(seed: int, args) -> str:
+    import random
+    return str(CubeN(args.size).scramble(args.length, random.Random(seed)))
+
+_OPERATIONS: dict[str, Callable] = {
+    "simplify": _simplify,
+    "reduce": _reduce,
+    "size": _size,
+    "order": _order,
+    "equiv": _equiv,
+    "solve": _solve,
+    "scramble": _scramble,
+}
+
+########################################################################################################################
+
+def _run(op: str, args, item) -> tuple[object, str | None]:
+    """Applies an operation to one item, returning ``(result, error)``."""
+    try:
+        return _OPERATIONS[op](item, args), None
+    except _ERRORS as e:
+        return None, f"{type(e).__name__}: {e}"
+
+def _results(pool: Pool | None, op: str, args, items: list) -> Iterator[tuple[object, str | None]]:
+    """Returns the results of an operation over items, in order, using the pool if there is one."""
+    work = partial(_run, op, args)
+    return map(work, items) if pool is None else pool.imap(work, items, chunksize=_CHUNK)
+
+def _chunks(items: Iterable, size: int) -> Iterator[list]:
+    items = iter(items)
+    while chunk := list(islice(items, size)):
+        yield chunk
+
+def _write(out: TextIO, fmt: str, item: str, result: object, error: str | None) -> None:
+    if fmt == 'json':
+        record = {"input": item, "error": error} if error else {"input": item, "result": result}
+        out.write(json.dumps(record) + '\n')
+    elif error:
+        out.write(f"{item}\t\t{error}\n")
+    else:
+        out.write(f"{item}\t{result}\n")
+
+def _scrambleItems(args) -> Iterator[int]:
+    """One seed per scramble, drawn from ``--seed`` so output does not depend on ``--jobs``."""
+    import random
+    master = random.Random(args.seed)
+    for _ in range(args.count): yield master.getrandbits(64)
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cubingtools", description="Bulk Rubik's cube operations on stdin/stdout.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--format", choices=("tsv", "json"), default="tsv", help="output format (default tsv)")
+    common.add_argument("--jobs", type=int, default=1, help="worker processes (default 1)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("simplify", parents=[common], help="simplify each algorithm")
+    sub.add_parser("reduce", parents=[common], help="reduce each algorithm (merging commuting moves too)")
+    p = sub.add_parser("size", parents=[common], help="the size of each algorithm under a metric")
+    p.add_argument("--metric", type=str.upper, choices=[str(m) for m in Metric], default=str(Metric.OBTM))
+    p = sub.add_parser("order", parents=[common], help="the order of each algorithm")
+    p.add_argument("--size", type=int, default=None, help="cube size (default: the algorithm's degree)")
+    sub.add_parser("equiv", parents=[common], help="whether two tab-separated algorithms have the same effect")
+    p = sub.add_parser("solve", parents=[common], help="solve each scramble or facelet string (2x2 or 3x3)")
+    p.add_argument("--size", type=int, default=3, choices=(2, 3), help="cube size for scrambles (default 3)")
+    p.add_argument("--max-length", type=int, default=None, help="maximum solution length")
+    p = sub.add_parser("scramble", parents=[common], help="generate random-move scrambles (no input)")
+    p.add_argument("--size", type=int, default=3, help="cube size (default 3)")
+    p.add_argument("--count", type=int, default=1, help="number of scrambles (default 1)")
+    p.add_argument("--length", type=int, default=None, help="moves per scramble (default 8*size)")
+    p.add_argument("--seed", type=int, default=None, help="seed for reproducible scrambles")
+    return parser
+
+def main(argv: list[str] | None = None, stdin: TextIO | None = None, stdout: TextIO | None = None) -> int:
+    """Runs the command line tool, returning its exit code (1 if any line failed)."""
+    args = _parser().parse_args(argv)
+    stdin, stdout = stdin or sys.stdin, stdout or sys.stdout
+
+    if args.command == "scramble":
+        items = _scrambleItems(args)
+    else:
+        items = (line.rstrip('\r\n') for line in stdin)
+        items = (line for line in items if line.strip())
+
+    # input is read one batch at a time, so huge inputs are never held in memory and output streams out
+    pool = Pool(args.jobs) if args.jobs > 1 else None
+    failed = False
+    try:
+        for chunk in _chunks(items, _CHUNK * max(args.jobs, 1) * 4):
+            for item, (result, error) in zip(chunk, _results(pool, args.command, args, chunk)):
+                failed |= error is not None
+                if args.command == "scramble":
+                    stdout.write(json.dumps({"result": result}) + '\n' if args.format == 'json' else f"{result}\n")
+                else:
+                    _write(stdout, args.format, item, result, error)
+            stdout.flush()
+    finally:
+        if pool is not None: pool.terminate()
+    return 1 if failed else 0
@@ -4,26 +4,102 @@ Contains the `CubeN` class working with NxN Rubik's cubes for N>=2
 
 from .algorithm import Algorithm
 from .move import Move
-from ._enumHelpers import _BaseMove, _FACES, _MODS, _FACES_LIST
+from .canonical import MoveAutomaton
+from . import profiling as _profiling
+from ._enumHelpers import _BaseMove, _MODS, _FACES_LIST
 import random
-from copy import deepcopy
+from functools import lru_cache
+from itertools import chain
 
 ########################################################################################################################
 
-def _generateScrambleMoveList(n: int) -> list[Move]:
-    face_moves = [Move(1, f, 1) for f in _FACES]
+@lru_cache(maxsize=None)
+def _generateScrambleMoveList(n: int) -> tuple[Move, ...]:
+    face_moves = [Move(1, f, 1) for f in _FACES_LIST]
     if n == 2:
-        return face_moves[:3]
+        return tuple(face_moves[:3])
     wide_moves = [
         Move(w, f, 1)
         for w in range(2, 1 + n // 2)
-        for f in _FACES
+        for f in _FACES_LIST
     ]
-    return face_moves + wide_moves
+    return tuple(face_moves + wide_moves)
+
+@lru_cache(maxsize=None)
+def _scrambleAutomaton(n: int) -> MoveAutomaton:
+    """The canonical-sequence automaton over every power of the scramble moves of an NxN cube."""
+    return MoveAutomaton(Move(m.width, m.mov, mod) for m in _generateScrambleMoveList(n) for mod in _MODS)
+
+Snapshot = tuple[str, ...]
+
+@lru_cache(maxsize=None)
+def _solvedTemplate(n: int, cols: str) -> Snapshot:
+    """The solved state of NxN cubes coloured ``cols``, as a snapshot shared by all of them."""
+    return tuple(c for c in cols for _ in range(n * n))
+
+@lru_cache(maxsize=None)
+def _solvedRows(n: int, cols: str) -> tuple[tuple[str, tuple[str, ...]], ...]:
+    """The shared solved template cut into each face's rows, ready to be copied into a state."""
+    snap, nn = _solvedTemplate(n, cols), n * n
+    return tuple((f, tuple(snap[i:i + n] for i in range(k * nn, (k + 1) * nn, n))) for k, f in enumerate(_FACES_LIST))
+
+def _solvedState(n: int, cols: str) -> dict:
+    """Builds a fresh solved state of an NxN cube coloured ``cols``, copying the rows of the shared template."""
+    if not isinstance(cols, str):   # a list of colours cannot key the template cache
+        return {f: [[c] * n for _ in range(n)] for f, c in zip(_FACES_LIST, cols)}
+    return {f: list(map(list, rows)) for f, rows in _solvedRows(n, cols)}
+
+_VALID_SHAPES: set[tuple[int, str]] = set()
+
+def _checkShape(n: int, cols: str) -> None:
+    """
+    Validates constructor arguments. Valid string colour schemes are remembered, so building many cubes of one kind
+    only checks them once (other sequences of colours are checked every time).
+    """
+    if isinstance(cols, str) and (n, cols) in _VALID_SHAPES: return
+    if n <= 1: raise ValueError("Cube size must be at least 2")
+    if len(cols) != 6: raise ValueError("There must be exactly 6 colors for the cube faces")
+    if len(set(cols)) != 6: raise ValueError("Colors for the cube faces must be unique")
+    if isinstance(cols, str): _VALID_SHAPES.add((n, cols))
+
+def _faceProperty(face: _BaseMove) -> property:
+    """Exposes ``state[face]`` as an attribute, e.g. ``cube.U``."""
+    def getter(self) -> list[list[str]]:
+        return self.state[face]
+    def setter(self, mat: list[list[str]]) -> None:
+        self.state[face] = mat
+    return property(getter, setter)
+
+def _stateOf(snap: Snapshot, n: int) -> dict:
+    """Builds a fresh (mutable) state dict from a snapshot."""
+    nn = n * n
+    return {f: [list(snap[i:i + n]) for i in range(k * nn, (k + 1) * nn, n)] for k, f in enumerate(_FACES_LIST)}
+
+class _Journal:
+    """The open checkpoints of a cube and the moves made since the first of them."""
+    __slots__ = ('marks', 'moves', 'stored', 'busy')
+
+    def __init__(self):
+        self.marks: list[tuple[int, dict | None]] = []  # (moves made before it, the state it saved if any)
+        self.moves: list[Move] = []
+        self.stored = 0      # stickers held by saved states
+        self.busy = False    # inside a turn, whose own expansion into other turns is not journaled
 
 ########################################################################################################################
 
 class CubeN:
+    __slots__ = ('size', 'cols', '_ms', 'state', '_journal')
+
+    # the most stickers a cube's journal keeps in saved states, beyond which checkpoints are restored by inverse moves
+    journalLimit = 1 << 16
+
+    U = _faceProperty(_BaseMove.UTurn)
+    F = _faceProperty(_BaseMove.FTurn)
+    R = _faceProperty(_BaseMove.RTurn)
+    B = _faceProperty(_BaseMove.BTurn)
+    L = _faceProperty(_BaseMove.LTurn)
+    D = _faceProperty(_BaseMove.DTurn)
+
     def __init__(self, n: int = 3, cols: str = 'wgrboy'):
         """
         Initializes a solved NxNxN Rubik's Cube, defaulting to the classic 3x3
@@ -35,30 +111,12 @@ class CubeN:
         >>> myCube  = CubeN()                   # 3x3 cube with standard color scheme (wgrboy)
         >>> revenge = CubeN(n=4, cols='abcdef') # 4x4 cube with custom color scheme
         """
-        if n <= 1: raise ValueError("Cube size must be at least 2")
-        if len(cols) != 6: raise ValueError("There must be exactly 6 colors for the cube faces")
-        if len(set(cols)) != 6: raise ValueError("Colors for the cube faces must be unique")
-
+        _checkShape(n, cols)
         self.size = n
         self.cols = cols
-
         self._ms = _generateScrambleMoveList(n)
-
-        # Generate solved and initial state
-        def genFaceMat(col: str) -> list[list[str]]:
-            return [[col for _ in range(self.size)] for _ in range(self.size)]
-
-        stateKs = _FACES_LIST
-        stateVs = list(map(genFaceMat, self.cols))
-        self.state = dict(zip(stateKs, deepcopy(stateVs)))
-        self.solved = deepcopy(self.state)
-
-        for face in _FACES:
-            def getter(s, f=face):
-                return s.state[f]
-            def setter(s, mat, f=face):
-                s.state[f] = mat
-            setattr(CubeN, face.value, property(getter, setter))
+        self.state = _solvedState(n, cols)
+        self._journal: _Journal | None = None
 
     def showFace(self, face: str) -> str:
         """
@@ -175,6 +233,21 @@ class CubeN:
 
     def _turn(self, move: Move) -> None:
         """Executes a given `Move` to the cube's state."""
+        journal = self._journal
+        if journal is not None and not journal.busy:
+            journal.busy = True
+            try:
+                self._turn(move)
+            finally:
+                journal.busy = False
+            journal.moves.append(move)
+            return
+        if _profiling.ACTIVE is not None:
+            _profiling.ACTIVE.turn(self, move)
+        else:
+            self._execute(move)
+
+    def _execute(self, move: Move) -> None:
         width, mov, mod = move.width, move.mov, move.mod
 
         if mod != 1:
@@ -183,6 +256,10 @@ class CubeN:
 
         uMov = 'U' if width == 1 else f'{width}Uw'
 
+        if _profiling.ACTIVE is not None and mov in 'xyzU':
+            n = self.size
+            _profiling.ACTIVE.touch(6 * n * n if mov in 'xyz' else n * n + 4 * n * width)
+
         match mov:
             case 'x': self._xRot()
             case 'y': self._yRot()
@@ -199,11 +276,11 @@ class CubeN:
             case 'S': self.algo("F' B z")
 
             case 'u': self.algo("y D")
-            case 'd': self.algo("y' U'")
+            case 'd': self.algo("y' U")
             case 'l': self.algo("x' R")
             case 'r': self.algo("x L")
             case 'f': self.algo("z B")
-            case 'b': self.algo("z' F'")
+            case 'b': self.algo("z' F")
 
     def algo(self, alg: Move | str | Algorithm) -> None:
         """
@@ -252,9 +329,138 @@ class CubeN:
             if not faceSolved(face): return False
         return True
 
+    @property
+    def solved(self) -> dict:
+        """The solved state of the cube (a fresh copy of the template shared by every cube of its size and colours)."""
+        return _solvedState(self.size, self.cols)
+
     def reset(self) -> None:
         """Resets the cube to its initial state."""
-        self.state = deepcopy(self.solved)
+        self.state = _solvedState(self.size, self.cols)
+
+    def copy(self) -> 'CubeN':
+        """
+        Returns an independent copy of the cube.
+
+        >>> branch = myCube.copy() >> "R U" # myCube is unchanged
+
+        .. Notes::
+        Only the rows of stickers are copied, which is much cheaper than ``deepcopy`` (which also uses this).
+        """
+        new = CubeN.__new__(CubeN)
+        new.size, new.cols, new._ms, new._journal = self.size, self.cols, self._ms, None
+        new.state = {f: [row[:] for row in face] for f, face in self.state.items()}
+        return new
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo: dict) -> 'CubeN':
+        return self.copy()
+
+    def snapshot(self) -> Snapshot:
+        """
+        Returns the cube's state as an immutable flat tuple of stickers (in ``facelets`` order), which can be kept,
+        shared and hashed freely, and later given to ``restore``.
+        """
+        return tuple(chain.from_iterable(row for f in _FACES_LIST for row in self.state[f]))
+
+    def restore(self, snap: Snapshot) -> None:
+        """
+        Sets the cube's state back to a snapshot taken by ``snapshot``.
+
+        :raises ValueError: If the snapshot is not one of an NxN cube of this size.
+        """
+        if len(snap) != 6 * self.size * self.size:
+            raise ValueError(f"Snapshot of {len(snap)} stickers does not fit a {self.size}x{self.size} cube")
+        self.state = _stateOf(snap, self.size)
+
+    ####################################################################################################################
+
+    def push(self) -> None:
+        """
+        Opens a checkpoint: ``pop`` later brings the cube back to its current state.
+
+        >>> myCube.push() ; myCube >> "R U R'"
+        >>> myCube.pop()    # as it was before "R U R'"
+
+        .. Notes::
+        Checkpoints nest. While one is open, every move is journaled (``restore`` and ``reset`` are not, so avoid
+        them inside a checkpoint). Small cubes also keep their current buffer of stickers and carry on with a copy,
+        so ``pop`` only swaps it back; once the saved buffers would hold more than ``CubeN.journalLimit``
+        stickers, checkpoints are instead restored by applying the inverse permutation of the moves made since.
+        """
+        if self._journal is None: self._journal = _Journal()
+        journal, stickers = self._journal, 6 * self.size * self.size
+        saved = None
+        if journal.stored + stickers <= self.journalLimit:
+            saved, journal.stored = self.state, journal.stored + stickers
+            self.state = {f: [row[:] for row in face] for f, face in saved.items()}
+        journal.marks.append((len(journal.moves), saved))
+
+    def _closeMark(self) -> tuple[int, dict | None]:
+        journal = self._journal
+        if journal is None: raise IndexError("No checkpoint to close: use push() first")
+        start, saved = journal.marks.pop()
+        if saved is not None: journal.stored -= 6 * self.size * self.size
+        if not journal.marks: self._journal = None
+        return start, saved
+
+    def pop(self) -> None:
+        """
+        Brings the cube back to its state at the last open checkpoint, and closes it.
+
+        :raises IndexError: If no checkpoint is open.
+        """
+        journal = self._journal
+        start, saved = self._closeMark()
+        if saved is not None:
+            self.state = saved
+        else:
+            self._unturn(journal.moves[start:])
+        del journal.moves[start:]
+
+    def commit(self) -> None:
+        """
+        Closes the last open checkpoint, keeping the cube's current state.
+
+        :raises IndexError: If no checkpoint is open.
+        """
+        self._closeMark()
+
+    def undo(self, k: int = 1) -> None:
+        """
+        Takes back the last ``k`` moves made since the last open checkpoint.
+
+        :param k: The number of moves to take back (``0`` does nothing).
+
+        :raises ValueError: If ``k`` is negative.
+        :raises IndexError: If no checkpoint is open, or fewer than ``k`` moves were made since it.
+
+        .. Notes::
+        The moves are taken back by a single permutation of all ``6n²`` stickers (the inverse of the moves,
+        composed), so the cost is ``O(n²)`` however many moves ``k`` is. That beats turning many moves back, but a
+        turn only touches ``O(n)`` stickers per layer, so on large cubes undoing a single outer turn costs about as
+        much as the turn itself, or a little more.
+        """
+        if k < 0:
+            raise ValueError(f"Cannot undo a negative number of moves (your k={k})")
+        journal = self._journal
+        if journal is None or k > len(journal.moves) - journal.marks[-1][0]:
+            raise IndexError(f"Cannot undo {k} moves: fewer were made since the last checkpoint")
+        if k == 0: return
+        self._unturn(journal.moves[-k:])
+        del journal.moves[-k:]
+
+    def _unturn(self, moves: list[Move]) -> None:
+        """Applies the inverse of a list of moves, as one permutation of the stickers."""
+        from .facelets import _movePerm, compose, flatten, unflatten
+        n, p = self.size, None
+        for m in reversed(moves):
+            q = _movePerm(n, m.width, str(m.mov), int(-m.mod))
+            p = q if p is None else compose(p, q)
+        if p is not None:
+            stickers = flatten(self)
+            unflatten(self, [stickers[i] for i in p])
 
     def _randMove(self) -> Move:
         mov = random.choice(self._ms)
@@ -263,27 +469,67 @@ class CubeN:
     def __hash__(self) -> int:
         return hash(''.join([''.join(''.join(r) for r in self.state[f]) for f in _FACES_LIST]))
 
-    def scramble(self, m: int | None = None) -> Algorithm:
+    def to_bytes(self) -> bytes:
+        """
+        Returns the cube's state packed to 3 bits per sticker, with a small header holding its size and colour scheme.
+
+        >>> CubeN.from_bytes(myCube.to_bytes()) # a copy of myCube
+        """
+        from .serialize import toBytes
+        return toBytes(self)
+
+    @staticmethod
+    def from_bytes(data: bytes) -> 'CubeN':
+        """Returns the cube packed by ``CubeN.to_bytes``."""
+        from .serialize import fromBytes
+        return fromBytes(data)
+
+    def to_facelets(self) -> str:
+        """
+        Returns the cube's state as a facelet string (face letters in URFDLB order, as used by Kociemba's solvers).
+        """
+        from .serialize import toFacelets
+        return toFacelets(self)
+
+    @staticmethod
+    def from_facelets(facelets: str, cols: str = 'wgrboy') -> 'CubeN':
+        """Returns the cube described by a facelet string, coloured with ``cols``."""
+        from .serialize import fromFacelets
+        return fromFacelets(facelets, cols)
+
+    def scramble(self, m: int | None = None, rng: random.Random | None = None) -> Algorithm:
         """
         Scrambles the cube with randomized moves and returns the generated scramble algorithm.
 
         :param m: The number of moves to scramble the cube by.
+        :param rng: Source of randomness, defaults to the ``random`` module's shared generator. Pass a seeded
+            ``random.Random`` for reproducible scrambles.
+
+        .. Notes::
+        Moves are drawn from the canonical-sequence automaton (see ``canonical.MoveAutomaton``), so a scramble never
+        repeats a base move or cancels across commuting moves, as in ``R L R'``.
         """
         moves = m or 8*self.size
         states = set()
         algo = Algorithm()
-        lastBaseMov = None
-        while len(algo) < moves:
-            mv = self._randMove()
-
-            if lastBaseMov == mv.mov: continue
-            lastBaseMov = mv.mov
-
-            self.algo(mv)
-            if self in states:
-                self.algo(-mv)
-                continue
-
-            states.add(self)
-            algo += mv
+        fsm = _scrambleAutomaton(self.size)
+        fsmState = fsm.start
+        choice = (rng or random).choice
+        # a rejected move is taken back through the journal, by one permutation rather than a second turn
+        self.push()
+        try:
+            while len(algo) < moves:
+                i = choice(fsm.allowed(fsmState))
+                mv = fsm.moves[i]
+
+                self.algo(mv)
+                if self in states:
+                    self.undo()
+                    continue
+
+                states.add(self)
+                algo.extend(mv)
+                fsmState = fsm.step(fsmState, i)
+        finally:
+            self.commit()
         return algo
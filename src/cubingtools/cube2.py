@@ -0,0 +1,144 @@
+"""
+Exact 2x2 solver backed by a table of the distance from solved of every one of the 3,674,160 2x2 states.
+"""
+
+from __future__ import annotations
+from typing import Iterable
+
+import numpy as np
+
+from .algorithm import Algorithm
+from .cube import CubeN
+from .cubie import CubieCube, allMoves, allPerms, rankPerm, moveOf
+from .error import InvalidCubeError
+from ._tables import loadOrBuild, moveArrays, orientationMoves, permutationMoves, pruning
+
+########################################################################################################################
+
+# slots of the seven corners the solver moves (the DBL corner, slot 6, never leaves home under <U, R, F>)
+_SLOTS7 = (0, 1, 2, 3, 4, 5, 7)
+_N_TWIST = 729
+_N_STATES = 5040 * _N_TWIST
+
+def _buildTables() -> dict[str, np.ndarray]:
+    cp, co, _, _ = moveArrays(allMoves(2))
+    cp7 = np.array([[_SLOTS7.index(m[s]) for s in _SLOTS7] for m in cp])
+    perm = permutationMoves(allPerms(7), cp7)
+    twist = orientationMoves(_N_TWIST, 7, 3, cp7, co[:, _SLOTS7])
+    return {'perm': perm, 'twist': twist, 'depth': pruning(perm, twist)}
+
+########################################################################################################################
+
+class Cube2:
+    def __init__(self):
+        """
+        Optimal (HTM) 2x2 solver. Constructing one loads (or on first use, builds and caches) the distance table of
+        every state, after which single queries take microseconds and batches are vectorized with NumPy.
+
+        >>> Cube2().solve(CubeN(2) >> "R U R' U'") -> Algorithm("U R U' R'")
+        """
+        t = loadOrBuild("cube2-v1", _buildTables)
+        self._permMove, self._twistMove, self._depth = t['perm'], t['twist'], t['depth']
+        # plain lists and bytes are much faster than NumPy arrays for scalar lookups
+        self._permList = self._permMove.ravel().tolist()
+        self._twistList = self._twistMove.ravel().tolist()
+        self._depthBytes = self._depth.tobytes()
+
+    ####################################################################################################################
+    # coordinates
+
+    @staticmethod
+    def coord(state: CubeN | CubieCube) -> int:
+        """
+        Returns the coordinate of a 2x2 state: the rank of its corner permutation times 729 plus its twist.
+
+        :param state: A 2x2 ``CubeN``, or the ``CubieCube`` of one.
+
+        :raises InvalidCubeError: If the state is not reachable from a solved cube.
+        """
+        c = state if isinstance(state, CubieCube) else CubieCube.fromCube(state)
+        if c.cp[6] != 6 or c.co[6] != 0 or sorted(c.cp) != list(range(8)) or sum(c.co) % 3 != 0:
+            raise InvalidCubeError("Cube state is not solvable")
+        perm = rankPerm([_SLOTS7.index(c.cp[s]) for s in _SLOTS7])
+        twist = 0
+        for s in _SLOTS7[:6]: twist = 3*twist + c.co[s]
+        return perm * _N_TWIST + twist
+
+    def coords(self, states: Iterable[CubeN | CubieCube | int] | np.ndarray) -> np.ndarray:
+        """Returns the coordinates of many states (coordinates themselves are passed through)."""
+        if isinstance(states, np.ndarray):
+            return states.astype(np.int64)
+        return np.array([s if isinstance(s, (int, np.integer)) else self.coord(s) for s in states], dtype=np.int64)
+
+    ####################################################################################################################
+    # single queries
+
+    def distance(self, state: CubeN | CubieCube | int) -> int:
+        """Returns the optimal (HTM) number of moves needed to solve a state."""
+        return self._depthBytes[state if isinstance(state, int) else self.coord(state)]
+
+    def solveCoord(self, x: int) -> list[int]:
+        """Returns an optimal solution of a coordinate, as move indices over ``URF`` (see ``cubie.moveOf``)."""
+        perm, twist, depth = self._permList, self._twistList, self._depthBytes
+        p, t = divmod(x, _N_TWIST)
+        d = depth[x]
+        out = []
+        while d > 0:
+            for m in range(9):
+                np_, nt = perm[9*p + m], twist[9*t + m]
+                if depth[_N_TWIST*np_ + nt] == d - 1: break
+            out.append(m)
+            p, t, d = np_, nt, d - 1
+        return out
+
+    def solveCubie(self, c: CubieCube, maxLength: int | None = None) -> list[int]:
+        """Returns an optimal solution of the corners of a cubie state, as move indices over ``URF``."""
+        x = self.coord(c)
+        if maxLength is not None and self._depthBytes[x] > maxLength:
+            raise ValueError(f"No solution of at most {maxLength} moves exists")
+        return self.solveCoord(x)
+
+    def solve(self, cube: CubeN, maxLength: int | None = None) -> Algorithm:
+        """
+        Returns an optimal algorithm of U, R and F turns solving a 2x2 cube.
+
+        :param cube: The cube to solve (it is not modified).
+        :param maxLength: If given, raise instead of returning a solution longer than this.
+
+        :raises InvalidCubeError: If the cube's state is not reachable from a solved cube.
+        :raises ValueError: If the optimal solution is longer than ``maxLength``.
+        """
+        if cube.size != 2:
+            raise ValueError(f"Cube2 solves 2x2 cubes only (got n={cube.size})")
+        return Algorithm([moveOf(m, "URF") for m in self.solveCubie(CubieCube.fromCube(cube), maxLength)])
+
+    ####################################################################################################################
+    # batch queries
+
+    def distances(self, states: Iterable[CubeN | CubieCube | int] | np.ndarray) -> np.ndarray:
+        """Returns the optimal (HTM) distance of every state in a batch."""
+        return self._depth[self.coords(states)]
+
+    def solveMany(self, states: Iterable[CubeN | CubieCube | int] | np.ndarray) -> list[Algorithm]:
+        """
+        Returns optimal solutions of a batch of states, stepping every state towards solved at once.
+
+        :param states: ``CubeN``/``CubieCube`` states, or an array of coordinates.
+        """
+        x = self.coords(states)
+        p, t = np.divmod(x, _N_TWIST)
+        d = self._depth[x].astype(np.int64)
+        steps = int(d.max()) if d.size else 0
+        moves = np.full((len(x), steps), -1, dtype=np.int8)
+
+        for i in range(steps):
+            active = d > 0
+            nbr = self._permMove[p] * _N_TWIST + self._twistMove[t]
+            best = np.argmax(self._depth[nbr] == (d - 1)[:, None], axis=1)
+            rows = np.nonzero(active)[0]
+            moves[rows, i] = best[rows]
+            p[rows] = self._permMove[p[rows], best[rows]]
+            t[rows] = self._twistMove[t[rows], best[rows]]
+            d[rows] -= 1
+
+        return [Algorithm([moveOf(int(m), "URF") for m in row if m >= 0]) for row in moves]
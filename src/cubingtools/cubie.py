@@ -0,0 +1,333 @@
+"""
+Cubie-level representation of 2x2 and 3x3 cube states, as corner and edge permutations and orientations.
+
+Corners are numbered ``URF UFL ULB UBR DFR DLF DBL DRB`` and edges ``UR UF UL UB DR DF DL DB FR FL BL BR``.
+"""
+
+from __future__ import annotations
+import random
+from functools import cache
+from itertools import combinations, permutations
+
+import numpy as np
+
+from .cube import CubeN
+from .move import Move
+from .error import InvalidCubeError
+from ._enumHelpers import _FACES_LIST
+
+########################################################################################################################
+
+# face order the solvers index moves by (move index = 3*face + quarter turns - 1)
+MOVE_FACES = "URFDLB"
+
+def cornerFacelets(n: int) -> tuple:
+    """
+    Returns the ``(face, row, col)`` stickers of each corner slot, with the U/D sticker first and the others clockwise.
+    """
+    m = n - 1
+    return (
+        (('U', m, m), ('R', 0, 0), ('F', 0, m)),
+        (('U', m, 0), ('F', 0, 0), ('L', 0, m)),
+        (('U', 0, 0), ('L', 0, 0), ('B', 0, m)),
+        (('U', 0, m), ('B', 0, 0), ('R', 0, m)),
+        (('D', 0, m), ('F', m, m), ('R', m, 0)),
+        (('D', 0, 0), ('L', m, m), ('F', m, 0)),
+        (('D', m, 0), ('B', m, m), ('L', m, 0)),
+        (('D', m, m), ('R', m, m), ('B', m, 0)),
+    )
+
+def edgeFacelets(n: int) -> tuple:
+    """
+    Returns the ``(face, row, col)`` stickers of each (middle) edge slot of an odd cube, U/D or F/B sticker first.
+    """
+    m, c = n - 1, n // 2
+    return (
+        (('U', c, m), ('R', 0, c)),
+        (('U', m, c), ('F', 0, c)),
+        (('U', c, 0), ('L', 0, c)),
+        (('U', 0, c), ('B', 0, c)),
+        (('D', c, m), ('R', m, c)),
+        (('D', 0, c), ('F', m, c)),
+        (('D', c, 0), ('L', m, c)),
+        (('D', m, c), ('B', m, c)),
+        (('F', c, m), ('R', c, 0)),
+        (('F', c, 0), ('L', c, m)),
+        (('B', c, m), ('L', c, 0)),
+        (('B', c, 0), ('R', c, m)),
+    )
+
+########################################################################################################################
+
+def permParity(p: list[int]) -> int:
+    """Returns the parity (0 for even, 1 for odd) of a permutation by counting its cycles."""
+    seen = [False] * len(p)
+    parity = 0
+    for i in range(len(p)):
+        if seen[i]: continue
+        j, length = i, 0
+        while not seen[j]:
+            seen[j] = True
+            j = p[j]
+            length += 1
+        parity ^= (length - 1) & 1
+    return parity
+
+@cache
+def allPerms(n: int) -> np.ndarray:
+    """Returns every permutation of ``range(n)`` in lexicographic order, so that row ``i`` has rank ``i``."""
+    return np.array(list(permutations(range(n))), dtype=np.int8)
+
+def rankPerms(perms: np.ndarray) -> np.ndarray:
+    """Returns the lexicographic rank of each row of a ``(k, n)`` array of permutations."""
+    k, n = perms.shape
+    rank = np.zeros(k, dtype=np.int64)
+    for i in range(n):
+        smaller = (perms[:, i+1:] < perms[:, i:i+1]).sum(axis=1)
+        rank = rank * (n - i) + smaller
+    return rank
+
+def rankPerm(p: list[int]) -> int:
+    """Returns the lexicographic rank of a single permutation."""
+    n = len(p)
+    rank = 0
+    for i in range(n):
+        rank = rank * (n - i) + sum(1 for j in range(i+1, n) if p[j] < p[i])
+    return rank
+
+########################################################################################################################
+
+class CubieCube:
+    def __init__(self,
+                 cp: list[int] | None = None,
+                 co: list[int] | None = None,
+                 ep: list[int] | None = None,
+                 eo: list[int] | None = None):
+        """
+        A cube state at the cubie level. ``cp[i]`` is the corner in slot ``i`` and ``co[i]`` its clockwise twist,
+        likewise ``ep``/``eo`` for edges. Defaults to the solved state.
+
+        :param cp: Corner permutation.
+        :param co: Corner orientations (0, 1 or 2).
+        :param ep: Edge permutation.
+        :param eo: Edge orientations (0 or 1).
+        """
+        self.cp = list(cp) if cp is not None else list(range(8))
+        self.co = list(co) if co is not None else [0] * 8
+        self.ep = list(ep) if ep is not None else list(range(12))
+        self.eo = list(eo) if eo is not None else [0] * 12
+
+    def __eq__(self, other: 'CubieCube') -> bool:
+        return (self.cp, self.co, self.ep, self.eo) == (other.cp, other.co, other.ep, other.eo)
+
+    def __repr__(self) -> str:
+        return f'CubieCube(cp={self.cp}, co={self.co}, ep={self.ep}, eo={self.eo})'
+
+    def __mul__(self, other: 'CubieCube') -> 'CubieCube':
+        """Returns the state reached by applying ``other`` after ``self``."""
+        return CubieCube(
+            [self.cp[other.cp[i]] for i in range(8)],
+            [(self.co[other.cp[i]] + other.co[i]) % 3 for i in range(8)],
+            [self.ep[other.ep[i]] for i in range(12)],
+            [(self.eo[other.ep[i]] + other.eo[i]) % 2 for i in range(12)],
+        )
+
+    def isSolvable(self) -> bool:
+        """Checks that the state obeys the orientation and parity laws of a real 3x3."""
+        return (sorted(self.cp) == list(range(8)) and sorted(self.ep) == list(range(12))
+                and sum(self.co) % 3 == 0 and sum(self.eo) % 2 == 0
+                and permParity(self.cp) == permParity(self.ep))
+
+    @staticmethod
+    def random(rng: random.Random | None = None, edges: bool = True) -> 'CubieCube':
+        """
+        Returns a uniformly random solvable state.
+
+        :param rng: Source of randomness, defaults to a freshly seeded ``random.Random``.
+        :param edges: If ``False``, the state of a 2x2 is sampled instead: the DBL corner stays solved and the
+                      edges are left untouched.
+        """
+        rng = rng or random.Random()
+        c = CubieCube()
+
+        if edges:
+            rng.shuffle(c.cp)
+            rng.shuffle(c.ep)
+            if permParity(c.cp) != permParity(c.ep):
+                c.ep[10], c.ep[11] = c.ep[11], c.ep[10]
+            c.co = [rng.randrange(3) for _ in range(7)]
+            c.eo = [rng.randrange(2) for _ in range(11)]
+            c.co.append(-sum(c.co) % 3)
+            c.eo.append(sum(c.eo) % 2)
+        else:
+            others = [0, 1, 2, 3, 4, 5, 7]
+            rng.shuffle(others)
+            c.cp = others[:6] + [6] + others[6:]
+            c.co = [rng.randrange(3) for _ in range(6)]
+            c.co += [0, -sum(c.co) % 3]
+        return c
+
+    ####################################################################################################################
+    # coordinates
+
+    def twist(self) -> int:
+        """Corner orientation coordinate, ``0 <= twist < 3^7``."""
+        t = 0
+        for o in self.co[:7]: t = 3*t + o
+        return t
+
+    def flip(self) -> int:
+        """Edge orientation coordinate, ``0 <= flip < 2^11``."""
+        f = 0
+        for o in self.eo[:11]: f = 2*f + o
+        return f
+
+    def slice(self) -> int:
+        """Positions of the four E-slice edges (ignoring their order), ``0 <= slice < 495``, 0 when in the slice."""
+        return SLICE_FROM_MASK[sum(1 << i for i in range(12) if self.ep[i] >= 8)]
+
+    def cornerPerm(self) -> int:
+        """Corner permutation coordinate, ``0 <= cornerPerm < 8!``."""
+        return rankPerm(self.cp)
+
+    def udEdges(self) -> int:
+        """Permutation of the eight U/D edges, only meaningful once they are all in the U and D layers."""
+        return rankPerm(self.ep[:8])
+
+    def sliceSorted(self) -> int:
+        """Permutation of the four E-slice edges, only meaningful once they are all in the E slice."""
+        return rankPerm([e - 8 for e in self.ep[8:]])
+
+    ####################################################################################################################
+    # facelet conversion
+
+    @staticmethod
+    def fromCube(cube: CubeN) -> 'CubieCube':
+        """
+        Reads the cubie state of a 2x2 or 3x3 ``CubeN``.
+
+        :param cube: The cube to read.
+
+        :rtype: CubieCube
+        :returns: The state of the cube, relative to its centres (3x3) or its DBL corner (2x2).
+
+        :raises ValueError: If the cube is not a 2x2 or 3x3.
+        :raises InvalidCubeError: If the stickers do not describe a real cube's pieces.
+        """
+        n = cube.size
+        if n not in (2, 3):
+            raise ValueError(f"Cubie states exist only for 2x2 and 3x3 cubes (got n={n})")
+
+        st = cube.state
+        read = lambda slot: tuple(st[f][r][c] for f, r, c in slot)
+        corners = [read(slot) for slot in cornerFacelets(n)]
+
+        if n == 3:
+            faceCol = {f: st[f][1][1] for f in 'UFRBLD'}
+        else:
+            faceCol = _frameFromCorners(corners)
+        if len(set(faceCol.values())) != 6:
+            raise InvalidCubeError("Cube does not have six distinct face colours")
+
+        c = CubieCube()
+        homeCorners = {tuple(faceCol[f] for f, _, _ in slot): j for j, slot in enumerate(cornerFacelets(n))}
+        ud = (faceCol['U'], faceCol['D'])
+        for i, cols in enumerate(corners):
+            ori = next((k for k in range(3) if cols[k] in ud), None)
+            if ori is None: raise InvalidCubeError(f"Corner {cols} has no U or D sticker")
+            key = cols[ori:] + cols[:ori]
+            if key not in homeCorners: raise InvalidCubeError(f"Corner {cols} does not exist")
+            c.cp[i], c.co[i] = homeCorners[key], ori
+
+        if n == 3:
+            homeEdges = {}
+            for j, slot in enumerate(edgeFacelets(n)):
+                a, b = (faceCol[f] for f, _, _ in slot)
+                homeEdges[(a, b)], homeEdges[(b, a)] = (j, 0), (j, 1)
+            for i, slot in enumerate(edgeFacelets(n)):
+                cols = read(slot)
+                if cols not in homeEdges: raise InvalidCubeError(f"Edge {cols} does not exist")
+                c.ep[i], c.eo[i] = homeEdges[cols]
+
+        if sorted(c.cp) != list(range(8)) or sorted(c.ep) != list(range(12)):
+            raise InvalidCubeError("Cube has duplicated pieces")
+        return c
+
+    def toCube(self, n: int = 3, cols: str = 'wgrboy') -> CubeN:
+        """
+        Returns a ``CubeN`` in this state.
+
+        :param n: The size of the cube, 2 or 3 (edges are ignored for a 2x2).
+        :param cols: The colour scheme of the cube, in the order UFRBLD.
+        """
+        if n not in (2, 3):
+            raise ValueError(f"Cubie states exist only for 2x2 and 3x3 cubes (got n={n})")
+        cube = CubeN(n, cols)
+        faceCol = dict(zip(_FACES_LIST, cols))
+        st = cube.state
+
+        slots = cornerFacelets(n)
+        for i, slot in enumerate(slots):
+            home = slots[self.cp[i]]
+            for k, (f, r, c) in enumerate(slot):
+                st[f][r][c] = faceCol[home[(k - self.co[i]) % 3][0]]
+
+        if n == 3:
+            slots = edgeFacelets(n)
+            for i, slot in enumerate(slots):
+                home = slots[self.ep[i]]
+                for k, (f, r, c) in enumerate(slot):
+                    st[f][r][c] = faceCol[home[(k + self.eo[i]) % 2][0]]
+        return cube
+
+########################################################################################################################
+
+def _frameFromCorners(corners: list[tuple]) -> dict[str, str]:
+    """Deduces the colour of every face of a 2x2 from its corners, taking the piece in the DBL slot as solved."""
+    colours = {c for crn in corners for c in crn}
+    if len(colours) != 6 or any(len(set(crn)) != 3 for crn in corners):
+        raise InvalidCubeError("Corners do not use six colours, three distinct colours each")
+
+    def opposite(c):
+        neighbours = {x for crn in corners if c in crn for x in crn}
+        rest = colours - neighbours
+        if len(rest) != 1: raise InvalidCubeError(f"Colour {c} has no unique opposite colour")
+        return rest.pop()
+
+    d, b, l = corners[6]
+    return {'D': d, 'B': b, 'L': l, 'U': opposite(d), 'F': opposite(b), 'R': opposite(l)}
+
+@cache
+def basicMoves(n: int = 3) -> tuple[CubieCube, ...]:
+    """
+    Returns the cubie states of the clockwise quarter turns of the faces, in the order of ``MOVE_FACES``.
+
+    .. Notes::
+    These are read off ``CubeN`` itself, so the cubie model always agrees with the sticker model. For a 2x2 only
+    the U, R and F turns are meaningful, as the model keeps the DBL corner fixed.
+    """
+    faces = MOVE_FACES if n == 3 else "URF"
+    return tuple(CubieCube.fromCube(CubeN(n) >> Move(1, f, 1)) for f in faces)
+
+@cache
+def allMoves(n: int = 3) -> tuple[CubieCube, ...]:
+    """Returns the cubie states of every face turn (quarter, half and inverse) in move index order."""
+    out = []
+    for b in basicMoves(n):
+        m = b
+        for _ in range(3):
+            out.append(m)
+            m = m * b
+    return tuple(out)
+
+def moveOf(index: int, faces: str = MOVE_FACES) -> Move:
+    """Returns the ``Move`` with the given move index."""
+    return Move(1, faces[index // 3], index % 3 + 1)
+
+########################################################################################################################
+
+# lookup from the 12-bit mask of slots holding slice edges to the slice coordinate, numbered so that 0 is solved
+SLICE_MASKS = np.array([sum(1 << i for i in c) for c in combinations(range(11, -1, -1), 4)], dtype=np.int16)
+SLICE_FROM_MASK = [-1] * (1 << 12)
+for _idx, _mask in enumerate(SLICE_MASKS.tolist()):
+    SLICE_FROM_MASK[_mask] = _idx
@@ -9,3 +9,7 @@ class InvalidMoveError(Exception):
 
 class InvalidAlgorithmError(Exception):
     pass
+
+
+class InvalidCubeError(Exception):
+    pass
@@ -0,0 +1,122 @@
+"""
+Flat sticker (facelet) indexing of ``CubeN`` states, and moves compiled to permutations of those indices.
+
+Sticker ``i`` of an NxN cube is ``state[face][row][col]`` with ``i = face*N*N + row*N + col`` and faces in the order
+UFRBLD. A permutation ``p`` acts on a flat state by ``new[i] = old[p[i]]``.
+"""
+
+from __future__ import annotations
+from functools import lru_cache
+from typing import Iterable
+
+from .algorithm import Algorithm
+from .cube import CubeN
+from .move import Move
+from ._enumHelpers import _FACES_LIST
+
+########################################################################################################################
+
+Perm = tuple[int, ...]
+
+def flatten(cube: CubeN) -> list[str]:
+    """Returns the stickers of a cube as a flat list."""
+    return [s for f in _FACES_LIST for row in cube.state[f] for s in row]
+
+def unflatten(cube: CubeN, stickers) -> None:
+    """Overwrites the state of a cube with a flat sequence of stickers."""
+    n = cube.size
+    nn = n * n
+    for k, f in enumerate(_FACES_LIST):
+        base = k * nn
+        cube.state[f] = [list(stickers[base + r*n: base + r*n + n]) for r in range(n)]
+
+def identity(n: int) -> Perm:
+    """Returns the identity permutation of an NxN cube's stickers."""
+    return tuple(range(6 * n * n))
+
+def compose(p: Perm, q: Perm) -> Perm:
+    """Returns the permutation applying ``p`` then ``q``."""
+    return tuple([p[i] for i in q])
+
+def invert(p: Perm) -> Perm:
+    """Returns the inverse of a permutation."""
+    inv = [0] * len(p)
+    for i, x in enumerate(p): inv[x] = i
+    return tuple(inv)
+
+def apply(p: Perm, stickers):
+    """Returns the flat state reached by applying ``p`` to ``stickers``."""
+    return [stickers[i] for i in p]
+
+########################################################################################################################
+
+@lru_cache(maxsize=None)
+def _movePerm(n: int, width: int, mov: str, mod: int) -> Perm:
+    # run the move on a cube labelled with its own sticker indices, so CubeN stays the single source of truth
+    cube = CubeN(n)
+    unflatten(cube, range(6 * n * n))
+    cube.algo(Move(width, mov, mod))
+    return tuple(flatten(cube))
+
+def movePerm(n: int, move: Move) -> Perm:
+    """
+    Returns the sticker permutation of a move on an NxN cube.
+
+    :param n: The size of the cube.
+    :param move: The move to compile.
+
+    .. Notes::
+    Results are cached, so each distinct move is only executed once per ``n``.
+    """
+    return _movePerm(n, move.width, str(move.mov), int(move.mod))
+
+def algorithmPerm(n: int, alg: Move | str | Algorithm) -> Perm:
+    """Returns the sticker permutation of a move or algorithm on an NxN cube."""
+    alg = Algorithm._coerceToAlgo(alg)
+    p = identity(n)
+    for m in alg: p = compose(p, movePerm(n, m))
+    return p
+
+########################################################################################################################
+
+def apply_many(cube: CubeN, algorithms: Iterable[Move | str | Algorithm]) -> list[CubeN]:
+    """
+    Returns the states a cube reaches under each of many algorithms, sharing the work of common prefixes.
+
+    :param cube: The starting cube (it is not modified).
+    :param algorithms: The algorithms to execute, each from the starting state.
+
+    :rtype: list[CubeN]
+    :returns: One new cube per algorithm, in the same order.
+
+    >>> states = apply_many(CubeN(), ["R U R' U' R' F", "R U R' U' F'", "R U R'"])    # "R U R'" is turned once
+
+    .. Notes::
+    The moves are put in a trie, which is walked depth first from the starting state. Each node's state is one
+    compiled move (see ``movePerm``) away from its parent's, and is kept on the stack only while its subtree is
+    walked, so the cost is one permutation per trie node rather than per move of every algorithm.
+    """
+    n = cube.size
+    # a node is [its children by move, the indices of the algorithms ending there]
+    root: list = [{}, []]
+    count = 0
+    for k, alg in enumerate(algorithms):
+        node = root
+        for m in Algorithm._coerceToAlgo(alg):
+            key = (m.width, str(m.mov), int(m.mod))
+            if (child := node[0].get(key)) is None: child = node[0][key] = [{}, []]
+            node = child
+        node[1].append(k)
+        count = k + 1
+
+    out: list[CubeN | None] = [None] * count
+    # entries hold the parent's state and the move to the node, so a state is only built when its node is visited
+    stack = [(root, cube.snapshot(), None)]
+    while stack:
+        (children, ends), state, key = stack.pop()
+        if key is not None: state = tuple([state[i] for i in _movePerm(n, *key)])
+        for k in ends:
+            out[k] = new = CubeN(n, cube.cols)
+            new.restore(state)
+        stack.extend((child, state, key) for key, child in children.items())
+    return out
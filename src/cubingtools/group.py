@@ -0,0 +1,309 @@
+"""
+Permutation groups generated by sets of moves, through Schreier-Sims stabilizer chains.
+
+>>> MoveGroup(3, "R U").order() -> 73483200
+>>> MoveGroup(3, "U D F B R L").order() -> 43252003274489856000
+>>> CubeN() >> "R U R' U'" in MoveGroup(3, "R U") -> True
+>>> MoveGroup(3, "R U").factorize("R U2 R' U R U2 R'") -> Algorithm(...)    # in R and U only
+
+.. Notes::
+Every generator is compiled to the permutation of stickers it applies (see ``facelets``). The stabilizer chain picks
+a sequence of base stickers, and for each one the positions the group can send it to while fixing the earlier ones,
+with an element doing so (a transversal). The group order is the product of the transversal sizes; an element is in
+the group when dividing it by transversal elements, one base sticker at a time (sifting), leaves the identity.
+For ``factorize``, a second table holds every transversal position as a short word in the generators, so sifting
+a state spells out an algorithm reaching it. Such algorithms are correct but long: hundreds of moves on a 3x3.
+"""
+
+from __future__ import annotations
+import random
+from typing import Iterable
+
+from .algorithm import Algorithm, reduced
+from .cube import CubeN
+from .move import Move
+from .facelets import Perm, algorithmPerm, flatten, invert
+from .pieces import _position
+from ._enumHelpers import _FACES_LIST
+
+########################################################################################################################
+# Elements act on sticker positions from the right: ``p[i]`` is where the sticker at ``i`` goes, and ``_mul(a, b)``
+# is ``a`` then ``b``, as for algorithms. This is the inverse of a ``facelets`` permutation.
+
+Word = tuple[tuple[int, int], ...]   # (generator index, power) pairs
+
+def _mul(a: Perm, b: Perm) -> Perm:
+    return tuple([b[x] for x in a])
+
+def _join(left: Word, right: Word, orders: list[int]) -> Word:
+    """Concatenates two words, merging (and cancelling) powers of the same generator where they meet."""
+    out = list(left)
+    for g, e in right:
+        if out and out[-1][0] == g:
+            e += out.pop()[1]
+        e %= orders[g]
+        if e > orders[g] // 2: e -= orders[g]
+        if e: out.append((g, e))
+    return tuple(out)
+
+def _inverseWord(w: Word) -> Word:
+    return tuple((g, -e) for g, e in reversed(w))
+
+########################################################################################################################
+
+def _stickerSources(cube: CubeN) -> Perm:
+    """
+    The ``facelets`` permutation taking a solved cube to a 2x2 or 3x3 cube's state, found by matching the colours of
+    every piece with the piece of the solved cube carrying the same colours.
+    """
+    n, nn = cube.size, cube.size * cube.size
+    if n > 3:
+        raise ValueError("Stickers can only be told apart on 2x2 and 3x3 cubes; pass an algorithm instead")
+    stickers = flatten(cube)
+    code = {s: k for k, s in enumerate(cube.cols)}
+    cubies: dict[tuple[int, int, int], list[int]] = {}
+    for i in range(6 * nn):
+        f, k = divmod(i, nn)
+        cubies.setdefault(_position(n, _FACES_LIST[f], *divmod(k, n)), []).append(i)
+
+    # solved pieces by their colours, mapping each colour to the sticker showing it
+    home = {frozenset(i // nn for i in group): {i // nn: i for i in group} for group in cubies.values()}
+    source = [0] * (6 * nn)
+    try:
+        for group in cubies.values():
+            cols = [code[stickers[i]] for i in group]
+            piece = home[frozenset(cols)]
+            for i, c in zip(group, cols): source[i] = piece[c]
+    except KeyError:
+        raise ValueError("The cube's stickers do not form a reachable arrangement of its pieces") from None
+    if len(set(source)) != len(source):
+        raise ValueError("The cube's stickers do not form a reachable arrangement of its pieces")
+    return tuple(source)
+
+########################################################################################################################
+
+class MoveGroup:
+    def __init__(self, n: int, generators: str | Iterable[Move | str | Algorithm]):
+        """
+        The group of states of an NxN cube reachable with a set of moves (or algorithms).
+
+        :param n: The size of the cube.
+        :param generators: The generators: either a string of moves, each a generator (``"R U"``), or an iterable of
+            moves and algorithms (``["R U R' U'", "F"]``).
+
+        >>> ru = MoveGroup(3, "R U")
+
+        .. Notes::
+        The stabilizer chain is built here, with the incremental Schreier-Sims algorithm: every Schreier generator is
+        sifted once, and any that does not sift to the identity becomes a new strong generator. Building the chain of
+        the whole 3x3 group takes about a tenth of a second; ``order`` and ``contains`` are then a product and a
+        sift. The words ``factorize`` needs are only looked for on its first call (a few seconds for the whole 3x3
+        group).
+        """
+        if isinstance(generators, str):
+            generators = list(Algorithm(generators))
+        self.size = n
+        self.generators = tuple(Algorithm._coerceToAlgo(g) for g in generators)
+        if any(g.degree > n for g in self.generators):
+            raise ValueError("n must be at least the degree of every generator")
+        self._identity = tuple(range(6 * n * n))
+        self._perms = [invert(algorithmPerm(n, g)) for g in self.generators]
+
+        self._base: list[int] = []
+        # per level: the strong generators fixing the base before it, the transversal (point -> (element, its
+        # inverse)), and the Schreier generators already sifted
+        self._strong: list[list[Perm]] = []
+        self._transversals: list[dict[int, tuple[Perm, Perm]]] = []
+        self._checked: list[set[tuple[int, int]]] = []
+        self._words: list[dict[int, tuple[Perm, Perm, Word, Word]]] | None = None
+        self._build()
+
+    ####################################################################################################################
+
+    def _extendBase(self, perm: Perm) -> None:
+        """Appends a level to the chain, whose base point is moved by ``perm``."""
+        b = next(i for i, x in enumerate(perm) if x != i)
+        self._base.append(b)
+        self._strong.append([])
+        self._transversals.append({b: (self._identity, self._identity)})
+        self._checked.append(set())
+
+    def _extendOrbit(self, level: int) -> None:
+        """Adds the points newly reachable by the level's strong generators to its transversal (keeping the others)."""
+        transversal, gens = self._transversals[level], self._strong[level]
+        frontier = list(transversal)
+        # breadth first, so transversal elements are short products of the strong generators
+        while frontier:
+            nxt = []
+            for p in frontier:
+                u, uInv = transversal[p]
+                for s in gens:
+                    if (q := s[p]) not in transversal:
+                        transversal[q] = (_mul(u, s), _mul(invert(s), uInv))
+                        nxt.append(q)
+            frontier = nxt
+
+    def _sift(self, g: Perm, start: int = 0) -> tuple[Perm, int]:
+        """Divides ``g`` by transversal elements from level ``start`` on, returning the residue and where it stopped."""
+        for level in range(start, len(self._base)):
+            u = self._transversals[level].get(g[self._base[level]])
+            if u is None: return g, level
+            g = _mul(g, u[1])
+        return g, len(self._base)
+
+    def _build(self) -> None:
+        gens = [p for p in self._perms if p != self._identity]
+        for s in gens:
+            if all(s[b] == b for b in self._base): self._extendBase(s)
+        for level in range(len(self._base)):
+            self._strong[level] = [s for s in gens if all(s[b] == b for b in self._base[:level])]
+            self._extendOrbit(level)
+
+        level = len(self._base) - 1
+        while level >= 0:
+            found = self._schreierResidue(level)
+            if found is None:
+                level -= 1
+                continue
+            r, stop = found
+            if stop == len(self._base): self._extendBase(r)
+            for k in range(level + 1, stop + 1):
+                self._strong[k].append(r)
+                self._extendOrbit(k)
+            level = stop
+
+    def _schreierResidue(self, level: int) -> tuple[Perm, int] | None:
+        """
+        Sifts the unchecked Schreier generators of a level through the levels below it, returning the first residue
+        that is not the identity (and the level it stopped at), or ``None`` once the levels below are complete.
+
+        .. Notes::
+        Transversals only ever gain points, so a Schreier generator that sifted to the identity always will.
+        """
+        transversal, checked = self._transversals[level], self._checked[level]
+        for p, (u, _) in list(transversal.items()):
+            for j, s in enumerate(self._strong[level]):
+                if (p, j) in checked: continue
+                checked.add((p, j))
+                h = _mul(_mul(u, s), transversal[s[p]][1])
+                if h == self._identity: continue
+                r, stop = self._sift(h, level + 1)
+                if r != self._identity: return r, stop
+        return None
+
+    ####################################################################################################################
+
+    def order(self) -> int:
+        """Returns the number of states in the group."""
+        out = 1
+        for t in self._transversals: out *= len(t)
+        return out
+
+    def _element(self, state: CubeN | Move | str | Algorithm) -> Perm:
+        if isinstance(state, CubeN):
+            if state.size != self.size: raise ValueError(f"Expected a {self.size}x{self.size} cube")
+            return invert(_stickerSources(state))
+        return invert(algorithmPerm(self.size, state))
+
+    def contains(self, state: CubeN | Move | str | Algorithm) -> bool:
+        """
+        Returns whether a state is in the group.
+
+        :param state: A cube (2x2 or 3x3 only, as other cubes have identical stickers), or an algorithm whose
+            effect on a solved cube is the state.
+
+        :rtype: bool
+        """
+        g, _ = self._sift(self._element(state))
+        return g == self._identity
+
+    def __contains__(self, state: CubeN | Move | str | Algorithm) -> bool:
+        return self.contains(state)
+
+    ####################################################################################################################
+
+    def _wordTable(self) -> list[dict[int, tuple[Perm, Perm, Word, Word]]]:
+        """
+        For every level and point of the chain, an element of the level's stabilizer sending its base point there
+        (with its inverse), as a short word in the generators (with its inverse).
+
+        .. Notes::
+        This follows Minkwitz's method: random words in the generators are sifted through the table, each residue
+        filling the entry it lands on (or replacing a longer word there), until every entry is filled; products of
+        entries are then sifted once more to shorten them. While sifting, a word is kept as the list of words it is
+        the product of, and only joined when it is stored.
+        """
+        if self._words is not None: return self._words
+        orders = []
+        for p in self._perms:
+            k, q = 1, p
+            while q != self._identity: q, k = _mul(q, p), k + 1
+            orders.append(k)
+
+        table = [{b: (self._identity, self._identity, (), ())} for b in self._base]
+        missing = sum(map(len, self._transversals)) - len(self._base)
+
+        def sift(g: Perm, gInv: Perm, parts: list[Word], length: int) -> None:
+            nonlocal missing
+            for level, b in enumerate(self._base):
+                if g == self._identity: return
+                entry = table[level].get(g[b])
+                if entry is None or length < len(entry[2]):
+                    w: Word = ()
+                    for part in parts: w = _join(w, part, orders)
+                    if entry is None or len(w) < len(entry[2]):
+                        missing -= entry is None
+                        table[level][g[b]] = new = (g, gInv, w, _inverseWord(w))
+                        if entry is None: return
+                        # carry on with the longer element it replaced
+                        (g, gInv, *_), parts, length, entry = entry, [entry[2]], len(entry[2]), new
+                g, gInv = _mul(g, entry[1]), _mul(entry[0], gInv)
+                parts, length = parts + [entry[3]], length + len(entry[3])
+
+        letters = [(p, invert(p), ((k, 1),)) for k, p in enumerate(self._perms) if p != self._identity]
+        letters += [(q, p, ((k, -1),)) for p, q, ((k, _),) in letters if orders[k] > 2]
+        rng = random.Random(0)
+        while missing:
+            g, gInv, w = self._identity, self._identity, ()
+            for _ in range(rng.randint(1, 2 * len(self._base))):
+                p, pInv, letter = rng.choice(letters)
+                g, gInv, w = _mul(g, p), _mul(pInv, gInv), _join(w, letter, orders)
+            sift(g, gInv, [w], len(w))
+        for level in table:
+            entries = list(level.values())
+            for x in entries:
+                for y in entries:
+                    sift(_mul(x[0], y[0]), _mul(y[1], x[1]), [x[2], y[2]], len(x[2]) + len(y[2]))
+        self._words = table
+        return table
+
+    def factorize(self, state: CubeN | Move | str | Algorithm) -> Algorithm:
+        """
+        Returns an algorithm made of the group's generators, bringing a solved cube to a state.
+
+        :param state: A cube (2x2 or 3x3 only) or an algorithm, as for ``contains``.
+
+        :rtype: Algorithm
+        :raises ValueError: If the state is not in the group.
+
+        >>> MoveGroup(3, "R U").factorize(CubeN() >> "R U R' U'") -> Algorithm(...)
+
+        .. Notes::
+        The algorithm is a product of one word per level of the chain, so it is correct but far from optimal.
+        """
+        g = self._element(state)
+        if self._sift(g)[0] != self._identity:
+            raise ValueError("The state is not in the group")
+        table = self._wordTable()
+        words = []
+        for level, b in enumerate(self._base):
+            _, uInv, w, _ = table[level][g[b]]
+            g = _mul(g, uInv)
+            words.append(w)
+        # g = u_k ... u_1 u_0, so the words are read last level first
+        moves = []
+        for w in reversed(words):
+            for k, power in w:
+                gen = self.generators[k] if power > 0 else self.generators[k].inverse()
+                for _ in range(abs(power)): moves.extend(gen)
+        return reduced(Algorithm(moves))
@@ -2,7 +2,7 @@
 
 from enum import StrEnum
 from ._enumHelpers import _BaseMove, _ROTS, _FACES, _WIDES, _SLICES
-from .algorithm import *
+from .algorithm import Algorithm, _memoizedOnFrozen
 
 class Metric(StrEnum):
     """
@@ -34,9 +34,13 @@ def size(alg: Algorithm, metric: Metric | str = Metric.OBTM) -> int:
 
     .. Notes::
     The size of the simplified algorithm will be computed. Also, note that for
-    all algorithms ``A`` we have ``len(A)==size(A,"ETM")``. HTM is most meaningful on 3x3x3 cubes.
+    all algorithms ``A`` we have ``len(A)==size(A,"ETM")``. HTM is most meaningful on 3x3x3 cubes. The sizes of a
+    ``FrozenAlgorithm`` are only computed once per metric.
     """
-    metric = Metric(metric)
+    return _size(alg, Metric(metric))
+
+@_memoizedOnFrozen
+def _size(alg: Algorithm, metric: Metric) -> int:
     total = 0
 
     for move in alg:
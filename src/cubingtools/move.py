@@ -3,6 +3,7 @@ Classes and methods working with the internal representation of cube moves.
 """
 
 from .error import InvalidMoveError
+from . import profiling as _profiling
 from ._enumHelpers import _Mod, _BaseMove, _FACES
 import re
 
@@ -131,6 +132,8 @@ class Move:
         :rtype: Move
         :returns: A `Move` object corresponding to the token.
         """
+        if _profiling.ACTIVE is not None: _profiling.ACTIVE.parses['Move'] += 1
+
         def throw(): raise InvalidMoveError(f"Invalid move: {tok}")
 
         def parseWidth(dig):
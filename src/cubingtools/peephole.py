@@ -0,0 +1,137 @@
+"""
+A peephole optimizer for 3x3 algorithms, rewriting short windows of moves into the cheapest equivalent sequence.
+
+>>> optimized("R M'", Metric.STM) -> Algorithm("r")
+>>> optimized("R L' x'", Metric.STM) -> Algorithm("M")
+>>> optimized("F y R y' U", Metric.HTM) -> Algorithm("F B U")
+
+.. Notes::
+``simplified`` and ``reduced`` only merge moves of one base, so they miss identities across move kinds such as
+``r = R M'`` or ``M = R L' x'``. Here every sequence of up to ``depth`` moves (faces, wide moves, slices and rotations
+of a 3x3) is enumerated once, and for each sticker permutation they reach, the cheapest sequence under every
+``Metric`` is kept (the shortest among equally cheap ones). The tables are saved to the lookup table cache (see
+``_tables``), so they are only built once per machine. An algorithm is then cut into windows of at most ``depth``
+moves, choosing the cuts by dynamic programming so that the cheapest sequences of the windows cost the least
+altogether, and this is repeated until nothing improves. The result has exactly the same effect on the cube,
+including its orientation.
+"""
+
+from __future__ import annotations
+from functools import lru_cache
+
+import numpy as np
+
+from ._tables import loadOrBuild
+from .algorithm import Algorithm, _memoizedOnFrozen
+from .facelets import Perm, compose, identity, movePerm
+from .metric import Metric, size
+from .move import Move
+
+########################################################################################################################
+
+DEFAULT_DEPTH = 3
+_METRICS = tuple(Metric)
+
+# the moves the tables are built from: every distinct move of a 3x3 (wide moves as lowercase), each with every power
+_MOVES = tuple(Move(1, b, mod) for b in "UDFBRLudfbrlMESxyz" for mod in (1, 2, 3))
+
+def _buildTables(depth: int) -> dict[str, np.ndarray]:
+    moves = np.array([movePerm(3, m) for m in _MOVES], dtype=np.uint8)
+    cost = np.array([[size(Algorithm([m]), metric) for metric in _METRICS] for m in _MOVES], dtype=np.int8)
+
+    # a row per permutation: the permutation, and per metric the cost, length and moves of its cheapest sequence
+    perms = np.array([identity(3)], dtype=np.uint8)
+    costs = np.zeros((1, len(_METRICS)), dtype=np.int8)
+    lengths = np.zeros((1, len(_METRICS)), dtype=np.int8)
+    seqs = np.full((1, len(_METRICS), depth), -1, dtype=np.int8)
+    changed = np.array([0])
+    for _ in range(depth):
+        # only sequences whose cheapest form changed last round can give new cheapest sequences one move longer
+        parent = np.repeat(changed, len(_MOVES))
+        mv = np.tile(np.arange(len(_MOVES)), len(changed))
+        candPerms = perms[parent[:, None], moves[mv]]
+        candCosts = costs[parent] + cost[mv]
+        candLengths = lengths[parent] + 1
+        candSeqs = seqs[parent]
+        for t in range(len(_METRICS)):
+            candSeqs[np.arange(len(parent)), t, lengths[parent, t]] = mv
+
+        allPerms = np.concatenate([perms, candPerms])
+        allCosts, allLengths = np.concatenate([costs, candCosts]), np.concatenate([lengths, candLengths])
+        allSeqs = np.concatenate([seqs, candSeqs])
+        perms, group = np.unique(allPerms, axis=0, return_inverse=True)
+        group = group.ravel()
+
+        costs = np.empty((len(perms), len(_METRICS)), dtype=np.int8)
+        lengths, seqs = np.empty_like(costs), np.empty((len(perms), len(_METRICS), depth), dtype=np.int8)
+        fresh = np.zeros(len(perms), dtype=bool)
+        for t in range(len(_METRICS)):
+            # cheapest, then shortest, then (the sort being stable) the earliest row: an old one over a candidate
+            order = np.lexsort((allLengths[:, t], allCosts[:, t], group))
+            first = order[np.r_[True, group[order][1:] != group[order][:-1]]]
+            costs[:, t], lengths[:, t], seqs[:, t] = allCosts[first, t], allLengths[first, t], allSeqs[first, t]
+            fresh |= first >= len(allPerms) - len(candPerms)
+        changed = np.flatnonzero(fresh)
+    return {"perms": perms, "costs": costs, "lengths": lengths, "seqs": seqs}
+
+@lru_cache(maxsize=None)
+def _tables(depth: int) -> tuple[dict[bytes, int], np.ndarray, np.ndarray, np.ndarray]:
+    """The tables for sequences of up to ``depth`` moves, with a map from each permutation's bytes to its row."""
+    tables = loadOrBuild(f"peephole-3x3-d{depth}-v1", lambda: _buildTables(depth))
+    index = {row.tobytes(): k for k, row in enumerate(tables["perms"])}
+    return index, tables["costs"], tables["lengths"], tables["seqs"]
+
+########################################################################################################################
+
+@_memoizedOnFrozen
+def optimized(alg: Move | str | Algorithm, metric: Metric | str = Metric.OBTM, depth: int = DEFAULT_DEPTH) -> Algorithm:
+    """
+    Returns an algorithm with the same effect on a 3x3 cube, rewritten to be as short as possible under a metric.
+
+    :param alg: The algorithm to optimize (of degree at most 3).
+    :param metric: The metric whose ``size`` is minimized. Defaults to ``Metric.OBTM``.
+    :param depth: The most moves rewritten at once. The table for a depth is built on first use: about a second
+        for the default 3, but minutes for 4.
+
+    :rtype: Algorithm
+    :returns: An algorithm with exactly the same sticker permutation as ``alg`` (on a 3x3), whose size under
+        ``metric`` is at most that of ``alg``, and whose length is at most that of ``alg`` if the sizes are equal.
+
+    :raises ValueError: If the algorithm does not fit a 3x3 cube, or ``depth`` is less than 1.
+
+    >>> optimized("x R x' U2 U", Metric.HTM) -> Algorithm("R U'")
+
+    .. Notes::
+    Identities of a 3x3 need not hold on larger cubes (``r`` turns two layers of a 3x3 but four of a 5x5), so
+    optimized algorithms are only meant for 3x3 cubes.
+    """
+    alg = Algorithm._coerceToAlgo(alg)
+    if alg.degree > 3:
+        raise ValueError("Peephole optimization uses 3x3 identities, so the algorithm must fit a 3x3 cube")
+    if depth < 1:
+        raise ValueError(f"depth must be at least 1 (your depth={depth})")
+    t = _METRICS.index(Metric(metric))
+    index, costs, lengths, seqs = _tables(depth)
+    # a window's cost is its cheapest sequence's cost, ties going to shorter sequences
+    weight = costs[:, t].astype(np.int64) * (1 << 32) + lengths[:, t]
+
+    moves = list(alg)
+    current = sum(int(weight[index[bytes(movePerm(3, m))]]) for m in moves)
+    while True:
+        perms = [movePerm(3, m) for m in moves]
+        best, cut = [0] + [None] * len(moves), [None] * (len(moves) + 1)
+        for j in range(1, len(moves) + 1):
+            p: Perm = identity(3)
+            for i in range(j - 1, max(j - depth, 0) - 1, -1):
+                p = compose(perms[i], p)
+                row = index[bytes(p)]
+                if best[j] is None or best[i] + weight[row] < best[j]:
+                    best[j], cut[j] = best[i] + int(weight[row]), (i, row)
+        if best[-1] >= current: break
+        out, j = [], len(moves)
+        while j:
+            i, row = cut[j]
+            out[:0] = [_MOVES[k] for k in seqs[row, t, :lengths[row, t]]]
+            j = i
+        moves, current = out, best[-1]
+    return Algorithm(moves)
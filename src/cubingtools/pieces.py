@@ -0,0 +1,135 @@
+"""
+Which stickers make up which piece of an NxN cube, as arrays of flat sticker indices (see ``facelets``).
+"""
+
+from __future__ import annotations
+from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
+
+from .cube import CubeN
+from .cubie import cornerFacelets, edgeFacelets
+from .facelets import flatten
+from ._enumHelpers import _FACES_LIST
+
+########################################################################################################################
+
+_FACE_INDEX = {str(f): k for k, f in enumerate(_FACES_LIST)}
+
+def _position(n: int, face: str, r: int, c: int) -> tuple[int, int, int]:
+    """The ``(x, y, z)`` cubie a sticker is on: x runs from L to R, y from D to U and z from B to F."""
+    m = n - 1
+    match face:
+        case 'U': return c, m, r
+        case 'D': return c, 0, m - r
+        case 'F': return c, m - r, m
+        case 'B': return m - c, m - r, 0
+        case 'R': return m, m - r, m - c
+        case 'L': return 0, m - r, c
+
+def _rotateOnFace(n: int, r: int, c: int) -> tuple[int, int]:
+    return c, n - 1 - r
+
+class PieceIndex:
+    def __init__(self, n: int):
+        """
+        The sticker index model of an NxN cube. Use ``pieceIndex(n)``, which caches one per ``n``.
+
+        :param n: The size of the cube.
+
+        Attributes (all arrays of flat sticker indices):
+
+        - ``corners``: ``(8, 3)``, corner slots ``URF UFL ULB UBR DFR DLF DBL DRB``, U/D sticker first then clockwise.
+        - ``midges``: ``(12, 2)``, middle edge slots ``UR UF UL UB DR DF DL DB FR FL BL BR`` (empty for even ``n``).
+        - ``wings``: one ``(24, 2)`` array per wing orbit, outermost first. Rows ``2e`` and ``2e+1`` are the two
+          wings of edge slot ``e``, stickers in the same face order as ``midges``.
+        - ``centers``: one ``(6, k)`` array per centre orbit (``k`` is 4, or 1 for the middle centre of an odd cube),
+          row ``f`` holding the orbit's stickers on face ``f`` in UFRBLD order.
+        - ``cubie``: ``(6*n*n, 3)``, the ``(x, y, z)`` cubie each sticker is on.
+        """
+        self.n = n
+        nn = n * n
+        flat = lambda face, r, c: _FACE_INDEX[face] * nn + r * n + c
+
+        self.cubie = np.array([_position(n, str(f), r, c) for f in _FACES_LIST for r in range(n) for c in range(n)])
+        self.corners = np.array([[flat(*s) for s in slot] for slot in cornerFacelets(n)])
+
+        # stickers sharing a cubie form a piece
+        byCubie = defaultdict(list)
+        for i, pos in enumerate(map(tuple, self.cubie)): byCubie[pos].append(i)
+
+        # edges: walk along each edge slot, pairing stickers through their cubie
+        midges, wings = [], defaultdict(lambda: [None] * 24)
+        for e, ((fa, _, _), (fb, _, _)) in enumerate(edgeFacelets(3)):
+            stickersA = [i for i in range(_FACE_INDEX[fa] * nn, (_FACE_INDEX[fa] + 1) * nn)
+                         if len(byCubie[tuple(self.cubie[i])]) == 2
+                         and any(j // nn == _FACE_INDEX[fb] for j in byCubie[tuple(self.cubie[i])])]
+            stickersA.sort(key=lambda i: tuple(self.cubie[i]))
+            for t, a in enumerate(stickersA, start=1):
+                b = next(j for j in byCubie[tuple(self.cubie[a])] if j != a)
+                if 2 * t == n - 1:
+                    midges.append([a, b])
+                else:
+                    orbit, second = min(t, n - 1 - t), t > n - 1 - t
+                    wings[orbit][2 * e + second] = [a, b]
+        self.midges = np.array(midges, dtype=np.int64).reshape(-1, 2)
+        self.wings = tuple(np.array(wings[o]) for o in sorted(wings))
+
+        # centres: group each face's inner stickers by their orbit under rotating the face
+        orbits = {}
+        for r in range(1, n - 1):
+            for c in range(1, n - 1):
+                ring, pos = [], (r, c)
+                for _ in range(4):
+                    if pos not in ring: ring.append(pos)
+                    pos = _rotateOnFace(n, *pos)
+                orbits.setdefault(min(ring), ring)
+        self.centers = tuple(
+            np.array([[flat(str(f), r, c) for r, c in orbits[key]] for f in _FACES_LIST]) for key in sorted(orbits)
+        )
+
+    def layer(self, face: str, depth: int = 1) -> np.ndarray:
+        """
+        Returns the stickers of every piece in the ``depth`` outermost layers on the side of ``face``.
+
+        >>> pieceIndex(3).layer('U')            # the U layer (last layer) stickers
+        >>> pieceIndex(3).layer('D', depth=2)   # everything but the U layer, i.e. the first two layers
+        """
+        x, y, z = self.cubie.T
+        m = self.n - 1
+        match face:
+            case 'U': mask = y > m - depth
+            case 'D': mask = y < depth
+            case 'R': mask = x > m - depth
+            case 'L': mask = x < depth
+            case 'F': mask = z > m - depth
+            case 'B': mask = z < depth
+            case _: raise ValueError(f"Invalid face: {face}")
+        return np.nonzero(mask)[0]
+
+@lru_cache(maxsize=None)
+def pieceIndex(n: int) -> PieceIndex:
+    """Returns the (cached) piece index of an NxN cube."""
+    if n <= 1: raise ValueError("Cube size must be at least 2")
+    return PieceIndex(n)
+
+########################################################################################################################
+
+def homeColours(cube: CubeN) -> np.ndarray:
+    """Returns the colour each sticker of a cube shows when solved, as a flat array."""
+    return np.repeat(np.array(list(cube.cols)), cube.size * cube.size)
+
+def solvedAt(cube: CubeN, stickers: np.ndarray) -> bool:
+    """
+    Checks whether the given stickers of a cube all show their solved colours.
+
+    :param cube: The cube to check.
+    :param stickers: Flat sticker indices, e.g. ``pieceIndex(n).corners`` or ``pieceIndex(n).layer('D', 2)``.
+    """
+    state = np.array(flatten(cube))
+    return bool((state[stickers] == homeColours(cube)[stickers]).all())
+
+def isF2LSolved(cube: CubeN) -> bool:
+    """Checks whether every layer of the cube but the U layer is solved (in its home orientation)."""
+    return solvedAt(cube, pieceIndex(cube.size).layer('D', cube.size - 1))
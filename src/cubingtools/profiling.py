@@ -0,0 +1,124 @@
+"""
+Opt-in instrumentation of cube work: move counts and times, parse calls, cache use and stickers touched.
+
+>>> with cubingtools.profile() as prof:
+...     CubeN(5).scramble()
+>>> prof.report()["moves"]["U"] -> {"count": 8123, "time": 0.021}
+>>> open("scramble.folded", "w").write(prof.folded())    # for flamegraph.pl / speedscope
+
+.. Notes::
+Hot paths only check the module global ``ACTIVE``, so there is next to no cost while no profile is running.
+Profiles are per process and not thread-safe: profile one thread at a time.
+"""
+
+from __future__ import annotations
+import sys
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Iterator
+
+########################################################################################################################
+
+# the running profile, or None; read directly by the instrumented code
+ACTIVE: 'Profile | None' = None
+
+# the functools caches reported on, as (module, attribute) of the cached function
+_CACHES = {
+    "movePerm": ("cubingtools.facelets", "_movePerm"),
+    "scrambleAutomaton": ("cubingtools.cube", "_scrambleAutomaton"),
+    "scrambleMoveList": ("cubingtools.cube", "_generateScrambleMoveList"),
+    "pieceIndex": ("cubingtools.pieces", "pieceIndex"),
+}
+
+def _cacheInfo() -> dict[str, tuple[int, int]]:
+    """Returns the hits and misses of every reported cache whose module is loaded (without importing any)."""
+    out = {}
+    for name, (module, attr) in _CACHES.items():
+        if (mod := sys.modules.get(module)) is not None and hasattr(f := getattr(mod, attr, None), 'cache_info'):
+            info = f.cache_info()
+            out[name] = (info.hits, info.misses)
+    return out
+
+class Profile:
+    def __init__(self):
+        """The counters of one ``profile()`` block. Read them with ``report()`` and ``folded()``."""
+        self.moveCounts = Counter()
+        self.moveTimes = defaultdict(float)
+        self.parses = Counter()
+        self.stickers = 0
+        self.samples = defaultdict(float)   # folded move stack -> time spent in it, excluding nested moves
+        self.caches = {}
+        self.wall = 0.0
+        self._stack = []
+        self._bases = []
+        self._childTime = [0.0]
+        self._cachesBefore = {}
+        self._start = 0.0
+
+    def turn(self, cube, move) -> None:
+        """Runs one move on ``cube``, timing it (called by ``CubeN._turn``)."""
+        name = str(move.mov)
+        # moves nested in a move of the same kind would otherwise have their time counted twice
+        outermost = name not in self._bases
+        self._bases.append(name)
+        self._stack.append(str(move))
+        self._childTime.append(0.0)
+        start = time.perf_counter()
+        try:
+            cube._execute(move)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._childTime.pop()
+            self.samples[';'.join(self._stack)] += elapsed - children
+            self._stack.pop()
+            self._bases.pop()
+            self._childTime[-1] += elapsed
+            self.moveCounts[name] += 1
+            if outermost: self.moveTimes[name] += elapsed
+
+    def touch(self, count: int) -> None:
+        """Records ``count`` stickers being moved."""
+        self.stickers += count
+
+    def report(self) -> dict:
+        """
+        Returns the counters as a dict: per base move its ``count`` and inclusive ``time`` (in seconds), ``parses``
+        per parser, ``caches`` hits and misses during the block, ``stickers`` moved, and the ``wall`` time.
+        """
+        return {
+            "moves": {m: {"count": c, "time": self.moveTimes[m]} for m, c in self.moveCounts.most_common()},
+            "parses": dict(self.parses),
+            "caches": dict(self.caches),
+            "stickers": self.stickers,
+            "wall": self.wall,
+        }
+
+    def folded(self) -> str:
+        """
+        Returns the time spent in each stack of nested moves, in the folded format of flame graph tools: one
+        ``outer;inner;innermost microseconds`` line per stack.
+        """
+        return '\n'.join(f"{stack} {round(t * 1e6)}" for stack, t in sorted(self.samples.items()))
+
+@contextmanager
+def profile() -> Iterator[Profile]:
+    """
+    Profiles the cube work done inside a ``with`` block.
+
+    :rtype: Iterator[Profile]
+    :returns: The ``Profile`` collecting the counters (readable once the block ends).
+    """
+    global ACTIVE
+    prof, previous = Profile(), ACTIVE
+    prof._cachesBefore = _cacheInfo()
+    prof._start = time.perf_counter()
+    ACTIVE = prof
+    try:
+        yield prof
+    finally:
+        ACTIVE = previous
+        prof.wall = time.perf_counter() - prof._start
+        for name, (hits, misses) in _cacheInfo().items():
+            h0, m0 = prof._cachesBefore.get(name, (0, 0))
+            prof.caches[name] = {"hits": hits - h0, "misses": misses - m0}
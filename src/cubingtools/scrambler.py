@@ -0,0 +1,72 @@
+"""
+Random-state scrambles: a uniformly random cube state is sampled at the cubie level, solved with a table-based
+solver, and the inverse of the solution is the scramble.
+"""
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from .algorithm import Algorithm
+from .cubie import CubieCube, moveOf
+from .solver import getSolver
+
+########################################################################################################################
+
+# below this many scrambles, starting worker processes costs more than it saves
+_MIN_PARALLEL = 32
+
+def _scrambleChunk(n: int, seeds: list[int]) -> list[str]:
+    """Generates one scramble per seed (run inside worker processes, so it returns plain strings)."""
+    solver = getSolver(n)
+    faces = "URFDLB" if n == 3 else "URF"
+    out = []
+    for seed in seeds:
+        state = CubieCube.random(random.Random(seed), edges=(n == 3))
+        solution = solver.solveCubie(state)
+        out.append(' '.join(str(-moveOf(m, faces)) for m in reversed(solution)))
+    return out
+
+def _warmWorker(n: int) -> None:
+    getSolver(n)
+
+def scramble_random_state(n: int = 3, count: int = 1, seed: int | None = None,
+                          jobs: int | None = None) -> list[Algorithm]:
+    """
+    Returns random-state scrambles for 2x2 or 3x3 cubes.
+
+    :param n: The cube size, 2 or 3.
+    :param count: The number of scrambles to generate.
+    :param seed: Seed making the scrambles reproducible (the same seed gives the same scrambles for any ``jobs``).
+    :param jobs: The number of worker processes, defaults to the number of CPUs.
+
+    :rtype: list[Algorithm]
+    :returns: ``count`` scrambles, each bringing a solved cube to a uniformly random state.
+
+    >>> scramble_random_state(3, count=1000, seed=42) -> [Algorithm(...), ...]
+
+    .. Notes::
+    Each worker loads the solver tables once and reuses them for all of its scrambles. 2x2 scrambles only use
+    the moves U, R and F, and are optimal.
+    """
+    if n not in (2, 3):
+        raise ValueError(f"Random-state scrambles exist only for 2x2 and 3x3 cubes (got n={n})")
+    if count < 0:
+        raise ValueError("count must be non-negative")
+
+    master = random.Random(seed)
+    seeds = [master.getrandbits(64) for _ in range(count)]
+    jobs = jobs or os.cpu_count() or 1
+
+    if jobs == 1 or count < _MIN_PARALLEL:
+        scrambles = _scrambleChunk(n, seeds)
+    else:
+        # build (and cache) the tables once here, so the workers only have to load them
+        getSolver(n)
+        size = -(-count // (4 * jobs))
+        chunks = [seeds[i:i+size] for i in range(0, count, size)]
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_warmWorker, initargs=(n,)) as pool:
+            scrambles = [s for chunk in pool.map(_scrambleChunk, repeat(n), chunks) for s in chunk]
+
+    return [Algorithm(s) for s in scrambles]
@@ -0,0 +1,171 @@
+"""
+Enumeration of the short algorithms solving a cube state with a restricted move set, by meet-in-the-middle search.
+"""
+
+from __future__ import annotations
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+from typing import Iterable, Iterator
+
+from .algorithm import Algorithm
+from .canonical import MoveAutomaton, parseMoveset
+from .cube import CubeN
+from .move import Move
+from .metric import Metric, size
+from .facelets import flatten, movePerm, invert, algorithmPerm
+
+########################################################################################################################
+
+class _Search:
+    def __init__(self, cube: CubeN, moves: list[Move], backDepth: int):
+        """The state shared by every (possibly parallel) part of one meet-in-the-middle search."""
+        n = cube.size
+        perms = [movePerm(n, m) for m in moves]
+        rots = [algorithmPerm(n, r) for r in ('x', 'y')]
+
+        # the solved cube in each of its 24 orientations
+        solved = tuple(flatten(CubeN(n, cube.cols)))
+        targets, todo = {solved}, [solved]
+        while todo:
+            s = todo.pop()
+            for r in rots:
+                if (t := tuple(s[i] for i in r)) not in targets:
+                    targets.add(t)
+                    todo.append(t)
+
+        # compact states: only the stickers some move can displace, as colour indices (keyed as bytes in tables)
+        support = sorted({i for p in perms for i, j in enumerate(p) if i != j})
+        where = {i: k for k, i in enumerate(support)}
+        colour = {c: k for k, c in enumerate(cube.cols)}
+        compact = lambda state: tuple(colour[state[i]] for i in support)
+        start = flatten(cube)
+        self.start = compact(start)
+
+        # orientations differing from the start on stickers no move displaces can never be reached
+        fixed = set(range(len(start))) - set(support)
+        targets = [t for t in targets if all(t[i] == start[i] for i in fixed)]
+        self.steps = [itemgetter(*[where[p[i]] for i in support]) for p in perms]
+        self.unsteps = [itemgetter(*[where[p[i]] for i in support]) for p in map(invert, perms)]
+        fsm = MoveAutomaton(moves)
+        self.allowed = [[fsm.step(fsm.stateAfter(i), j) >= 0 for j in range(len(moves))] for i in range(len(moves))]
+
+        # back[d] maps each state (as bytes) to the length-d sequences (as bytes of move indices) solving it
+        frontier = {compact(t) for t in targets}
+        self.back = [{bytes(t): [b''] for t in frontier}]
+        states = {bytes(t): t for t in frontier}
+        for _ in range(backDepth):
+            layer, nextStates = defaultdict(list), {}
+            for key, seqs in self.back[-1].items():
+                state = states[key]
+                for i, unstep in enumerate(self.unsteps):
+                    allowed = self.allowed[i]
+                    ext = [bytes((i,)) + q for q in seqs if not q or allowed[q[0]]]
+                    if not ext: continue
+                    prev = unstep(state)
+                    prevKey = bytes(prev)
+                    layer[prevKey].extend(ext)
+                    nextStates[prevKey] = prev
+            self.back.append(dict(layer))
+            states = nextStates
+
+    def forward(self, first: int, depth: int, backDepth: int) -> list[bytes]:
+        """Returns the solutions made of ``depth`` forward moves starting with ``first``, then ``backDepth`` more."""
+        steps, allowed, back = self.steps, self.allowed, self.back[backDepth]
+        found = []
+
+        def dfs(state, seq, togo):
+            if togo == 0:
+                for tail in back.get(bytes(state), ()):
+                    if not tail or allowed[seq[-1]][tail[0]]:
+                        found.append(seq + tail)
+                return
+            row = allowed[seq[-1]]
+            for i, step in enumerate(steps):
+                if row[i]: dfs(step(state), seq + bytes((i,)), togo - 1)
+
+        dfs(self.steps[first](self.start), bytes((first,)), depth - 1)
+        return found
+
+_WORKER: _Search | None = None
+
+def _initWorker(search: _Search) -> None:
+    global _WORKER
+    _WORKER = search
+
+def _forwardInWorker(first: int, depth: int, backDepth: int) -> list[bytes]:
+    return _WORKER.forward(first, depth, backDepth)
+
+########################################################################################################################
+
+def find_algorithms(cube: CubeN,
+                    moveset: str | Iterable[Move | str],
+                    max_len: int,
+                    metric: Metric | str = Metric.HTM,
+                    limit: int | None = None,
+                    jobs: int | None = None) -> Iterator[Algorithm]:
+    """
+    Generates every algorithm of at most ``max_len`` moves from ``moveset`` which solves ``cube``, shortest under
+    ``metric`` first.
+
+    :param cube: The cube state (case) to solve. It is not modified.
+    :param moveset: The generators allowed, e.g. ``"<R, U, F>"``. Their powers are allowed too.
+    :param max_len: The maximum number of moves in an algorithm.
+    :param metric: The metric algorithms are ranked by.
+    :param limit: If given, stop after this many algorithms.
+    :param jobs: The number of worker processes, defaults to the number of CPUs.
+
+    :rtype: Iterator[Algorithm]
+    :returns: The solving algorithms, in increasing ``size(alg, metric)``.
+
+    >>> case = CubeN(3) >> "R U R' U R U2 R'"
+    >>> next(find_algorithms(case, "<R, U>", 7)) -> Algorithm("R U2 R' U' R U' R'")
+
+    .. Notes::
+    The search meets in the middle: states ``max_len//2`` moves from solved are tabled once, and the other half is
+    enumerated from ``cube`` in parallel, split by its first move. Sequences cancelling or reordering commuting
+    moves (such as ``R L R'`` against ``L``) are never generated. Results of equal size are streamed as soon as
+    no longer algorithm can be smaller.
+    """
+    metric = Metric(metric)
+    moves = parseMoveset(moveset)
+    if any(m.degree > cube.size for m in moves):
+        raise ValueError(f"Move set contains moves which cannot be executed on a {cube.size}x{cube.size} cube")
+    if max_len < 0:
+        raise ValueError("max_len must be non-negative")
+
+    costs = [size(Algorithm([m]), metric) for m in moves]
+    minCost = min(costs, default=0)
+    search = _Search(cube, moves, max_len // 2)
+    jobs = jobs or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=jobs, initializer=_initWorker, initargs=(search,)) if jobs > 1 else None
+
+    def solutions(length):
+        if length == 0:
+            return [b''] if bytes(search.start) in search.back[0] else []
+        depth, backDepth = (length + 1) // 2, length // 2
+        if pool is None:
+            parts = (search.forward(i, depth, backDepth) for i in range(len(moves)))
+        else:
+            parts = pool.map(_forwardInWorker, range(len(moves)), [depth] * len(moves), [backDepth] * len(moves))
+        return [seq for part in parts for seq in part]
+
+    try:
+        buckets = defaultdict(list)
+        emitted = 0
+        for length in range(max_len + 1):
+            for seq in solutions(length):
+                buckets[sum(costs[i] for i in seq)].append(seq)
+
+            # every algorithm of size <= bound is at most `length` moves long, so has already been found
+            final = length == max_len or not moves
+            bound = float('inf') if final else (length * minCost if minCost > 0 else -1)
+            for s in sorted(k for k in buckets if k <= bound):
+                for seq in sorted(buckets.pop(s), key=lambda q: (len(q), q)):
+                    yield Algorithm([moves[i] for i in seq])
+                    emitted += 1
+                    if limit is not None and emitted >= limit: return
+            if final: return
+    finally:
+        if pool is not None: pool.shutdown(cancel_futures=True)
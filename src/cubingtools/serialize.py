@@ -0,0 +1,214 @@
+"""
+Compact storage of ``CubeN`` states: 3-bit packed sticker colours, facelet strings, and files of many states.
+
+A packed state is a header (magic, format version, N and the colour scheme) followed by the stickers in flat order
+(see ``facelets``), each stored as the 3-bit index of its colour in the scheme.
+"""
+
+from __future__ import annotations
+import struct
+from typing import BinaryIO, Iterable, Iterator
+
+import numpy as np
+
+from .cube import CubeN
+from .error import InvalidCubeError
+from .facelets import flatten, unflatten
+from ._enumHelpers import _FACES_LIST
+
+########################################################################################################################
+
+_MAGIC = b'CUBE'
+_VERSION = 1
+_HEADER = struct.Struct('<4sBHB')   # magic, version, n, byte length of the colour scheme
+_BUFFERED = 4096                    # states a StateWriter packs at once
+
+# facelet strings list faces in the order URFDLB, the flat state in the order UFRBLD
+_FACELET_FACES = "URFDLB"
+_FLAT_FACES = ''.join(map(str, _FACES_LIST))
+
+def recordSize(n: int) -> int:
+    """Returns the number of bytes one packed NxN state takes (without a header)."""
+    return (6 * n * n * 3 + 7) // 8
+
+def _header(n: int, cols: str) -> bytes:
+    scheme = cols.encode()
+    return _HEADER.pack(_MAGIC, _VERSION, n, len(scheme)) + scheme
+
+def _readHeader(data: bytes | memoryview) -> tuple[int, str, int]:
+    """Parses a header, returning the cube size, colour scheme and header length."""
+    if len(data) < _HEADER.size:
+        raise ValueError("Data too short for a cube state header")
+    magic, version, n, length = _HEADER.unpack_from(data)
+    if magic != _MAGIC: raise ValueError("Not a packed cube state (bad magic)")
+    if version != _VERSION: raise ValueError(f"Unsupported packed cube state version {version}")
+    end = _HEADER.size + length
+    return n, bytes(data[_HEADER.size:end]).decode(), end
+
+########################################################################################################################
+
+def cubeCodes(cube: CubeN, cols: str | None = None) -> np.ndarray:
+    """Returns the flat state of a cube as colour indices into ``cols`` (by default ``cube.cols``)."""
+    cols = cols or cube.cols
+    index = {c: k for k, c in enumerate(cols)}
+    try:
+        return np.array([index[s] for s in flatten(cube)], dtype=np.uint8)
+    except KeyError as e:
+        raise InvalidCubeError(f"Sticker {e.args[0]!r} is not in the colour scheme {cols!r}") from None
+
+def packCodes(codes: np.ndarray) -> np.ndarray:
+    """
+    Packs colour indices to 3 bits each.
+
+    :param codes: A ``(count, 6*n*n)`` array of colour indices (0 to 5).
+
+    :rtype: np.ndarray
+    :returns: A ``(count, recordSize(n))`` array of bytes, one row per state.
+    """
+    codes = np.asarray(codes, dtype=np.uint8)
+    bits = np.unpackbits(codes[..., None], axis=-1)[..., 5:]
+    return np.packbits(bits.reshape(len(codes), -1), axis=1)
+
+def unpackCodes(packed: np.ndarray, n: int) -> np.ndarray:
+    """Inverse of ``packCodes``: returns the ``(count, 6*n*n)`` colour indices of packed states."""
+    stickers = 6 * n * n
+    bits = np.unpackbits(np.asarray(packed, dtype=np.uint8), axis=1)[:, :3 * stickers]
+    return bits.reshape(len(bits), stickers, 3) @ np.array([4, 2, 1], dtype=np.uint8)
+
+def cubeFromCodes(codes: np.ndarray, n: int, cols: str) -> CubeN:
+    """Returns the cube with the given flat colour indices."""
+    cube = CubeN(n, cols)
+    unflatten(cube, [cols[k] for k in codes.tolist()])
+    return cube
+
+def toBytes(cube: CubeN) -> bytes:
+    """Returns a cube state packed to bytes (header included)."""
+    return _header(cube.size, cube.cols) + packCodes(cubeCodes(cube)[None]).tobytes()
+
+def fromBytes(data: bytes) -> CubeN:
+    """
+    Returns the cube packed by ``toBytes``.
+
+    :raises ValueError: If ``data`` is not a packed state.
+    """
+    n, cols, start = _readHeader(data)
+    payload = np.frombuffer(data, dtype=np.uint8, offset=start)
+    if len(payload) != recordSize(n):
+        raise ValueError(f"Expected {recordSize(n)} bytes of stickers for a {n}x{n} cube (got {len(payload)})")
+    codes = unpackCodes(payload[None], n)[0]
+    if codes.max(initial=0) > 5: raise ValueError("Packed state has colour indices out of range")
+    return cubeFromCodes(codes, n, cols)
+
+########################################################################################################################
+
+def toFacelets(cube: CubeN) -> str:
+    """
+    Returns a cube state as a facelet string: one face letter per sticker, faces in the order URFDLB, each face
+    read row by row as in the net ``str(cube)`` prints. For a 3x3 this is the format of Kociemba's solvers.
+
+    >>> toFacelets(CubeN(3) >> "U")[:9] -> "UUUUUUUUU"
+    """
+    letter = dict(zip(cube.cols, _FLAT_FACES))
+    try:
+        return ''.join(letter[s] for f in _FACELET_FACES for row in cube.state[f] for s in row)
+    except KeyError as e:
+        raise InvalidCubeError(f"Sticker {e.args[0]!r} is not in the colour scheme {cube.cols!r}") from None
+
+def fromFacelets(facelets: str, cols: str = 'wgrboy') -> CubeN:
+    """
+    Returns the cube described by a facelet string (see ``toFacelets``).
+
+    :param facelets: ``6*n*n`` face letters, faces in the order URFDLB.
+    :param cols: The colour scheme of the cube returned, in the order UFRBLD.
+
+    :raises ValueError: If the string has the wrong length or letters other than URFDLB.
+    """
+    n = round((len(facelets) / 6) ** 0.5)
+    nn = n * n
+    if 6 * nn != len(facelets): raise ValueError(f"Facelet string length {len(facelets)} is not 6*n*n")
+    if not set(facelets) <= set(_FACELET_FACES): raise ValueError("Facelet strings may only contain URFDLB")
+    colour = dict(zip(_FLAT_FACES, cols))
+    cube = CubeN(n, cols)
+    for k, f in enumerate(_FACELET_FACES):
+        face = facelets[k * nn:(k + 1) * nn]
+        cube.state[f] = [[colour[face[r * n + c]] for c in range(n)] for r in range(n)]
+    return cube
+
+########################################################################################################################
+
+class StateWriter:
+    def __init__(self, file: str | BinaryIO, n: int, cols: str = 'wgrboy'):
+        """
+        Streams packed NxN states to a file: one header, then fixed size records.
+
+        :param file: A path, or a binary file object opened for writing.
+        :param n: The size of the cubes.
+        :param cols: The colour scheme stickers are indexed in.
+
+        >>> with StateWriter("states.bin", 3) as out:
+        ...     for cube in cubes: out.write(cube)
+        """
+        self.n, self.cols = n, cols
+        self._own = isinstance(file, str)
+        self._file = open(file, 'wb') if self._own else file
+        self._file.write(_header(n, cols))
+        self._pending = []
+        self.count = 0
+
+    def write(self, cube: CubeN) -> None:
+        """Appends one cube's state (buffered, and packed together with the states around it)."""
+        if cube.size != self.n:
+            raise ValueError(f"Cannot write a {cube.size}x{cube.size} cube to a {self.n}x{self.n} states file")
+        self._pending.append(cubeCodes(cube, self.cols))
+        if len(self._pending) >= _BUFFERED: self.flush()
+
+    def writeCodes(self, codes: np.ndarray) -> None:
+        """Appends a ``(count, 6*n*n)`` batch of colour indices in one go."""
+        self.flush()
+        self._file.write(packCodes(codes).tobytes())
+        self.count += len(codes)
+
+    def flush(self) -> None:
+        if self._pending:
+            pending, self._pending = self._pending, []
+            self.writeCodes(np.stack(pending))
+        self._file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        if self._own: self._file.close()
+
+    def __enter__(self) -> 'StateWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def writeStates(path: str, cubes: Iterable[CubeN], n: int, cols: str = 'wgrboy') -> int:
+    """Writes cube states to a file, returning how many were written."""
+    with StateWriter(path, n, cols) as out:
+        for cube in cubes: out.write(cube)
+    return out.count
+
+def readStates(path: str, chunk: int = 65536) -> Iterator[np.ndarray]:
+    """
+    Reads a file written by ``StateWriter``, yielding ``(count, 6*n*n)`` arrays of colour indices of at most
+    ``chunk`` states each. Use ``readHeader`` for the size and colour scheme, and ``cubeFromCodes`` to rebuild cubes.
+    """
+    with open(path, 'rb') as f:
+        n, _, _ = _readFileHeader(f)
+        size = recordSize(n)
+        while data := f.read(size * chunk):
+            if len(data) % size: raise ValueError("File ends in the middle of a state")
+            yield unpackCodes(np.frombuffer(data, dtype=np.uint8).reshape(-1, size), n)
+
+def readHeader(path: str) -> tuple[int, str]:
+    """Returns the cube size and colour scheme of a states file."""
+    with open(path, 'rb') as f:
+        n, cols, _ = _readFileHeader(f)
+    return n, cols
+
+def _readFileHeader(f: BinaryIO) -> tuple[int, str, int]:
+    head = f.read(_HEADER.size)
+    if len(head) == _HEADER.size: head += f.read(head[-1])
+    return _readHeader(head)
@@ -0,0 +1,187 @@
+"""
+Table-based solvers for 2x2 and 3x3 cubes.
+
+The 3x3 solver is Kociemba's two-phase algorithm: phase 1 brings the cube into the subgroup
+``<U, D, R2, L2, F2, B2>`` and phase 2 solves it within that subgroup, both by IDA* over coordinate move tables
+with pruning tables as the heuristic. The tables are built once with NumPy and cached on disk. 2x2 cubes are
+solved optimally by ``cube2.Cube2``.
+"""
+
+from __future__ import annotations
+from functools import cache
+
+import numpy as np
+
+from .algorithm import Algorithm
+from .cube import CubeN
+from .cube2 import Cube2
+from .cubie import CubieCube, allMoves, allPerms, moveOf, SLICE_MASKS, SLICE_FROM_MASK
+from .error import InvalidCubeError
+from ._tables import loadOrBuild, moveArrays, orientationMoves, permutationMoves, pruning
+
+########################################################################################################################
+
+_N_TWIST = 2187
+_N_FLIP = 2048
+_N_SLICE = 495
+_N_PERM8 = 40320
+_N_PERM4 = 24
+
+# the moves of the phase 2 subgroup, as indices into the 18 face turns
+_PHASE2_MOVES = (0, 1, 2, 4, 7, 9, 10, 11, 13, 16)
+
+# without a length bound, phase 2 is first capped at this depth: deep phase 2 searches cost far more than trying
+# another phase 1 solution (every phase 2 position is solvable in 18)
+_PHASE2_CAP = 12
+
+def _buildTables3() -> dict[str, np.ndarray]:
+    cp, co, ep, eo = moveArrays(allMoves(3))
+
+    occupied = (SLICE_MASKS[:, None].astype(np.int64) >> np.arange(12)) & 1
+    fromMask = np.array(SLICE_FROM_MASK, dtype=np.int32)
+    sliceMove = np.empty((_N_SLICE, 18), dtype=np.int32)
+    for m in range(18):
+        sliceMove[:, m] = fromMask[occupied[:, ep[m]] @ (1 << np.arange(12))]
+
+    p2 = list(_PHASE2_MOVES)
+    tables = {
+        'twist': orientationMoves(_N_TWIST, 8, 3, cp, co),
+        'flip': orientationMoves(_N_FLIP, 12, 2, ep, eo),
+        'slice': sliceMove,
+        'cornerPerm': permutationMoves(allPerms(8), cp[p2]),
+        'udEdges': permutationMoves(allPerms(8), ep[p2, :8]),
+        'sliceSorted': permutationMoves(allPerms(4), ep[p2, 8:] - 8),
+    }
+    tables['twistSlice'] = pruning(tables['twist'], tables['slice'])
+    tables['flipSlice'] = pruning(tables['flip'], tables['slice'])
+    tables['cornerSliceSorted'] = pruning(tables['cornerPerm'], tables['sliceSorted'])
+    tables['edgeSliceSorted'] = pruning(tables['udEdges'], tables['sliceSorted'])
+    return tables
+
+########################################################################################################################
+
+class Solver3:
+    def __init__(self):
+        """
+        Two-phase solver for the 3x3. Constructing one loads (or on first use, builds and caches) its tables.
+
+        >>> Solver3().solve(CubeN(3) >> "R U R' U'") -> Algorithm(...)
+        """
+        t = loadOrBuild("twophase-v1", _buildTables3)
+        # plain lists and bytes are much faster than NumPy arrays for the scalar lookups the search makes
+        self._twist = t['twist'].ravel().tolist()
+        self._flip = t['flip'].ravel().tolist()
+        self._slice = t['slice'].ravel().tolist()
+        self._cornerPerm = t['cornerPerm'].ravel().tolist()
+        self._udEdges = t['udEdges'].ravel().tolist()
+        self._sliceSorted = t['sliceSorted'].ravel().tolist()
+        self._twistSlice = t['twistSlice'].tobytes()
+        self._flipSlice = t['flipSlice'].tobytes()
+        self._cornerSliceSorted = t['cornerSliceSorted'].tobytes()
+        self._edgeSliceSorted = t['edgeSliceSorted'].tobytes()
+
+    def solve(self, cube: CubeN, maxLength: int | None = None) -> Algorithm:
+        """
+        Returns an algorithm solving a 3x3 cube.
+
+        :param cube: The cube to solve (it is not modified).
+        :param maxLength: If given, the solution is at most this many (HTM) moves long.
+
+        :rtype: Algorithm
+        :returns: An algorithm of face turns solving the cube relative to its centres.
+
+        :raises InvalidCubeError: If the cube's state is not reachable from a solved cube.
+        :raises ValueError: If no solution within ``maxLength`` moves was found.
+        """
+        if cube.size != 3:
+            raise ValueError(f"Solver3 solves 3x3 cubes only (got n={cube.size})")
+        return Algorithm([moveOf(m) for m in self.solveCubie(CubieCube.fromCube(cube), maxLength)])
+
+    def solveCubie(self, c: CubieCube, maxLength: int | None = None) -> list[int]:
+        """
+        Returns a solution of a cubie state, as a list of move indices (see ``cubie.moveOf``).
+
+        .. Notes::
+        Without ``maxLength`` the first solution found is returned, which typically takes around a tenth of a second
+        and is 20-23 moves long. Lower bounds make the search try more phase 1 solutions, and take longer.
+        """
+        if not c.isSolvable():
+            raise InvalidCubeError("Cube state is not solvable")
+
+        twist, flip, slc = self._twist, self._flip, self._slice
+        twistSlice, flipSlice = self._twistSlice, self._flipSlice
+        moves = allMoves(3)
+        path = []
+
+        def phase1(tw, fl, sl, togo, last):
+            if togo == 0:
+                if tw or fl or sl: return None
+                x = c
+                for m in path: x = x * moves[m]
+                limit = cap if maxLength is None else min(18, maxLength - len(path))
+                rest = self._phase2(x.cornerPerm(), x.udEdges(), x.sliceSorted(), limit, last)
+                return None if rest is None else path + rest
+            for m in range(18):
+                f = m // 3
+                if f == last or f == last - 3: continue
+                t, fm, s = twist[18*tw + m], flip[18*fl + m], slc[18*sl + m]
+                if twistSlice[495*t + s] >= togo or flipSlice[495*fm + s] >= togo: continue
+                path.append(m)
+                if (res := phase1(t, fm, s, togo - 1, f)) is not None: return res
+                path.pop()
+            return None
+
+        for cap in ((_PHASE2_CAP, 18) if maxLength is None else (18,)):
+            for depth in range(13 if maxLength is None else min(13, maxLength + 1)):
+                if (res := phase1(c.twist(), c.flip(), c.slice(), depth, -1)) is not None:
+                    return res
+        raise ValueError(f"No solution of at most {maxLength} moves found")
+
+    def _phase2(self, cp: int, ud: int, ss: int, limit: int, last: int) -> list[int] | None:
+        """IDA* within the phase 2 subgroup, returning the shortest solution of at most ``limit`` moves."""
+        cornerPerm, udEdges, sliceSorted = self._cornerPerm, self._udEdges, self._sliceSorted
+        cornerSS, edgeSS = self._cornerSliceSorted, self._edgeSliceSorted
+        path = []
+
+        def search(cp, ud, ss, togo, last):
+            if togo == 0:
+                return cp == 0 and ud == 0 and ss == 0
+            for j, m in enumerate(_PHASE2_MOVES):
+                f = m // 3
+                if f == last or f == last - 3: continue
+                c, u, s = cornerPerm[10*cp + j], udEdges[10*ud + j], sliceSorted[10*ss + j]
+                if cornerSS[24*c + s] >= togo or edgeSS[24*u + s] >= togo: continue
+                path.append(m)
+                if search(c, u, s, togo - 1, f): return True
+                path.pop()
+            return False
+
+        lower = max(cornerSS[24*cp + ss], edgeSS[24*ud + ss])
+        for depth in range(lower, limit + 1):
+            if search(cp, ud, ss, depth, last): return path
+        return None
+
+########################################################################################################################
+
+@cache
+def getSolver(n: int) -> Cube2 | Solver3:
+    """Returns the (shared) solver for ``n``x``n`` cubes, loading its tables on first use."""
+    match n:
+        case 2: return Cube2()
+        case 3: return Solver3()
+        case _: raise ValueError(f"No solver exists for {n}x{n} cubes")
+
+def solve(cube: CubeN, maxLength: int | None = None) -> Algorithm:
+    """
+    Returns an algorithm solving a 2x2 or 3x3 cube.
+
+    :param cube: The cube to solve (it is not modified).
+    :param maxLength: If given, the solution is at most this many (HTM) moves long.
+
+    :rtype: Algorithm
+    :returns: An algorithm which, executed on ``cube``, solves it.
+
+    >>> c = CubeN(3) ; c.scramble()
+    >>> c >> solve(c) ; c.isSolved() -> True
+    """
+    return getSolver(cube.size).solve(cube, maxLength)
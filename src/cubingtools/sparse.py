@@ -0,0 +1,207 @@
+"""
+A sparse NxN cube, storing only the stickers a scramble has displaced, for very large cubes turned a few hundred times.
+
+>>> big = SparseCube(500) >> "R U' 3Fw2 F"
+>>> big.displaced -> 9989               # stickers away from their solved colour, out of 1.5 million
+>>> big.toDense() -> CubeN(...)         # the same state as CubeN(500) >> "R U' 3Fw2 F"
+
+.. Notes::
+The state is kept per face as ``{r*n + c: colour index}`` for the stickers not showing their face's colour. A turn
+moves the strips of stickers its layers cross (``4n`` per layer, cached per layer) and, for an outer layer, only the
+displaced stickers of the turned face: stickers of a face that still show its colour look the same after the face
+turns. Rotations never touch the stickers at all; like ``Algorithm.without_rotations`` the moves after them are
+relabelled, and the orientation is only applied by ``toDense``. Memory and time per move therefore grow with the
+layers turned and the stickers disturbed, not with ``n*n``.
+"""
+
+from __future__ import annotations
+from functools import lru_cache
+
+from .algorithm import Algorithm, _ORIENT_FACES, _ORIENT_REACH, _ORIENT_STEP, _ROTATION_CYCLES, _SLICE_AXIS
+from .cube import CubeN, _checkShape
+from .facelets import flatten, unflatten
+from .move import Move
+from .pieces import _position
+from ._enumHelpers import _FACES_LIST
+
+########################################################################################################################
+
+# the axis (x: L to R, y: D to U, z: B to F) and outward direction of each face
+_NORMAL = {'U': (1, 1), 'D': (1, -1), 'F': (2, 1), 'B': (2, -1), 'R': (0, 1), 'L': (0, -1)}
+_FACE_AT = {v: f for f, v in _NORMAL.items()}
+_FACE_INDEX = {f: k for k, f in enumerate(_FACES_LIST)}
+
+def _local(n: int, face: str, x: int, y: int, z: int) -> tuple[int, int]:
+    """The ``(r, c)`` of the sticker of ``face`` on cubie ``(x, y, z)`` (the inverse of ``pieces._position``)."""
+    m = n - 1
+    match face:
+        case 'U': return z, x
+        case 'D': return m - z, x
+        case 'F': return m - y, x
+        case 'B': return m - y, m - x
+        case 'R': return m - y, m - z
+        case 'L': return m - y, z
+
+def _quarter(n: int, axis: int, face: str, r: int, c: int) -> tuple[str, int, int]:
+    """Where a sticker goes when its layer turns a quarter about ``axis``, anticlockwise seen from the positive end."""
+    m = n - 1
+    pos = list(_position(n, face, r, c))
+    normal = [0, 0, 0]
+    a, sign = _NORMAL[face]
+    normal[a] = sign
+    i, j = (axis + 1) % 3, (axis + 2) % 3
+    # (i, j) -> (-j, i) about the cube's centre, in doubled coordinates so the centre is a lattice point
+    pi, pj = 2 * pos[i] - m, 2 * pos[j] - m
+    pos[i], pos[j] = (m - pj) // 2, (pi + m) // 2
+    normal[i], normal[j] = -normal[j], normal[i]
+    a = next(k for k in range(3) if normal[k])
+    out = _FACE_AT[a, normal[a]]
+    return (out, *_local(n, out, *pos))
+
+@lru_cache(maxsize=1024)
+def _strip(n: int, axis: int, v: int) -> tuple[tuple[tuple[int, int], ...], tuple[tuple[int, int], ...]]:
+    """
+    The ``(face index, r*n + c)`` of the ``4n`` stickers around the layer at coordinate ``v`` along ``axis``, and
+    where a positive quarter turn of the layer moves each of them.
+    """
+    src, dst = [], []
+    for face, (a, sign) in _NORMAL.items():
+        if a == axis: continue
+        for t in range(n):
+            pos = [t, t, t]
+            pos[axis], pos[a] = v, n - 1 if sign > 0 else 0
+            r, c = _local(n, face, *pos)
+            to, tr, tc = _quarter(n, axis, face, r, c)
+            src.append((_FACE_INDEX[face], r * n + c))
+            dst.append((_FACE_INDEX[to], tr * n + tc))
+    return tuple(src), tuple(dst)
+
+########################################################################################################################
+
+class SparseCube:
+    __slots__ = ('size', 'cols', '_faces', '_orient')
+
+    def __init__(self, n: int = 3, cols: str = 'wgrboy'):
+        """
+        Initializes a solved NxNxN cube which only stores its displaced stickers.
+
+        :param n: Size of the cube (NxNxN)
+        :param cols: Symbol (color) on each face of the cube (In the order UFRBLD)
+
+        >>> huge = SparseCube(500)
+        """
+        _checkShape(n, cols)
+        self.size = n
+        self.cols = cols
+        self._faces: list[dict[int, int]] = [{} for _ in _FACES_LIST]
+        self._orient = _ORIENT_FACES
+
+    @property
+    def displaced(self) -> int:
+        """The number of stickers not showing their face's solved colour (ignoring whole-cube rotations)."""
+        return sum(map(len, self._faces))
+
+    def algo(self, alg: Move | str | Algorithm) -> None:
+        """
+        Executes a given `Move` or `Algorithm` to the cube in-place (as ``CubeN.algo``).
+
+        :param alg: The `Move` or `Algorithm` to execute on the cube.
+        """
+        match alg:
+            case Move(): self._turn(alg)
+            case str() : self.algo(Algorithm(alg))
+            case Algorithm():
+                for m in alg: self._turn(m)
+            case _:
+                raise TypeError(f"Cannot execute the type {type(alg)} on a cube.")
+
+    def __rshift__(self, alg: Move | str | Algorithm) -> 'SparseCube':
+        """Executes an algorithm to the cube and returns it (good for chaining algorithms)."""
+        self.algo(alg)
+        return self
+
+    def _turn(self, move: Move) -> None:
+        n, mov, mod = self.size, str(move.mov), int(move.mod)
+        if mov in _ROTATION_CYCLES:
+            for _ in range(mod): self._orient = _ORIENT_STEP[self._orient, mov]
+            return
+        if mov in _SLICE_AXIS:
+            face, layers = self._orient[_ORIENT_FACES.index(_SLICE_AXIS[mov])], range(1, n - 1)
+        else:
+            if move.width <= 0 or (move.width > 1 and move.width >= n):
+                raise ValueError(
+                    f"n must be strictly 1 or more, and strictly less than self.size (your n={move.width})")
+            face = self._orient[_ORIENT_FACES.index(mov.upper())]
+            layers = range(move.width) if mov.isupper() else range(n - 1)
+
+        axis, sign = _NORMAL[face]
+        # clockwise seen from a face is anticlockwise seen from the opposite end of its axis
+        quarters = (-sign * mod) % 4
+        for d in layers:
+            self._turnLayer(axis, n - 1 - d if sign > 0 else d, quarters)
+
+    def _turnLayer(self, axis: int, v: int, quarters: int) -> None:
+        n, faces = self.size, self._faces
+        src, dst = _strip(n, axis, v)
+        if quarters == 3: src, dst = dst, src
+        for _ in range(1 if quarters == 3 else quarters):
+            moved = [faces[f].get(k, f) for f, k in src]
+            for (f, k), col in zip(dst, moved):
+                if col == f: faces[f].pop(k, None)
+                else: faces[f][k] = col
+
+        if 0 < v < n - 1: return
+        # an outer layer also turns its face, where only the displaced stickers can change
+        f = _FACE_INDEX[_FACE_AT[axis, 1 if v else -1]]
+        # the face turns clockwise (as seen from outside it) once, twice or three times
+        clockwise = quarters if v == 0 else 4 - quarters
+        m = n - 1
+        match clockwise:
+            case 1: faces[f] = {(k % n) * n + m - k // n: col for k, col in faces[f].items()}
+            case 2: faces[f] = {n * n - 1 - k: col for k, col in faces[f].items()}
+            case 3: faces[f] = {(m - k % n) * n + k // n: col for k, col in faces[f].items()}
+
+    def isSolved(self) -> bool:
+        """Whether every face shows a single colour (as ``CubeN.isSolved``)."""
+        nn = self.size * self.size
+        return all(not face or (len(face) == nn and len(set(face.values())) == 1) for face in self._faces)
+
+    def copy(self) -> 'SparseCube':
+        """Returns an independent copy of the cube."""
+        new = SparseCube.__new__(SparseCube)
+        new.size, new.cols, new._orient = self.size, self.cols, self._orient
+        new._faces = [dict(face) for face in self._faces]
+        return new
+
+    def toDense(self) -> CubeN:
+        """
+        Returns the cube as a ``CubeN`` in the same state.
+
+        .. Notes::
+        This builds all ``6*n*n`` stickers, so it costs as much as a dense cube does.
+        """
+        n, nn, cols = self.size, self.size * self.size, self.cols
+        stickers = [cols[f] for f in range(6) for _ in range(nn)]
+        for f, face in enumerate(self._faces):
+            for k, col in face.items(): stickers[f * nn + k] = cols[col]
+        cube = CubeN(n, cols)
+        unflatten(cube, stickers)
+        return cube >> Algorithm(_ORIENT_REACH[self._orient])
+
+    @classmethod
+    def fromDense(cls, cube: CubeN) -> 'SparseCube':
+        """
+        Returns a sparse cube in the same state as a ``CubeN``.
+
+        :raises ValueError: If a sticker is not a colour of the cube's scheme.
+        """
+        n, nn = cube.size, cube.size * cube.size
+        code = {s: k for k, s in enumerate(cube.cols)}
+        out = cls(n, cube.cols)
+        try:
+            for i, s in enumerate(flatten(cube)):
+                f, k = divmod(i, nn)
+                if (col := code[s]) != f: out._faces[f][k] = col
+        except KeyError as e:
+            raise ValueError(f"Sticker {e.args[0]!r} is not a colour of the scheme {cube.cols!r}") from None
+        return out
@@ -0,0 +1,156 @@
+"""
+The 48 symmetries of the cube (24 rotations, each with or without a left-right mirror), used to pick one canonical
+representative of every class of symmetric states or algorithms.
+
+>>> canonical_state(CubeN() >> "R U") == canonical_state(CubeN() >> "F' U'")    # as snapshots -> True
+>>> canonical_algorithm("R U R' U'") == canonical_algorithm("L' U' L U") -> True
+
+.. Notes::
+A symmetry of a state is the cube seen from another side (and possibly in a mirror), with its colours renamed so
+that the solved cube stays solved; on algorithms it relabels the moves the same way. Symmetric states are equally
+far from solved, so case databases and search tables only need to keep one state per class: up to 48x fewer.
+States are compared through their colour indices (see ``serialize.cubeCodes``), so every sticker must be a colour of
+the cube's scheme.
+"""
+
+from __future__ import annotations
+from functools import lru_cache
+
+import numpy as np
+
+from .algorithm import Algorithm
+from .cube import CubeN
+from .move import Move
+from .facelets import Perm, algorithmPerm, compose, identity, unflatten
+from .serialize import cubeCodes
+from ._enumHelpers import _BaseMove, _FACES_LIST
+
+########################################################################################################################
+
+SYMMETRIES = 48
+
+# the face each non-face move turns with: slices follow L, D and F, rotations follow R, U and F
+_AXIS_FACE = {'M': 'L', 'E': 'D', 'S': 'F', 'x': 'R', 'y': 'U', 'z': 'F'}
+_OPPOSITE = {'U': 'D', 'D': 'U', 'F': 'B', 'B': 'F', 'R': 'L', 'L': 'R'}
+_BASE_ORDER = {m: k for k, m in enumerate(_BaseMove)}
+
+def _mirrorPerm(n: int) -> Perm:
+    """The sticker permutation reflecting the cube in the plane between R and L."""
+    nn = n * n
+    face = {f: k for k, f in enumerate(_FACES_LIST)}
+    p = []
+    for f in _FACES_LIST:
+        src = face[_OPPOSITE[f]] if f in 'RL' else face[f]
+        p.extend(src * nn + r * n + (n - 1 - c) for r in range(n) for c in range(n))
+    return tuple(p)
+
+@lru_cache(maxsize=None)
+def _symmetries(n: int) -> tuple[tuple[Perm, ...], tuple[str, ...]]:
+    """The sticker permutations of all symmetries (identity first, mirrored ones last) and their face maps."""
+    gens = [algorithmPerm(n, "x"), algorithmPerm(n, "y")]
+    rotations, frontier = [identity(n)], [identity(n)]
+    seen = set(rotations)
+    while frontier:
+        frontier = [q for p in frontier for g in gens if (q := compose(p, g)) not in seen and not seen.add(q)]
+        rotations.extend(frontier)
+    mirror = _mirrorPerm(n)
+    perms = tuple(rotations) + tuple(compose(p, mirror) for p in rotations)
+    # the face whose stickers each face holds after the symmetry, in UFRBLD order
+    nn = n * n
+    faces = tuple(''.join(_FACES_LIST[p[k * nn] // nn] for k in range(6)) for p in perms)
+    return perms, faces
+
+@lru_cache(maxsize=None)
+def symmetryTables(n: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the precomputed symmetry tables of an NxN cube.
+
+    :param n: The size of the cube.
+
+    :rtype: tuple[np.ndarray, np.ndarray]
+    :returns: A ``(48, 6*n*n)`` array whose row ``s`` is the sticker permutation of symmetry ``s`` (see
+        ``facelets``), and a ``(48, 6)`` array whose row ``s`` renames the colour indices so solved stays solved.
+        Symmetry 0 is the identity, and symmetries 24 to 47 are mirrored.
+    """
+    if n <= 1: raise ValueError("n must be greater than 1")
+    perms, faces = _symmetries(n)
+    recolour = np.zeros((SYMMETRIES, 6), dtype=np.uint8)
+    for s, held in enumerate(faces):
+        for k, f in enumerate(held): recolour[s, _FACES_LIST.index(f)] = k
+    return np.array(perms, dtype=np.int32), recolour
+
+def symmetricCodes(cube: CubeN) -> np.ndarray:
+    """Returns the colour indices (see ``serialize.cubeCodes``) of the 48 states symmetric to a cube, one per row."""
+    perms, recolour = symmetryTables(cube.size)
+    codes = cubeCodes(cube)
+    return np.take_along_axis(recolour, codes[perms], axis=1)
+
+def canonical_state(cube: CubeN) -> CubeN:
+    """
+    Returns the canonical representative of the states symmetric to a cube.
+
+    :param cube: The cube (it is not modified).
+
+    :rtype: CubeN
+    :returns: A new cube, in the same state for every cube symmetric to ``cube``: the symmetric state whose colour
+        indices are lexicographically smallest.
+
+    >>> canonical_state(c).snapshot()    # a key for deduplicating states up to symmetry
+    """
+    rows = symmetricCodes(cube)
+    best = min(range(SYMMETRIES), key=lambda s: rows[s].tobytes())
+    out = CubeN(cube.size, cube.cols)
+    unflatten(out, [cube.cols[k] for k in rows[best].tolist()])
+    return out
+
+########################################################################################################################
+
+@lru_cache(maxsize=None)
+def _moveMaps() -> tuple[dict[_BaseMove, tuple[_BaseMove, bool]], ...]:
+    """For every symmetry, the base move each base move becomes, and whether its direction is reversed."""
+    maps = []
+    for s, held in enumerate(_symmetries(2)[1]):
+        mirrored = s >= SYMMETRIES // 2
+        # a turn of face f is seen, after the symmetry, on the face now holding f's stickers
+        image = {f: _FACES_LIST[held.index(f)] for f in _FACES_LIST}
+        table = {}
+        for m in _BaseMove:
+            if m.upper() in image and m not in _AXIS_FACE:
+                table[m] = (_BaseMove(image[m.upper()] if m.isupper() else image[m.upper()].lower()), mirrored)
+                continue
+            face = image[_AXIS_FACE[m]]
+            (target, axis), = [(t, a) for t, a in _AXIS_FACE.items()
+                               if a in (face, _OPPOSITE[face]) and t.isupper() == m.isupper()]
+            table[m] = (_BaseMove(target), (axis != face) != mirrored)
+        maps.append(table)
+    return tuple(maps)
+
+def symmetricAlgorithm(alg: Move | str | Algorithm, s: int) -> Algorithm:
+    """
+    Returns the image of an algorithm under symmetry ``s`` (an index into ``symmetryTables``).
+
+    .. Notes::
+    For every cube ``c``, applying symmetry ``s`` to ``c >> alg`` gives the same state as applying it to ``c`` and
+    then executing ``symmetricAlgorithm(alg, s)``.
+    """
+    table = _moveMaps()[s]
+    out = []
+    for m in Algorithm._coerceToAlgo(alg):
+        base, flip = table[m.mov]
+        out.append(Move(m.width, base, -m.mod if flip else m.mod))
+    return Algorithm(out)
+
+def canonical_algorithm(alg: Move | str | Algorithm) -> Algorithm:
+    """
+    Returns the canonical representative of the algorithms symmetric to an algorithm.
+
+    :param alg: The algorithm.
+
+    :rtype: Algorithm
+    :returns: The same algorithm for every algorithm symmetric to ``alg`` (it is one of the 48 images of ``alg``).
+
+    >>> canonical_algorithm("R U R' U'") -> Algorithm("U F U' F'")
+    """
+    alg = Algorithm._coerceToAlgo(alg)
+    images = [symmetricAlgorithm(alg, s) for s in range(SYMMETRIES)]
+    return min(images, key=lambda a: [(_BASE_ORDER[m.mov], m.width, int(m.mod)) for m in a])
@@ -1,86 +1,212 @@
-# """
-# Methods related to the validation of a cube state, ensuring the internal representation
-# of the cube state is reachable from a solved state with valid moves.
-# """
-
-# from .cube import *
-# from collections import Counter
-
-# def _validateShape(state: dict, n: int) -> bool:
-#     if set(state.keys()) != set(MOVS): return False
-#     for face in state.values():
-#         if len(face) != n: return False
-#         if any(len(row) != n for row in face): return False
-#     return True
-
-# def _validateColorCounts(state: dict, n: int) -> bool | str:
-#     a = n*n
-#     counts = Counter([
-#         sticker for face in state.values()
-#                 for row in face
-#                 for sticker in row
-#     ])
-#     if all(v==a for v in counts.values()) and len(counts) == 6:
-#         return ''.join(state[face][0][0] for face in MOVS) # ordered colors
-
-# def _validateCenters(state: dict, n: int, colors: str) -> bool:
-#     if n % 2 == 0: return True
-#     c = n//2 + 1
-#     return set(face[c][c] for face in state.values()) == set(colors)
-
-# ###################################################################################################
-# # CORNER STUFF
-
-# # VALIDATION STUFF
-# def corners(n: int, colors: str):
-#     m = n-1
-#     u,f,r,b,l,d = colors
-#     return {
-#         ('U','R','F', u,r,f , ((m,m),(0,0),(0,m))),
-#         ('U','F','L', u,f,l , ((m,0),(0,0),(0,m))),
-#         ('U','L','B', u,l,b , ((0,0),(0,0),(0,m))),
-#         ('U','B','R', u,b,r , ((0,m),(0,0),(0,m))),
-#         ('D','F','R', d,f,r , ((0,m),(m,m),(m,0))), 
-#         ('D','L','F', d,l,f , ((0,0),(m,m),(m,0))), 
-#         ('D','B','L', d,b,l , ((m,0),(m,m),(m,0))), 
-#         ('D','R','B', d,r,b , ((m,m),(m,m),(m,0))),
-#     }
-
-# def _validateCornerExistence(state: dict, n: int, colors: str) -> bool:
-#     crnrs = corners(n, colors)
-#     expected = set()
-#     actual = set()
-#     for f1,f2,f3, c1,c2,c3, ((i1,j1),(i2,j2),(i3,j3)) in crnrs:
-#         actual.add(frozenset((
-#             state[f1][i1][j1],
-#             state[f2][i2][j2],
-#             state[f3][i3][j3],
-#         )))
-#         expected.add(frozenset([c1,c2,c3]))
-
-#     return actual == expected
-
-# def _validateCornerPermutation(state: dict, n: int, colors: str) -> bool:
-#     # inversions method
-#     pass
-
-# ###################################################################################################
-
-# # allows early fail from inner function
-# class _GuardFail(Exception): pass
-
-# def isValid(state: dict, n: int) -> bool:
-#     def guard(f, *args): # early exits if result is falsy
-#         result = f(state, n, *args)
-#         return result if result else _GuardFail()
-    
-#     try:
-#         guard(_validateShape)
-#         colors = guard(_validateColorCounts)
-#         guard(_validateCenters, colors)
-#         guard(_validateCornerExistence, colors)
-#     except: return False
-#     else: return True
-
-# def isValidCube(cube: CubeN) -> bool:
-#     return isValid(cube.state, cube.size)
\ No newline at end of file
+"""
+Methods related to the validation of a cube state, ensuring the internal representation
+of the cube state is reachable from a solved state with valid moves.
+
+States are checked on flat sticker arrays (see ``facelets``), and many states can be checked in one vectorized call.
+"""
+
+from __future__ import annotations
+from functools import lru_cache
+
+import numpy as np
+
+from .cube import CubeN
+from .move import Move
+from .facelets import movePerm, invert
+from .pieces import pieceIndex
+from ._enumHelpers import _FACES_LIST
+
+########################################################################################################################
+
+_FACE_INDEX = {str(f): k for k, f in enumerate(_FACES_LIST)}
+
+def _flattenState(state: dict, n: int) -> list | None:
+    """Returns a dict state as a flat list of stickers, or None if it is not shaped like an NxN cube."""
+    if set(state.keys()) != set(_FACE_INDEX): return None
+    out = []
+    for f in _FACES_LIST:
+        face = state[f]
+        if len(face) != n or any(len(row) != n for row in face): return None
+        for row in face: out.extend(row)
+    return out
+
+def _parity(perms: np.ndarray) -> np.ndarray:
+    """Returns the parity of each row of a batch of permutations, by counting cycles."""
+    k = perms.shape[1]
+    start = np.arange(k)
+    smallest, x = np.broadcast_to(start, perms.shape), perms
+    for _ in range(k - 1):
+        smallest = np.minimum(smallest, x)
+        x = np.take_along_axis(perms, x, axis=1)
+    cycles = (smallest == start).sum(axis=1)
+    return (k - cycles) % 2
+
+def _isPermutation(pieces: np.ndarray) -> np.ndarray:
+    """Checks that each row of a batch holds every piece exactly once (and no -1, i.e. no impossible piece)."""
+    return (np.sort(pieces, axis=1) == np.arange(pieces.shape[1])).all(axis=1)
+
+########################################################################################################################
+# lookup tables from the labels a slot shows (encoded as a base 6 number) to the piece there and its orientation
+
+@lru_cache(maxsize=None)
+def _cornerTable() -> tuple[np.ndarray, np.ndarray]:
+    faces = pieceIndex(2).corners // 4
+    piece, twist = np.full(6 ** 3, -1), np.zeros(6 ** 3, dtype=np.int64)
+    for k, (a, b, c) in enumerate(faces.tolist()):
+        # a corner twisted by t shows its U/D sticker t stickers clockwise of the slot's U/D sticker
+        for t, reading in enumerate(((a, b, c), (c, a, b), (b, c, a))):
+            code = reading[0] * 36 + reading[1] * 6 + reading[2]
+            piece[code], twist[code] = k, t
+    return piece, twist
+
+@lru_cache(maxsize=None)
+def _edgeTable() -> tuple[np.ndarray, np.ndarray]:
+    faces = pieceIndex(3).midges // 9
+    piece, flip = np.full(36, -1), np.zeros(36, dtype=np.int64)
+    for k, (a, b) in enumerate(faces.tolist()):
+        piece[a * 6 + b], flip[a * 6 + b] = k, 0
+        piece[b * 6 + a], flip[b * 6 + a] = k, 1
+    return piece, flip
+
+@lru_cache(maxsize=None)
+def _wingTable(n: int, orbit: int) -> np.ndarray:
+    """
+    Returns ``table[slot, code]``, the wing showing labels ``code`` in ``slot`` of a wing orbit (or -1).
+
+    Wings cannot flip in place: half of them may only sit in each slot one way round, the other half only the
+    other way. Which way is read off the placements one wing reaches under face and slice turns.
+    """
+    nn = n * n
+    wings = pieceIndex(n).wings[orbit]
+    slotOf = {int(s): k for k, slot in enumerate(wings) for s in slot}
+
+    # every quarter turn touching this orbit: outer turns, and the wide turns ending on its slices
+    moves = [Move(w, f, 1) for f in "URFDLB" for w in (1, orbit + 1, orbit + 2)]
+    steps = [invert(movePerm(n, m)) for m in moves]
+    home = (int(wings[0, 0]), int(wings[0, 1]))
+    seen, todo = {home}, [home]
+    while todo:
+        a, b = todo.pop()
+        for p in steps:
+            if (nxt := (p[a], p[b])) not in seen:
+                seen.add(nxt)
+                todo.append(nxt)
+
+    # flipped[s]: whether the wing from slot 0 sits in slot s with its first sticker on the slot's second one
+    flipped = np.zeros(len(wings), dtype=bool)
+    for a, b in seen: flipped[slotOf[a]] = a != wings[slotOf[a], 0]
+
+    table = np.full((len(wings), 36), -1)
+    labels = wings // nn
+    for k, (a, b) in enumerate(labels.tolist()):
+        for s in range(len(wings)):
+            x, y = (b, a) if flipped[s] != flipped[k] else (a, b)
+            table[s, x * 6 + y] = k
+    return table
+
+########################################################################################################################
+
+def validateMany(states, n: int) -> np.ndarray:
+    """
+    Checks which of a batch of flat cube states are reachable from a solved cube.
+
+    :param states: A ``(count, 6*n*n)`` array-like of stickers (any hashable colours), each row a flat state.
+    :param n: The size of the cubes.
+
+    :rtype: np.ndarray
+    :returns: A boolean array, ``True`` where the state is valid.
+
+    :raises ValueError: If ``states`` is not shaped like a batch of flat NxN states.
+
+    .. Notes::
+    A state is valid when it uses six colours ``n*n`` times each, its pieces are exactly those of a solved cube of
+    the same colour scheme (with corners and wings the right way round), every centre orbit holds four centres of
+    each colour, corner twists sum to 0 mod 3, and, on odd cubes, middle edge flips sum to 0 mod 2 and the corner
+    and middle edge permutations have equal parity. On odd cubes the colour scheme is read off the centres, and on
+    even cubes off the corners, taking the DBL corner as solved.
+    """
+    nn = n * n
+    states = np.asarray(states)
+    if states.ndim != 2 or states.shape[1] != 6 * nn:
+        raise ValueError(f"Expected a batch of flat states of {6 * nn} stickers (got shape {states.shape})")
+    count = len(states)
+    if count == 0: return np.zeros(0, dtype=bool)
+    p = pieceIndex(n)
+
+    # colour counts: exactly six colours, n*n stickers each, then renumber each state's colours 0..5
+    _, codes = np.unique(states, return_inverse=True)
+    codes = codes.reshape(states.shape)
+    counts = np.zeros((count, codes.max() + 1), dtype=np.int64)
+    np.add.at(counts, (np.arange(count)[:, None], codes), 1)
+    valid = ((counts == nn).sum(axis=1) == 6) & ((counts == 0) | (counts == nn)).all(axis=1)
+    codes = np.minimum(np.take_along_axis(np.cumsum(counts > 0, axis=1) - 1, codes, axis=1), 5)
+
+    # colour scheme: label[state, colour] is the face the colour belongs to
+    rows = np.arange(count)[:, None]
+    label = np.full((count, 6), -1)
+    if n % 2:
+        centres = codes[:, next(c for c in p.centers if c.shape[1] == 1)[:, 0]]
+        label[rows, centres] = np.arange(6)
+    else:
+        corners = codes[:, p.corners]
+        together = np.zeros((count, 6, 6), dtype=bool)
+        together[:, np.arange(6), np.arange(6)] = True
+        for i, j in ((0, 1), (1, 2), (0, 2)):
+            together[rows, corners[:, :, i], corners[:, :, j]] = True
+            together[rows, corners[:, :, j], corners[:, :, i]] = True
+        d, b, l = corners[:, 6].T
+        label[np.arange(count), d], label[np.arange(count), b], label[np.arange(count), l] = 5, 3, 4
+        for c, opposite in ((d, 0), (b, 1), (l, 2)):
+            label[np.arange(count), np.argmin(together[np.arange(count), c], axis=1)] = opposite
+    valid &= (np.sort(label, axis=1) == np.arange(6)).all(axis=1)
+    labels = np.take_along_axis(label, codes, axis=1) % 6
+
+    # corners
+    cornerPiece, cornerTwist = _cornerTable()
+    cl = labels[:, p.corners]
+    cornerCodes = cl[:, :, 0] * 36 + cl[:, :, 1] * 6 + cl[:, :, 2]
+    cp = cornerPiece[cornerCodes]
+    valid &= _isPermutation(cp)
+    valid &= cornerTwist[cornerCodes].sum(axis=1) % 3 == 0
+
+    # middle edges
+    if n % 2 and n > 1:
+        edgePiece, edgeFlip = _edgeTable()
+        el = labels[:, p.midges]
+        edgeCodes = el[:, :, 0] * 6 + el[:, :, 1]
+        ep = edgePiece[edgeCodes]
+        valid &= _isPermutation(ep)
+        valid &= edgeFlip[edgeCodes].sum(axis=1) % 2 == 0
+        ok = valid.copy()
+        valid[ok] &= _parity(cp[ok]) == _parity(ep[ok])
+
+    # wings
+    for orbit, wings in enumerate(p.wings):
+        wl = labels[:, wings]
+        valid &= _isPermutation(_wingTable(n, orbit)[np.arange(len(wings)), wl[:, :, 0] * 6 + wl[:, :, 1]])
+
+    # centres: four of each colour in every orbit (the fixed centres defined the scheme)
+    for orbit in p.centers:
+        if orbit.shape[1] == 4:
+            perColour = np.zeros((count, 6), dtype=np.int64)
+            np.add.at(perColour, (rows, labels[:, orbit.ravel()]), 1)
+            valid &= (perColour == 4).all(axis=1)
+    return valid
+
+def isValid(state, n: int) -> bool:
+    """
+    Checks whether a cube state is reachable from a solved cube.
+
+    :param state: A ``CubeN.state`` dict, or a flat sequence of ``6*n*n`` stickers (see ``facelets``).
+    :param n: The size of the cube.
+    """
+    if isinstance(state, dict):
+        state = _flattenState(state, n)
+        if state is None: return False
+    elif len(state) != 6 * n * n:
+        return False
+    return bool(validateMany([list(state)], n)[0])
+
+def isValidCube(cube: CubeN) -> bool:
+    """Checks whether the state of a cube is reachable from a solved cube."""
+    return isValid(cube.state, cube.size)
@@ -1,19 +1,34 @@
+import random
+import sys
 import time
 import numpy as np
 import matplotlib.pyplot as plt
 from cubingtools import *
+from cubingtools import SparseCube
+from cubingtools.cube import _generateScrambleMoveList
+from cubingtools._enumHelpers import _MODS
 
-def benchmark(ns, lengths):
+def randomMoves(n, L):
+    # the moves CubeN.scramble draws from, without building a dense cube
+    ms = random.choices(_generateScrambleMoveList(n), k=L)
+    return Algorithm([Move(m.width, m.mov, random.choice(_MODS)) for m in ms])
+
+def benchmark(ns, lengths, sparse=False):
     results = np.zeros((len(ns), len(lengths)))
 
     for i, n in enumerate(ns):
         for j, L in enumerate(lengths):
             total = 0.0
 
-            cube = CubeN(n)
+            if sparse:
+                alg = randomMoves(n, L)
+                cube = SparseCube(n)
+            else:
+                cube = CubeN(n)
 
             start = time.perf_counter()
-            cube.scramble(L)
+            if sparse: cube.algo(alg)
+            else: cube.scramble(L)
             end = time.perf_counter()
 
             total += (end - start)
@@ -37,8 +52,10 @@ def plot(ns, lengths, results):
 
 
 if __name__ == "__main__":
-    ns = list(range(5, 101, 10))          # cube sizes
-    lengths = list(range(1, 1001, 50))    # scramble sizes
+    # --sparse times SparseCube instead, which reaches the sizes modelled for visualization
+    sparse = "--sparse" in sys.argv
+    ns = list(range(100, 501, 100) if sparse else range(5, 101, 10))     # cube sizes
+    lengths = list(range(1, 301, 50) if sparse else range(1, 1001, 50))  # scramble sizes
 
-    results = benchmark(ns, lengths)
-    plot(ns, lengths, results)
\ No newline at end of file
+    results = benchmark(ns, lengths, sparse)
+    plot(ns, lengths, results)
@@ -0,0 +1,8 @@
+import pytest
+
+@pytest.fixture(scope="session", autouse=True)
+def _tableCache(tmp_path_factory):
+    # lookup tables built by the tests go to a temporary directory rather than the developer's real cache
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("CUBINGTOOLS_CACHE", str(tmp_path_factory.mktemp("tables")))
+        yield
@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+
+from cubingtools import CubeN, Algorithm, aio
+from cubingtools.error import InvalidCubeError
+
+def run(coro):
+    return asyncio.run(coro)
+
+def test_scramble_and_solve_in_process():
+    async def main():
+        async with aio.Service(workers=2, inProcess=True) as service:
+            scramble = await service.scramble(3, seed=5)
+            cube = CubeN(3) >> scramble
+            solution = await service.solve(cube)
+            return scramble, cube, solution
+    scramble, cube, solution = run(main())
+    assert isinstance(scramble, Algorithm) and isinstance(solution, Algorithm)
+    assert len(scramble) == 24
+    cube >> solution
+    assert cube.isSolved()
+
+def test_seeded_scrambles_are_reproducible():
+    async def main():
+        async with aio.Service(workers=2, inProcess=True, warm=()) as service:
+            return await asyncio.gather(*(service.scramble(4, seed=s) for s in (1, 2, 1)))
+    a, b, c = run(main())
+    assert a == c and a != b
+
+def test_seeded_scrambles_leave_global_random_alone():
+    import random
+    async def main():
+        async with aio.Service(workers=4, inProcess=True, warm=()) as service:
+            return await asyncio.gather(*(service.scramble(3, 10, seed=s % 5) for s in range(40)))
+    random.seed(0)
+    expected = random.random()
+    random.seed(0)
+    algs = [str(a) for a in run(main())]
+    assert random.random() == expected
+    assert all(algs[i] == algs[i % 5] for i in range(40))
+
+def test_random_state_scramble():
+    async def main():
+        async with aio.Service(workers=1, inProcess=True) as service:
+            return await service.scramble(2, random_state=True, seed=9)
+    alg = run(main())
+    c = CubeN(2) >> alg
+    assert not c.isSolved()
+
+def test_batching_serves_many_requests():
+    async def main():
+        async with aio.Service(workers=2, inProcess=True, batchSize=8, maxPending=16, warm=()) as service:
+            algs = await asyncio.gather(*(service.scramble(3, 5, seed=i) for i in range(100)))
+            return algs, len(service._batches)
+    algs, running = run(main())
+    assert len(algs) == 100 and all(len(a) == 5 for a in algs)
+    assert running == 0
+
+def test_errors_reach_the_caller():
+    async def main():
+        async with aio.Service(workers=1, inProcess=True, warm=()) as service:
+            with pytest.raises(ValueError):
+                await service.scramble(5, random_state=True)
+            with pytest.raises(ValueError):
+                await service.solve(CubeN(4))
+            # the service keeps working after a failed request
+            return await service.scramble(3, 3, seed=1)
+    assert len(run(main())) == 3
+
+def test_backpressure_limits_pending_requests():
+    async def main():
+        async with aio.Service(workers=1, inProcess=True, maxPending=3, warm=()) as service:
+            tasks = [asyncio.create_task(service.scramble(3, 2, seed=i)) for i in range(10)]
+            await asyncio.sleep(0)
+            assert service._pending._value == 0
+            assert service._queue.qsize() <= 3
+            await asyncio.gather(*tasks)
+            return service._pending._value
+    assert run(main()) == 3
+
+def test_cancelled_requests_are_dropped():
+    async def main():
+        async with aio.Service(workers=1, inProcess=True, batchDelay=0.05, warm=()) as service:
+            cancelled = asyncio.create_task(service.scramble(3, 2, seed=1))
+            kept = asyncio.create_task(service.scramble(3, 2, seed=2))
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            result = await kept
+            with pytest.raises(asyncio.CancelledError):
+                await cancelled
+            return result, service._pending._value
+    result, free = run(main())
+    assert len(result) == 2 and free == 1024
+
+def test_close_cancels_queued_requests():
+    async def main():
+        service = aio.Service(workers=1, inProcess=True, batchDelay=10, warm=())
+        task = asyncio.create_task(service.scramble(3, 2))
+        await asyncio.sleep(0.01)
+        await service.close()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    run(main())
+
+def test_shared_service_across_event_loops():
+    async def main():
+        return await aio.scramble(3, 4, seed=3)
+    try:
+        aio._DEFAULT = aio.Service(workers=1, inProcess=True, warm=())
+        assert run(main()) == run(main())
+    finally:
+        run(aio.shutdown())
+    assert aio._DEFAULT is None
+
+def test_process_pool():
+    async def main():
+        async with aio.Service(workers=2, warm=(2,)) as service:
+            cube = CubeN(2) >> "R U F' R2"
+            return cube, await service.solve(cube), await service.scramble(3, seed=4)
+    cube, solution, scramble = run(main())
+    cube >> solution
+    assert cube.isSolved() and len(scramble) == 24
+
+def test_bad_arguments():
+    with pytest.raises(ValueError):
+        aio.Service(maxPending=0)
@@ -1,5 +1,6 @@
 import pytest
 from cubingtools.algorithm import *
+from cubingtools.cube import CubeN
 
 def test_algorithm_str():
     alg = Algorithm([Move(1, 'U', '1'), Move(1, 'R', "'")])
@@ -130,4 +131,60 @@ def test_degree_mixed():
     assert Algorithm("M 3Rw").degree == 4
 
 def test_degree_takes_max():
-    assert Algorithm("3Rw 5Uw").degree == 6
\ No newline at end of file
+    assert Algorithm("3Rw 5Uw").degree == 6
+
+def test_without_rotations_relabels_moves():
+    assert str(Algorithm("R x U y' F").without_rotations()) == "R F L x y'"
+    assert str(Algorithm("x M y E z S x2").without_rotations()) == "M S' M' y'"
+    assert str(Algorithm("x x'").without_rotations()) == ""
+
+def test_without_rotations_equivalent():
+    import random
+    rng = random.Random(4)
+    moves = "U D F B R L M E S x y z u d f b r l Rw 3Uw".split()
+    for _ in range(100):
+        alg = Algorithm(' '.join(rng.choice(moves) + rng.choice(["", "'", "2"]) for _ in range(12)))
+        out = alg.without_rotations()
+        # == ignores the cube's orientation, so compare whole states to check the trailing rotation too
+        n = max(alg.degree, 3)
+        assert (CubeN(n) >> out).snapshot() == (CubeN(n) >> alg).snapshot()
+        assert len(out) <= len(alg) + 2
+        assert all(str(m.mov) not in "xyz" for m in list(out)[:-2])
+
+def test_without_rotations_enables_cancellation():
+    assert str(simplified(Algorithm("R y F y'").without_rotations())) == "R2"
+    assert len(simplified(Algorithm("R y F y'"))) == 4
+
+def test_frozen_algorithm_caches():
+    from cubingtools.metric import size
+    sune = FrozenAlgorithm("R U R' U R U2 R'")
+    assert sune.inverse() is sune.inverse() and -(-sune) is sune
+    assert isinstance(simplified(sune), FrozenAlgorithm) and simplified(sune) is simplified(sune)
+    assert reduced(sune) is reduced(sune)
+    assert size(sune, "QTM") == 8 and ('_size', 'QTM') in sune._memo
+    assert sune.perm(3) is sune.perm(3)
+    assert sune.frozen() is sune and Algorithm("R").frozen() == Algorithm("R")
+
+def test_frozen_algorithm_is_immutable():
+    alg = Algorithm("R U")
+    frozen = alg.frozen()
+    alg += "U"
+    assert str(frozen) == "R U"
+    with pytest.raises(TypeError):
+        frozen.simplify()
+    with pytest.raises(TypeError):
+        frozen.reduce()
+    with pytest.raises(TypeError):
+        frozen.extend("U")
+    with pytest.raises(TypeError):
+        hash(frozen)    # == is equivalence on the cube, which no hash of the moves agrees with
+    same = frozen
+    frozen += "U'"
+    assert isinstance(frozen, FrozenAlgorithm) and str(frozen) == "R" and str(same) == "R U"
+
+def test_frozen_algorithm_equiv():
+    assert FrozenAlgorithm("R U R' U'") * 6 == Algorithm()
+    assert FrozenAlgorithm("R2 U2") * 6 == FrozenAlgorithm()
+    assert FrozenAlgorithm("x R") == FrozenAlgorithm("R x")
+    assert FrozenAlgorithm("R L") != FrozenAlgorithm("M'")
+    assert FrozenAlgorithm("y") == FrozenAlgorithm("")
@@ -1,5 +1,6 @@
 from cubingtools.algorithmExtensions import order
 from cubingtools.algorithm import *
+from cubingtools.algorithm import FrozenAlgorithm
 
 def test_algo_order_3x3_small():
     cases = [
@@ -68,4 +69,11 @@ def test_algo_order_4x4():
     for alg_str, n, expected in cases:
         alg = Algorithm(alg_str)
         result = order(alg, n)
-        assert result == expected, f"{alg_str!r} on {n}×{n}: expected {expected}, got {result}"
\ No newline at end of file
+        assert result == expected, f"{alg_str!r} on {n}×{n}: expected {expected}, got {result}"
+
+
+def test_algo_order_keyword_n():
+    assert order(Algorithm("R U"), n=3) == 105
+    sexy = FrozenAlgorithm("R U R' U'")
+    assert order(sexy, n=3) == order(sexy, 3) == 6
+    assert order(alg=sexy) == 6
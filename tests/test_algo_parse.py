@@ -44,4 +44,7 @@ def test_algo_mismatched_paren():
     with pytest.raises(InvalidAlgorithmError):
         Algorithm("(R U")
     with pytest.raises(InvalidAlgorithmError):
-        Algorithm("R U2 (D ) R ) B ( F ( L )")
\ No newline at end of file
+        Algorithm("R U2 (D ) R ) B ( F ( L )")
+    for alg in [")", "R )", ")2 U"]:
+        with pytest.raises(InvalidAlgorithmError):
+            Algorithm(alg)
@@ -71,3 +71,35 @@ def test_simplify_in_place():
     alg = Algorithm("R R'")
     alg.simplify()
     assert equiv(alg, Algorithm())
+
+def test_concatenation_cancels_at_the_join():
+    assert str(Algorithm("R U R'") + Algorithm("R U R'")) == "R U2 R'"
+    assert str(Algorithm("R U R'") + Algorithm("R U' R'")) == ""
+    assert str(Algorithm("R U") + Algorithm("U' R'")) == ""
+    assert str(Algorithm("R U") - Algorithm("R U")) == ""
+    assert str("R U" + Algorithm("U R")) == "R U2 R"
+    # operands that are not simplified are simplified first
+    assert str(Algorithm("R R U") + Algorithm("U")) == "R2 U2"
+
+def test_iadd_does_not_mutate_aliases():
+    a = Algorithm("R U")
+    b = a
+    a += "U' R'"
+    assert str(a) == "" and str(b) == "R U"
+
+def test_extend_in_place():
+    alg = Algorithm("R U")
+    same = alg
+    alg.extend("U R")
+    assert alg is same and str(alg) == "R U2 R"
+    alg.extend(alg)
+    assert str(alg) == "R U2 R2 U2 R"
+    alg.extend(-alg)
+    assert str(alg) == "" and alg.degree == 2
+
+def test_extend_degree():
+    alg = Algorithm("R")
+    alg.extend("3Rw")
+    assert alg.degree == 4
+    alg.extend("3Rw'")
+    assert alg.degree == 2
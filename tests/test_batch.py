@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from cubingtools import CubeN, Algorithm, CubeBatch, scramble_batch
+from cubingtools.cube import _scrambleAutomaton
+
+def test_solved_batch():
+    batch = CubeBatch(4, 3, 'abcdef')
+    assert len(batch) == 3 and batch.codes.shape == (3, 96)
+    assert all(c.isSolved() and c.cols == 'abcdef' for c in batch.cubes())
+
+@pytest.mark.parametrize("n", [2, 3, 4, 5])
+def test_states_match_scrambles(n):
+    algs, batch = scramble_batch(n, 30, seed=n)
+    assert len(algs) == 30
+    for k, alg in enumerate(algs):
+        assert isinstance(alg, Algorithm) and len(alg) == 8 * n
+        assert (CubeN(n) >> alg).snapshot() == batch.cube(k).snapshot()
+
+def test_scrambles_follow_the_automaton():
+    fsm = _scrambleAutomaton(3)
+    index = {str(m): i for i, m in enumerate(fsm.moves)}
+    algs, _ = scramble_batch(3, 200, m=10, seed=0)
+    for alg in algs:
+        assert len(alg) == 10
+        assert fsm.accepts(index[str(m)] for m in alg)
+
+def test_reproducible():
+    a, batchA = scramble_batch(3, 50, seed=7)
+    b, batchB = scramble_batch(3, 50, seed=7)
+    c, _ = scramble_batch(3, 50, seed=8)
+    assert [str(x) for x in a] == [str(x) for x in b] != [str(x) for x in c]
+    assert np.array_equal(batchA.codes, batchB.codes)
+    assert len({str(x) for x in a}) == 50
+
+def test_scrambles_compose():
+    batch = CubeBatch(3, 5)
+    first, second = batch.scramble(5, seed=1), batch.scramble(5, seed=2)
+    for k in range(5):
+        assert (CubeN(3) >> first[k] >> second[k]).snapshot() == batch.cube(k).snapshot()
+
+def test_bad_arguments():
+    with pytest.raises(ValueError):
+        CubeBatch(1, 3)
+    with pytest.raises(ValueError):
+        CubeBatch(3, -1)
+    assert scramble_batch(3, 0)[0] == []
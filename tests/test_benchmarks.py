@@ -0,0 +1,28 @@
+from benchmarks.run import timeCase, compare, main
+from benchmarks.suite import cases
+
+def _report(**mins):
+    return {"meta": {}, "results": {k: {"min": v} for k, v in mins.items()}}
+
+def test_every_hot_path_has_a_case():
+    names = cases().keys()
+    for prefix in ("Move.parse", "Algorithm._parse", "simplified", "reduced", "size/QTM", "turn/7/slice", "order",
+                   "equiv", "scramble/3"):
+        assert any(n.startswith(prefix) for n in names), prefix
+
+def test_time_case():
+    res = timeCase(lambda: None, repeat=2, minTime=0.001)
+    assert res["repeat"] == 2 and res["number"] >= 1
+    assert 0 <= res["min"] <= res["median"]
+
+def test_compare_flags_slowdowns_only():
+    base = _report(a=1.0, b=1.0, c=1.0)
+    cur = _report(a=1.1, b=2.0, d=5.0)
+    slower = compare(cur, base, threshold=1.25)
+    assert [s["name"] for s in slower] == ["b"]
+    assert slower[0]["ratio"] == 2.0
+
+def test_main_writes_json_and_checks_baseline(tmp_path):
+    out = tmp_path / "out.json"
+    assert main(["--filter", "Move.parse", "--quick", "--json", str(out)]) == 0
+    assert main(["--filter", "Move.parse", "--quick", "--baseline", str(out), "--threshold", "1000"]) == 0
@@ -0,0 +1,36 @@
+from cubingtools import CubeN, Algorithm
+from cubingtools.algorithm import reduced
+from cubingtools.canonical import MoveAutomaton, canonical_sequences, parseMoveset
+
+def test_commuting_moves_in_one_order():
+    seqs = {str(a) for a in canonical_sequences("<R, L>", 2)}
+    assert len(seqs) == 9
+    assert "L R" in seqs and "R L" not in seqs
+
+def test_no_redundant_sequences():
+    fsm = MoveAutomaton(parseMoveset("<U, D, R>"))
+    for seq in fsm.sequences(3):
+        alg = Algorithm([fsm.moves[i] for i in seq])
+        assert len(reduced(alg)) == 3
+    index = {str(m): i for i, m in enumerate(fsm.moves)}
+    assert not fsm.accepts([index[str(m)] for m in Algorithm("U D U'")])
+    assert not fsm.accepts([index[str(m)] for m in Algorithm("U D")])
+    assert fsm.accepts([index[str(m)] for m in Algorithm("D U R")])
+
+def test_count_matches_enumeration():
+    fsm = MoveAutomaton(parseMoveset("<U, D, R, L, F, B>"))
+    for k in range(4):
+        assert fsm.count(k) == len(list(fsm.sequences(k)))
+    # the well-known number of canonical 3x3 HTM sequences of length 2 and 3
+    assert fsm.count(2) == 243
+    assert fsm.count(3) == 3240
+
+def test_scramble_is_canonical():
+    for n in (2, 3, 4):
+        c = CubeN(n)
+        alg = c.scramble(40)
+        moves = list(alg)
+        assert len(moves) == 40
+        for a, b in zip(moves, moves[1:]):
+            assert not (a.mov == b.mov and a.width == b.width)
+        assert len(reduced(alg)) == 40
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from cubingtools import CubeN, Algorithm, recognize
+from cubingtools.cases import caseIndex, _KNOWN
+
+def test_case_counts():
+    assert len(caseIndex("OLL")) == 58
+    assert len(caseIndex("PLL")) == 22
+    assert len(caseIndex("ZBLL")) == 472
+
+def test_known_algorithms_name_distinct_cases():
+    for caseSet, known in _KNOWN.items():
+        named = [c.name for c in caseIndex(caseSet).cases if c.name not in (None, "skip")]
+        assert sorted(named) == sorted(known)
+
+def test_every_case_has_a_solving_algorithm():
+    for case in caseIndex("PLL").cases:
+        assert case.algorithms
+
+def test_recognize():
+    assert recognize(CubeN() >> "R U R' U' R' F R2 U' R' U' R U R' F'", "PLL").case.name == "T"
+    assert recognize(CubeN() >> "R U2 R' U' R U' R'", "OLL").case.name == "OLL 27"
+    assert recognize(CubeN() >> "U", "PLL").case.name == "skip"
+    assert recognize(CubeN(), "oll").case.name == "skip"
+
+def test_recognize_with_aufs_and_rotations():
+    t = caseIndex("PLL")["T"]
+    for setup in ("U", "U2", "y", "y' U"):
+        for after in ("", "U", "U'"):
+            c = CubeN() >> setup >> -Algorithm(t.algorithms[0]) >> after
+            assert recognize(c, "PLL").case == t
+
+def test_matches_solve_the_cube():
+    rng = random.Random(1)
+    algs = [a for known in _KNOWN.values() for a in known.values()]
+    for _ in range(50):
+        c = CubeN(3)
+        for _ in range(3): c >> rng.choice(algs) >> rng.choice(["U", "U2", "U'", "y"])
+        oll = recognize(c, "OLL")
+        # oriented, with the F2L solved (relative to the centres, as the cube may have been rotated)
+        assert recognize(c.copy() >> oll.algorithms[0], "PLL") is not None
+        for caseSet in ("PLL", "ZBLL"):
+            if (match := recognize(c, caseSet)) is not None:
+                assert (c.copy() >> match.algorithms[0]).isSolved()
+
+def test_not_a_case():
+    assert recognize(CubeN() >> "R", "OLL") is None
+    assert recognize(CubeN() >> "R U R' U R U2 R'", "PLL") is None
+    assert recognize(CubeN() >> "R U R' U' R' F R2 U' R' U' R U R' F'", "ZBLL") is None
+    with pytest.raises(ValueError):
+        recognize(CubeN(4))
+    with pytest.raises(ValueError):
+        caseIndex("COLL")
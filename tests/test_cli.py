@@ -0,0 +1,58 @@
+import io
+import json
+
+from cubingtools.cli import main
+
+def _cli(argv, text=''):
+    out = io.StringIO()
+    code = main(argv, stdin=io.StringIO(text), stdout=out)
+    return code, out.getvalue().splitlines()
+
+def test_simplify_tsv():
+    code, lines = _cli(["simplify"], "R R U\nR R'\n\n")
+    assert code == 0
+    assert lines == ["R R U\tR2 U", "R R'\t"]
+
+def test_size_json():
+    code, lines = _cli(["size", "--metric", "qtm", "--format", "json"], "R2 U\n")
+    assert json.loads(lines[0]) == {"input": "R2 U", "result": 3}
+
+def test_bad_lines_do_not_stop_the_batch():
+    code, lines = _cli(["order", "--size", "3"], "R U\nnot an alg\nR\n")
+    assert code == 1
+    assert lines[0] == "R U\t105"
+    assert lines[1].startswith("not an alg\t\t")
+    assert lines[2] == "R\t4"
+
+def test_unbalanced_brackets_do_not_stop_the_batch():
+    code, lines = _cli(["simplify"], "R U\n)\nR R\n(R\nU U'\n")
+    assert code == 1
+    assert lines[0] == "R U\tR U"
+    assert lines[1].startswith(")\t\tInvalidAlgorithmError")
+    assert lines[2] == "R R\tR2"
+    assert lines[3].startswith("(R\t\tInvalidAlgorithmError")
+    assert lines[4] == "U U'\t"
+
+def test_equiv_and_reduce():
+    assert _cli(["equiv"], "R L\tL R\nR\tU\n")[1] == ["R L\tL R\tTrue", "R\tU\tFalse"]
+    assert _cli(["reduce"], "R L R'\n")[1] == ["R L R'\tL"]
+
+def test_solve():
+    code, lines = _cli(["solve", "--size", "2"], "R U F\n")
+    item, solution = lines[0].split('\t')
+    from cubingtools import CubeN
+    assert (CubeN(2) >> item >> solution).isSolved()
+
+def test_scramble_is_reproducible_across_jobs():
+    _, one = _cli(["scramble", "--count", "3", "--seed", "7", "--length", "10"])
+    _, two = _cli(["scramble", "--count", "3", "--seed", "7", "--length", "10", "--jobs", "2"])
+    assert one == two and len(one) == 3
+    assert all(len(s.split()) == 10 for s in one)
+
+def test_scramble_leaves_global_random_alone():
+    import random
+    random.seed(0)
+    expected = random.random()
+    random.seed(0)
+    _cli(["scramble", "--count", "2", "--seed", "7", "--length", "5"])
+    assert random.random() == expected
@@ -0,0 +1,56 @@
+import random
+import numpy as np
+import pytest
+
+from cubingtools import CubeN
+from cubingtools.cube2 import Cube2
+from cubingtools.cubie import CubieCube
+from cubingtools.error import InvalidCubeError
+
+# number of 2x2 states at each HTM distance from solved
+_DISTRIBUTION = [1, 9, 54, 321, 1847, 9992, 50136, 227536, 870072, 1887748, 623800, 2644]
+
+def test_depth_table_distribution():
+    depth = Cube2()._depth
+    assert np.bincount(depth).tolist() == _DISTRIBUTION
+
+def test_solved_coord():
+    assert Cube2.coord(CubeN(2)) == 0
+    assert Cube2().distance(CubeN(2)) == 0
+    assert len(Cube2().solve(CubeN(2))) == 0
+
+def test_optimal_solve():
+    solver = Cube2()
+    for alg, length in [("R", 1), ("R U", 2), ("R U R' U'", 4), ("R U2 R' F2", 4)]:
+        c = CubeN(2) >> alg
+        assert solver.distance(c) == length
+        sol = solver.solve(c)
+        assert len(sol) == length
+        c >> sol
+        assert c.isSolved()
+
+def test_solve_any_orientation():
+    c = CubeN(2) >> "R U' F2 D L' B x y'"
+    c >> Cube2().solve(c)
+    assert c.isSolved()
+
+def test_batch_matches_single():
+    solver = Cube2()
+    rng = random.Random(5)
+    states = [CubieCube.random(rng, edges=False) for _ in range(50)]
+    coords = solver.coords(states)
+    assert solver.distances(coords).tolist() == [solver.distance(s) for s in states]
+    for state, sol in zip(states, solver.solveMany(states)):
+        assert len(sol) == solver.distance(state)
+        c = state.toCube(2) >> sol
+        assert c.isSolved()
+
+def test_max_length():
+    with pytest.raises(ValueError):
+        Cube2().solve(CubeN(2) >> "R U R' U'", maxLength=3)
+
+def test_invalid_state():
+    with pytest.raises(InvalidCubeError):
+        Cube2.coord(CubieCube(co=[1, 0, 0, 0, 0, 0, 0, 0]))
+    with pytest.raises(ValueError):
+        Cube2().solve(CubeN(3))
@@ -156,4 +156,122 @@ def test_MES_and_wide():
 def test_repr_eq_str():
     for i in range(2, 100):
         c = CubeN(i)
-        assert repr(c) == str(c)
\ No newline at end of file
+        assert repr(c) == str(c)
+
+
+# copies and snapshots
+
+def test_copy_is_independent():
+    c = CubeN(4) >> "R U"
+    d = c.copy()
+    assert d.state == c.state and d.size == 4 and d.cols == c.cols
+    d >> "F"
+    assert d.state != c.state
+    assert deepcopy(c).state == c.state
+
+def test_snapshot_restore():
+    c = CubeN(3) >> "R U R'"
+    snap = c.snapshot()
+    assert len(snap) == 54
+    c >> "F2 D"
+    c.restore(snap)
+    assert c.snapshot() == snap
+    assert c.state == (CubeN(3) >> "R U R'").state
+    with pytest.raises(ValueError):
+        c.restore(CubeN(4).snapshot())
+
+def test_solved_template_is_shared():
+    c, d = CubeN(3), CubeN(3)
+    c >> "R"
+    c.reset()
+    assert c.isSolved()
+    assert c.solved == d.state
+    c.solved["U"][0][0] = "x"   # a copy, so the template is untouched
+    assert CubeN(3).isSolved()
+    from cubingtools.cube import _solvedTemplate
+    assert _solvedTemplate(3, 'wgrboy') is _solvedTemplate(3, 'wgrboy') == CubeN(3).snapshot()
+
+def test_unhashable_colours():
+    assert CubeN(2, list('abcdef')).isSolved()
+    with pytest.raises(ValueError):
+        CubeN(3, ['a', 'a', 'b', 'c', 'd', 'e'])
+    with pytest.raises(ValueError):
+        CubeN(3, ['a', 'b'])
+
+def test_face_properties_are_class_level():
+    assert isinstance(CubeN.U, property)
+    c = CubeN(2)
+    assert c.U is c.state["U"]
+    c.F = [["x", "x"], ["x", "x"]]
+    assert c.state["F"] == [["x", "x"], ["x", "x"]]
+    with pytest.raises(AttributeError):
+        c.extra = 1     # __slots__
+
+def test_lowercase_moves_are_wide_moves():
+    for face in "UDFBRL":
+        assert (CubeN(3) >> face.lower()).snapshot() == (CubeN(3) >> f"{face}w").snapshot()
+
+def test_lowercase_d_and_b_turn_with_their_face():
+    # d and b once turned their outer layer against D and B; on a 3x3 they are the face turn and the slice with it
+    for wide, equivalent in [("d", "D E"), ("d'", "D' E'"), ("d2", "D2 E2"), ("b", "B S'"), ("b'", "B' S"),
+                             ("u", "U E'"), ("f", "F S")]:
+        assert (CubeN(3) >> wide).snapshot() == (CubeN(3) >> equivalent).snapshot(), wide
+
+@pytest.mark.parametrize("limit", [CubeN.journalLimit, 0])
+def test_journal_push_pop(limit, monkeypatch):
+    # limit 0 keeps no saved states, so every checkpoint is restored by inverse moves
+    monkeypatch.setattr(CubeN, "journalLimit", limit)
+    c = CubeN(4) >> "R U"
+    start = c.snapshot()
+    c.push()
+    c >> "F 2Rw' M x D2"
+    middle = c.snapshot()
+    c.push()
+    c >> "L' y b"
+    c.pop()
+    assert c.snapshot() == middle
+    c.pop()
+    assert c.snapshot() == start
+    with pytest.raises(IndexError):
+        c.pop()
+
+def test_journal_undo_and_commit():
+    c = CubeN(3)
+    c.push()
+    c >> "R U F'"
+    c.undo(2)
+    assert c.snapshot() == (CubeN(3) >> "R").snapshot()
+    with pytest.raises(IndexError):
+        c.undo(2)
+    c >> "D S"
+    c.push()
+    c >> "L"
+    c.commit()
+    kept = c.snapshot()
+    assert kept == (CubeN(3) >> "R D S L").snapshot()
+    c.undo(3)
+    assert c.snapshot() == (CubeN(3) >> "R").snapshot()
+    c.pop()
+    assert c.isSolved() and c.snapshot() == CubeN(3).snapshot()
+
+def test_journal_undo_count():
+    c = CubeN(3)
+    c.push()
+    c >> "R U"
+    c.undo(0)
+    assert c.snapshot() == (CubeN(3) >> "R U").snapshot()
+    with pytest.raises(ValueError):
+        c.undo(-1)
+    assert c.snapshot() == (CubeN(3) >> "R U").snapshot()
+    c.undo(2)
+    assert c.isSolved()
+
+def test_journal_not_copied():
+    c = CubeN(3)
+    c.push()
+    c >> "R"
+    d = c.copy()
+    with pytest.raises(IndexError):
+        d.undo()
+    c.pop()
+    assert c.isSolved() and not d.isSolved()
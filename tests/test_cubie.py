@@ -0,0 +1,59 @@
+import random
+import pytest
+
+from cubingtools import CubeN
+from cubingtools.cubie import CubieCube, basicMoves, MOVE_FACES, permParity, rankPerm, allPerms
+from cubingtools.error import InvalidCubeError
+
+def test_solved_cube_reads_as_identity():
+    assert CubieCube.fromCube(CubeN(3)) == CubieCube()
+    assert CubieCube.fromCube(CubeN(3, 'abcdef')) == CubieCube()
+
+def test_basic_moves_match_kociemba():
+    u, r = basicMoves(3)[0], basicMoves(3)[1]
+    assert u.cp == [3, 0, 1, 2, 4, 5, 6, 7]
+    assert r.cp == [4, 1, 2, 0, 7, 5, 6, 3]
+    assert r.co == [2, 0, 0, 1, 1, 0, 0, 2]
+
+def test_cubie_moves_agree_with_cubeN():
+    idx = {f: i for i, f in enumerate(MOVE_FACES)}
+    for _ in range(20):
+        c = CubeN(3)
+        alg = c.scramble(25)
+        x = CubieCube()
+        for mv in alg:
+            for _ in range(mv.mod): x = x * basicMoves(3)[idx[str(mv.mov)]]
+        assert x == CubieCube.fromCube(c)
+        assert x.isSolvable()
+
+def test_round_trip_through_cubeN():
+    rng = random.Random(0)
+    for _ in range(50):
+        c = CubieCube.random(rng)
+        assert c.isSolvable()
+        assert CubieCube.fromCube(c.toCube(3)) == c
+
+        c2 = CubieCube.random(rng, edges=False)
+        back = CubieCube.fromCube(c2.toCube(2))
+        assert (back.cp, back.co) == (c2.cp, c2.co)
+
+def test_2x2_frame_is_taken_from_dbl_corner():
+    c = CubeN(2) >> "x y2"
+    assert CubieCube.fromCube(c).cp == list(range(8))
+
+def test_invalid_stickers():
+    c = CubeN(3)
+    c.state['U'][0][0] = c.state['U'][0][1] = 'g'
+    with pytest.raises(InvalidCubeError):
+        CubieCube.fromCube(c)
+    with pytest.raises(ValueError):
+        CubieCube.fromCube(CubeN(4))
+
+def test_twisted_corner_is_not_solvable():
+    c = CubieCube(co=[1, 0, 0, 0, 0, 0, 0, 0])
+    assert not c.isSolvable()
+
+def test_perm_helpers():
+    assert permParity([1, 0, 2]) == 1
+    assert permParity([1, 2, 0]) == 0
+    assert [rankPerm(list(p)) for p in allPerms(4)] == list(range(24))
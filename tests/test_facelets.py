@@ -0,0 +1,41 @@
+from cubingtools import CubeN, Algorithm, apply_many
+from cubingtools.facelets import flatten, unflatten, movePerm, algorithmPerm, compose, invert, identity, apply
+
+def test_flatten_round_trip():
+    c = CubeN(4) >> "R U 2Fw'"
+    d = CubeN(4)
+    unflatten(d, flatten(c))
+    assert d.state == c.state
+
+def test_compiled_algorithm_matches_cube():
+    for n in (2, 3, 5):
+        alg = Algorithm("R U' F2 x" if n == 2 else "R U' Fw2 M S' y")
+        c = CubeN(n) >> alg
+        assert apply(algorithmPerm(n, alg), flatten(CubeN(n))) == flatten(c)
+
+def test_compose_and_invert():
+    r = algorithmPerm(3, "R")
+    u = algorithmPerm(3, "U")
+    assert compose(r, u) == algorithmPerm(3, "R U")
+    assert compose(r, invert(r)) == identity(3)
+    assert algorithmPerm(3, "R'") == invert(r)
+
+def test_apply_many_matches_separate_runs():
+    start = CubeN(4, 'abcdef') >> "R 2Fw"
+    algs = ["R U R' U'", "R U R' U' R' F R2", "R U R' U' R' F R2", "R U", "", Algorithm("R U 2Rw' x"), "D2"]
+    states = apply_many(start, algs)
+    assert len(states) == len(algs)
+    for alg, cube in zip(algs, states):
+        assert cube.cols == 'abcdef'
+        assert cube.snapshot() == (start.copy() >> alg).snapshot()
+    assert states[1] is not states[2]
+    assert start.snapshot() == (CubeN(4, 'abcdef') >> "R 2Fw").snapshot()
+
+def test_apply_many_turns_shared_prefixes_once(monkeypatch):
+    from cubingtools import facelets
+    calls = []
+    compiled = facelets._movePerm
+    monkeypatch.setattr(facelets, "_movePerm", lambda *key: calls.append(key) or compiled(*key))
+    apply_many(CubeN(), ["R U R' U' F", "R U R' U' F'", "R U R' U2", "R U R' U' F"])
+    # one move per trie node: the shared "R U R'", then U' F, F' and U2
+    assert len(calls) == 7
@@ -0,0 +1,46 @@
+import pytest
+
+from cubingtools import CubeN, MoveGroup
+
+@pytest.mark.parametrize("n, gens, order", [
+    (2, "R U F", 3674160),
+    (3, "R U", 73483200),
+    (3, "R2 U2 F2 D2 L2 B2", 663552),
+    (3, "U D F B R L", 43252003274489856000),
+])
+def test_orders(n, gens, order):
+    assert MoveGroup(n, gens).order() == order
+
+def test_algorithm_generators():
+    # the commutator only ever cycles pieces, so it generates far less than <R, U>
+    group = MoveGroup(3, ["R U R' U'", "U"])
+    assert 1 < group.order() < MoveGroup(3, "R U").order()
+
+def test_membership():
+    ru = MoveGroup(3, "R U")
+    assert "R U R' U' R2" in ru
+    assert CubeN() >> "R U2 R' U' R U' R'" in ru
+    assert "F" not in ru
+    assert CubeN() >> "L" not in ru
+    assert CubeN() in ru
+
+def test_membership_of_cubes_needs_distinct_stickers():
+    with pytest.raises(ValueError):
+        MoveGroup(4, "R U").contains(CubeN(4) >> "R")
+
+@pytest.mark.parametrize("n, gens, alg", [
+    (2, "R U F", "R U F' R2 U' F2 R U2"),
+    (3, "R U", "R U2 R' U' R U' R' U2 R U R'"),
+    (3, "R U M", "M' U2 M U R U' M2"),
+    (3, "U D F B R L", "D2 F' L U2 B R' D F2 U' L2 B'"),
+])
+def test_factorize(n, gens, alg):
+    group = MoveGroup(n, gens)
+    for state in (alg, CubeN(n) >> alg):
+        factors = group.factorize(state)
+        assert {str(m.mov) for m in factors} <= set(gens.split())
+        assert (CubeN(n) >> factors).snapshot() == (CubeN(n) >> alg).snapshot()
+
+def test_factorize_outside_group():
+    with pytest.raises(ValueError):
+        MoveGroup(3, "R U").factorize("F")
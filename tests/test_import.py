@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import cubingtools
+
+def _run(code: str) -> str:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env).stdout
+
+def test_import_does_not_load_numpy():
+    assert _run("import sys, cubingtools; print('numpy' in sys.modules)").strip() == "False"
+
+def test_lazy_attributes():
+    assert _run("import sys, cubingtools; cubingtools.Cube2; print('numpy' in sys.modules)").strip() == "True"
+    assert "solve" in dir(cubingtools)
+    assert cubingtools.find_algorithms.__module__ == "cubingtools.search"
+    with pytest.raises(AttributeError):
+        cubingtools.nonexistent
+
+def test_star_import_stays_light():
+    code = "import sys; from cubingtools import *; print('numpy' in sys.modules, simplified, reduced, Move)"
+    assert _run(code).startswith("False ")
+    from cubingtools import simplified, reduced, Move, InvalidAlgorithmError
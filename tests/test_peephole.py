@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from cubingtools import Algorithm, FrozenAlgorithm, Metric, optimized, size
+from cubingtools.facelets import algorithmPerm
+
+@pytest.mark.parametrize("alg, metric, expected", [
+    ("R M'", Metric.STM, "r"),
+    ("R L' x'", Metric.STM, "M"),
+    ("F y R y' U", Metric.HTM, "F B U"),
+    ("x R x' U2 U", Metric.HTM, "R U'"),
+    ("R U R' U'", Metric.HTM, "R U R' U'"),
+    ("R R'", Metric.QTM, ""),
+])
+def test_known_rewrites(alg, metric, expected):
+    assert str(optimized(alg, metric)) == str(Algorithm(expected))
+
+@pytest.mark.parametrize("metric", list(Metric))
+def test_same_permutation_and_never_larger(metric):
+    rng = random.Random(str(metric))
+    tokens = list("UDFBRLudfbrlMESxyz")
+    for _ in range(40):
+        alg = Algorithm(' '.join(rng.choice(tokens) + rng.choice(["", "'", "2"]) for _ in range(12)))
+        out = optimized(alg, metric)
+        assert algorithmPerm(3, out) == algorithmPerm(3, alg)
+        assert size(out, metric) <= size(alg, metric)
+        if size(out, metric) == size(alg, metric): assert len(out) <= len(alg)
+
+def test_keyword_arguments():
+    assert str(optimized("R M'", metric=Metric.STM)) == "r"
+    assert str(optimized(alg="R R2 U", metric="HTM", depth=2)) == "R' U"
+    alg = FrozenAlgorithm("R M' U")
+    assert optimized(alg, metric=Metric.STM) is optimized(alg, Metric.STM)
+
+def test_frozen_results_are_remembered():
+    alg = FrozenAlgorithm("R M' U")
+    assert optimized(alg, Metric.STM) is optimized(alg, Metric.STM)
+
+def test_rejects_larger_cubes():
+    with pytest.raises(ValueError):
+        optimized("3Rw U")
+
+def test_rejects_bad_depth():
+    with pytest.raises(ValueError):
+        optimized("R U", Metric.HTM, 0)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from cubingtools import CubeN
+from cubingtools.cubie import cornerFacelets, edgeFacelets
+from cubingtools.facelets import flatten
+from cubingtools.pieces import pieceIndex, solvedAt, isF2LSolved
+
+def _allStickers(p):
+    parts = [p.corners, p.midges, *p.wings, *p.centers]
+    return sorted(int(i) for part in parts for i in part.ravel())
+
+def test_pieces_cover_every_sticker_once():
+    for n in range(2, 8):
+        assert _allStickers(pieceIndex(n)) == list(range(6 * n * n))
+
+def test_orbit_shapes():
+    p = pieceIndex(6)
+    assert p.midges.shape == (0, 2)
+    assert [w.shape for w in p.wings] == [(24, 2), (24, 2)]
+    assert [c.shape for c in p.centers] == [(6, 4)] * 4
+    p = pieceIndex(5)
+    assert p.midges.shape == (12, 2)
+    assert [c.shape[1] for c in p.centers] == [4, 4, 1]
+
+def test_cached_per_size():
+    assert pieceIndex(4) is pieceIndex(4)
+    with pytest.raises(ValueError):
+        pieceIndex(1)
+
+def test_matches_cubie_slots():
+    flat = lambda f, r, c: "UFRBLD".index(f) * 9 + r * 3 + c
+    p = pieceIndex(3)
+    assert p.corners.tolist() == [[flat(*s) for s in slot] for slot in cornerFacelets(3)]
+    assert p.midges.tolist() == [[flat(*s) for s in slot] for slot in edgeFacelets(3)]
+
+def test_pieces_stay_pieces():
+    # moves carry whole pieces around, so every slot still shows the colours of some solved piece
+    for n, alg in ((4, "Rw U Lw' F2 Bw D' r"), (5, "Rw U 3Lw' F2 Bw D r")):
+        p = pieceIndex(n)
+        home, scrambled = np.array(flatten(CubeN(n))), np.array(flatten(CubeN(n) >> alg))
+        for part in (p.corners, *p.wings):
+            assert sorted(map(sorted, scrambled[part])) == sorted(map(sorted, home[part]))
+
+def test_partial_solved_checks():
+    c = CubeN(3) >> "R U R' U'"
+    assert not isF2LSolved(c)
+    assert isF2LSolved(CubeN(3) >> "U2 R U R' U R U2 R'")
+    assert solvedAt(CubeN(3) >> "M2", pieceIndex(3).corners)
+    assert not solvedAt(CubeN(3) >> "M2", pieceIndex(3).midges)
+    assert len(pieceIndex(3).layer('U')) == 21
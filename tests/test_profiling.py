@@ -0,0 +1,51 @@
+import cubingtools
+from cubingtools import CubeN, Algorithm
+from cubingtools import profiling
+
+def test_profile_counts_moves_and_parses():
+    c = CubeN(3)
+    with cubingtools.profile() as prof:
+        c >> "R U'"
+    report = prof.report()
+    assert report["moves"]["R"]["count"] == 1
+    # R expands to z' U z, and z' and U' to three quarter turns each
+    assert report["moves"]["U"]["count"] == 5
+    assert report["moves"]["z"]["count"] == 5
+    assert report["parses"]["Algorithm"] >= 1
+    assert report["stickers"] == 4 * (9 + 12) + 4 * 54
+    assert report["wall"] >= report["moves"]["R"]["time"] > 0
+
+def test_profile_is_off_outside_block():
+    with cubingtools.profile() as prof:
+        pass
+    assert profiling.ACTIVE is None
+    CubeN(3) >> "R"
+    assert prof.report()["moves"] == {}
+
+def test_nested_same_move_time_not_double_counted():
+    with cubingtools.profile() as prof:
+        CubeN(3) >> "R2"
+    moves = prof.report()["moves"]
+    assert moves["R"]["count"] == 3     # R2 and the two quarter turns it expands to
+    assert moves["R"]["time"] <= prof.wall
+
+def test_folded_stacks():
+    with cubingtools.profile() as prof:
+        CubeN(3) >> "R"
+    lines = dict(line.rsplit(' ', 1) for line in prof.folded().splitlines())
+    assert set(lines) == {"R", "R;z'", "R;z';z", "R;U", "R;z"}
+    assert all(int(t) >= 0 for t in lines.values())
+
+def test_cache_counters():
+    from cubingtools.facelets import algorithmPerm
+    algorithmPerm(3, "R")
+    with cubingtools.profile() as prof:
+        algorithmPerm(3, "R R")
+    assert prof.report()["caches"]["movePerm"]["hits"] == 2
+
+def test_every_cache_is_reported():
+    import importlib
+    for module, _ in profiling._CACHES.values(): importlib.import_module(module)
+    with cubingtools.profile() as prof:
+        CubeN(3) >> "R"
+    assert set(prof.report()["caches"]) == set(profiling._CACHES)
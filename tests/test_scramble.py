@@ -1,6 +1,6 @@
 import pytest
 
-from cubingtools import CubeN, Algorithm
+from cubingtools import CubeN, Algorithm, solve, scramble_random_state
 from cubingtools.move import Move
 
 def test_rand_move_returns_move():
@@ -14,4 +14,33 @@ def test_scramble_length_and_not_solved():
     alg = c.scramble(100)
     assert isinstance(alg, Algorithm)
     assert len(alg) == 100
-    assert not c.isSolved()
\ No newline at end of file
+    assert not c.isSolved()
+
+def test_random_state_scrambles():
+    for n in (2, 3):
+        scrambles = scramble_random_state(n, count=5, seed=7, jobs=1)
+        assert len(scrambles) == 5
+        for alg in scrambles:
+            c = CubeN(n) >> alg
+            assert not c.isSolved()
+            c >> solve(c)
+            assert c.isSolved()
+
+def test_random_state_scrambles_are_reproducible():
+    a = scramble_random_state(2, count=40, seed=3, jobs=1)
+    b = scramble_random_state(2, count=40, seed=3, jobs=2)
+    assert [str(x) for x in a] == [str(x) for x in b]
+
+def test_random_state_2x2_uses_urf():
+    for alg in scramble_random_state(2, count=10, seed=0):
+        assert set(str(m.mov) for m in alg) <= set("URF")
+
+def test_random_state_bad_size():
+    with pytest.raises(ValueError):
+        scramble_random_state(4)
+
+def test_scramble_with_rng_is_reproducible():
+    import random
+    a = CubeN(4).scramble(30, random.Random(11))
+    b = CubeN(4).scramble(30, random.Random(11))
+    assert str(a) == str(b) and len(a) == 30
@@ -0,0 +1,54 @@
+import pytest
+
+from cubingtools import CubeN, Algorithm, Metric, size, find_algorithms
+from cubingtools.move import Move
+from cubingtools.search import parseMoveset
+
+SUNE = "R U R' U R U2 R'"
+
+def test_parse_moveset():
+    assert [str(m) for m in parseMoveset("<R, U2>")] == ["R", "R2", "R'", "U2"]
+    assert [str(m) for m in parseMoveset([Move(1, "F", 1)])] == ["F", "F2", "F'"]
+
+def test_finds_inverse_sune():
+    case = CubeN(3) >> SUNE
+    algs = list(find_algorithms(case, "<R, U>", 7, jobs=1))
+    assert [str(a) for a in algs] == ["R U2 R' U' R U' R'"]
+
+def test_every_result_solves_the_case():
+    case = CubeN(3) >> "R U R' U'"
+    algs = list(find_algorithms(case, "<R, U, F>", 8, jobs=1))
+    assert str(algs[0]) == "U R U' R'"
+    for alg in algs:
+        c = CubeN(3) >> "R U R' U'" >> alg
+        assert c.isSolved()
+
+def test_results_are_ranked_and_non_redundant():
+    case = CubeN(3) >> "R U2 R' F2"
+    algs = list(find_algorithms(case, "<R, U, F>", 8, metric=Metric.QTM, jobs=1))
+    sizes = [size(a, Metric.QTM) for a in algs]
+    assert sizes == sorted(sizes)
+    assert len({str(a) for a in algs}) == len(algs)
+    for alg in algs:
+        moves = list(alg)
+        assert all(a.mov != b.mov for a, b in zip(moves, moves[1:]))
+
+def test_limit_and_solved_case():
+    assert [str(a) for a in find_algorithms(CubeN(3), "<R, U>", 4, limit=1, jobs=1)] == [""]
+    case = CubeN(3) >> "x R' U R' D2 R U' R' D2 R2 x'"
+    assert len(list(find_algorithms(case, "<R, U, D, x>", 10, limit=2, jobs=1))) == 2
+
+def test_parallel_matches_serial():
+    case = CubeN(3) >> SUNE
+    serial = [str(a) for a in find_algorithms(case, "<R, U>", 9, jobs=1)]
+    parallel = [str(a) for a in find_algorithms(case, "<R, U>", 9, jobs=2)]
+    assert serial == parallel
+
+def test_rotations_in_moveset():
+    case = CubeN(3) >> "x R2 x'"
+    algs = list(find_algorithms(case, "<R, U, x>", 3, limit=3, jobs=1))
+    assert str(algs[0]) == "R2"
+
+def test_moves_too_big():
+    with pytest.raises(ValueError):
+        next(find_algorithms(CubeN(2), "<R, M>", 3, jobs=1))
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from cubingtools import CubeN
+from cubingtools.serialize import (
+    recordSize, packCodes, unpackCodes, cubeCodes, StateWriter, writeStates, readStates, readHeader, cubeFromCodes,
+)
+
+def test_bytes_round_trip():
+    for n in (2, 3, 4, 7):
+        c = CubeN(n, 'abcdef')
+        c.scramble()
+        data = c.to_bytes()
+        d = CubeN.from_bytes(data)
+        assert d.size == n and d.cols == 'abcdef'
+        assert d.state == c.state
+        assert len(data) < 20 + recordSize(n)
+
+def test_bytes_are_compact():
+    assert recordSize(3) == 21
+    assert recordSize(100) == 22500
+
+def test_from_bytes_rejects_garbage():
+    with pytest.raises(ValueError):
+        CubeN.from_bytes(b'nonsense')
+    with pytest.raises(ValueError):
+        CubeN.from_bytes(CubeN(3).to_bytes()[:-1])
+
+def test_pack_codes_batch():
+    codes = np.random.default_rng(0).integers(0, 6, size=(100, 96), dtype=np.uint8)
+    packed = packCodes(codes)
+    assert packed.shape == (100, recordSize(4))
+    assert (unpackCodes(packed, 4) == codes).all()
+
+def test_facelets_match_kociemba_format():
+    assert CubeN(3).to_facelets() == "UUUUUUUUURRRRRRRRRFFFFFFFFFDDDDDDDDDLLLLLLLLLBBBBBBBBB"
+    assert (CubeN(3) >> "R").to_facelets() == "UUFUUFUUFRRRRRRRRRFFDFFDFFDDDBDDBDDBLLLLLLLLLUBBUBBUBB"
+
+def test_facelets_round_trip():
+    c = CubeN(5) >> "Rw U' 3Lw F2 Bw"
+    assert CubeN.from_facelets(c.to_facelets()).state == c.state
+    with pytest.raises(ValueError):
+        CubeN.from_facelets("UUU")
+
+def test_states_file(tmp_path):
+    path = str(tmp_path / "states.bin")
+    cubes = []
+    for _ in range(10):
+        c = CubeN(3)
+        c.scramble()
+        cubes.append(c)
+    assert writeStates(path, cubes, 3) == 10
+    assert readHeader(path) == (3, 'wgrboy')
+    chunks = list(readStates(path, chunk=4))
+    assert [len(ch) for ch in chunks] == [4, 4, 2]
+    codes = np.concatenate(chunks)
+    assert [cubeFromCodes(c, 3, 'wgrboy').state for c in codes] == [c.state for c in cubes]
+
+def test_states_file_bulk(tmp_path):
+    path = str(tmp_path / "states.bin")
+    codes = np.stack([cubeCodes(CubeN(4) >> "R U Fw")] * 5000)
+    with StateWriter(path, 4) as out:
+        out.writeCodes(codes)
+        out.write(CubeN(4))
+    back = np.concatenate(list(readStates(path)))
+    assert back.shape == (5001, 96)
+    assert (back[:5000] == codes).all()
+    assert (back[5000] == cubeCodes(CubeN(4))).all()
@@ -0,0 +1,46 @@
+import random
+import pytest
+
+from cubingtools import CubeN, solve
+from cubingtools.cubie import CubieCube
+from cubingtools.solver import getSolver
+from cubingtools.error import InvalidCubeError
+
+def test_solve_scrambled_3x3():
+    for _ in range(10):
+        c = CubeN(3)
+        c.scramble()
+        c >> solve(c)
+        assert c.isSolved()
+
+def test_solve_respects_max_length():
+    rng = random.Random(1)
+    for _ in range(5):
+        c = CubieCube.random(rng).toCube(3)
+        sol = solve(c, maxLength=22)
+        assert len(sol) <= 22
+        c >> sol
+        assert c.isSolved()
+
+def test_solve_solved_and_short():
+    assert len(solve(CubeN(3))) == 0
+    assert str(solve(CubeN(3) >> "R U", maxLength=2)) == "U' R'"
+
+def test_solve_scrambled_2x2_optimally():
+    assert len(solve(CubeN(2) >> "R U R' U'")) == 4
+    for _ in range(10):
+        c = CubeN(2)
+        c.scramble()
+        sol = solve(c)
+        assert len(sol) <= 11
+        c >> sol
+        assert c.isSolved()
+
+def test_unsolvable_state():
+    c = CubieCube(eo=[1] + [0] * 11).toCube(3)
+    with pytest.raises(InvalidCubeError):
+        solve(c)
+
+def test_no_solver_for_big_cubes():
+    with pytest.raises(ValueError):
+        getSolver(4)
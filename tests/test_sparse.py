@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from cubingtools import CubeN, SparseCube
+
+def _randomAlg(n, length, rng):
+    tokens = list("UDFBRLudfbrlxyz") + (list("MES") if n > 2 else [])
+    tokens += [f"{w}{f}w" for w in range(2, n) for f in "UDFBRL"]
+    return ' '.join(rng.choice(tokens) + rng.choice(["", "'", "2"]) for _ in range(length))
+
+@pytest.mark.parametrize("n", [2, 3, 4, 5, 6, 7])
+def test_matches_dense_cube(n):
+    rng = random.Random(n)
+    for _ in range(25):
+        alg = _randomAlg(n, 15, rng)
+        assert (SparseCube(n) >> alg).toDense().snapshot() == (CubeN(n) >> alg).snapshot(), alg
+
+def test_solved():
+    cube = SparseCube(5, 'abcdef')
+    assert cube.isSolved() and cube.displaced == 0
+    assert cube.toDense().snapshot() == CubeN(5, 'abcdef').snapshot()
+    cube >> "x y2 z'"
+    assert cube.isSolved() and cube.displaced == 0
+    assert cube.toDense().snapshot() == (CubeN(5, 'abcdef') >> "x y2 z'").snapshot()
+
+def test_inverse_restores():
+    cube = SparseCube(9) >> "R U 3Fw' M2 l b'"
+    assert not cube.isSolved() and cube.displaced > 0
+    cube >> "b l' M2 3Fw U' R'"
+    assert cube.isSolved() and cube.displaced == 0
+
+def test_storage_follows_disturbed_region():
+    n = 200
+    cube = SparseCube(n) >> "R"
+    # one outer turn moves a strip of n stickers off each of four faces
+    assert cube.displaced == 4 * n
+    cube >> "U"
+    assert cube.displaced < 10 * n
+
+def test_copy_and_dense_round_trip():
+    cube = SparseCube(6) >> "R U 2Rw' F2 E"
+    branch = cube.copy() >> "D"
+    assert cube.toDense().snapshot() != branch.toDense().snapshot()
+    dense = CubeN(6) >> "R U 2Rw' F2 E"
+    assert SparseCube.fromDense(dense).toDense().snapshot() == dense.snapshot()
+
+def test_from_dense_rejects_unknown_stickers():
+    cube = CubeN(3)
+    cube.U[0][0] = '?'
+    with pytest.raises(ValueError):
+        SparseCube.fromDense(cube)
+
+def test_invalid_width():
+    with pytest.raises(ValueError):
+        SparseCube(3) >> "3Rw"
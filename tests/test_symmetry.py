@@ -0,0 +1,60 @@
+import random
+
+import numpy as np
+import pytest
+
+from cubingtools import CubeN, Algorithm, canonical_state, canonical_algorithm
+from cubingtools.serialize import cubeCodes
+from cubingtools.symmetry import symmetryTables, symmetricCodes, symmetricAlgorithm, SYMMETRIES
+
+def randomAlg(moves, k, rng):
+    return Algorithm(' '.join(rng.choice(moves) + rng.choice(["", "'", "2"]) for _ in range(k)))
+
+def test_tables():
+    for n in (2, 3, 4):
+        perms, recolour = symmetryTables(n)
+        assert perms.shape == (SYMMETRIES, 6 * n * n) and recolour.shape == (SYMMETRIES, 6)
+        assert (perms[0] == np.arange(6 * n * n)).all()
+        assert len({p.tobytes() for p in perms}) == SYMMETRIES
+    with pytest.raises(ValueError):
+        symmetryTables(1)
+
+def test_solved_is_fixed():
+    for n in (2, 3, 5):
+        rows = symmetricCodes(CubeN(n))
+        assert (rows == rows[0]).all()
+
+@pytest.mark.parametrize("n,moves", [
+    (3, "U D F B R L M E S x y z u d f b r l".split()),
+    (4, "U D F B R L Uw Rw 3Fw Lw x y z".split()),
+])
+def test_states_and_algorithms_agree(n, moves):
+    rng = random.Random(n)
+    for s in range(SYMMETRIES):
+        alg = randomAlg(moves, 15, rng)
+        c = CubeN(n) >> alg
+        assert (symmetricCodes(c)[s] == cubeCodes(CubeN(n) >> symmetricAlgorithm(alg, s))).all()
+
+def test_canonical_state():
+    key = canonical_state(CubeN() >> "R U").snapshot()
+    for alg in ("R U", "L' U'", "F' U'", "U B", "D' L'"):
+        assert canonical_state(CubeN() >> alg).snapshot() == key
+    assert canonical_state(CubeN() >> "R U'").snapshot() != key
+
+def test_canonical_state_classes():
+    # the 18 single face turns of a 3x3 fall into two classes: quarter and half turns
+    keys = {canonical_state(CubeN() >> f"{f}{m}").snapshot() for f in "URFDLB" for m in ("", "'", "2")}
+    assert len(keys) == 2
+
+def test_canonical_state_keeps_cube():
+    c = CubeN(4, 'abcdef') >> "Rw U' 3Fw"
+    before = c.snapshot()
+    out = canonical_state(c)
+    assert c.snapshot() == before and out.cols == 'abcdef' and out.size == 4
+
+def test_canonical_algorithm():
+    assert canonical_algorithm("R U R' U'") == canonical_algorithm("L' U' L U")
+    assert str(canonical_algorithm("R U R' U'")) == str(canonical_algorithm("F U F' U'"))
+    alg = Algorithm("R U2 M' x Rw")
+    assert str(canonical_algorithm(alg)) in {str(symmetricAlgorithm(alg, s)) for s in range(SYMMETRIES)}
+    assert len(canonical_algorithm("")) == 0
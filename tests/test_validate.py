@@ -1,54 +1,107 @@
-# import pytest
-# from cubingtools.cube import *
-# from cubingtools.valid import *
-
-# from cubingtools.valid import _validateCornerExistence
-
-# def test_solved_is_valid():
-#     for n in range(2,50):
-#         c = CubeN(n)
-#         assert isValid(c.state, n)
-
-# def test_scrambles_are_valid():
-#     for n in [2,3,4,5,6,7,10,20]:
-#         c = CubeN(n)
-#         for _ in range(3):
-#             c.scramble()
-#             assert isValid(c.state, n)
-
-# def test_scrambles_are_valid_big():
-#     for n in [51,61]:
-#         c = CubeN(n)
-#         c.scramble()
-#         assert isValidCube(c)
-
-# def test_invalid_color_num():
-#     d = {'L': [['w', 'w', 'w'], ['w', 'w', 'w'], ['w', 'w', 'w']], 
-#          'U': [['g', 'g', 'g'], ['g', 'g', 'g'], ['g', 'g', 'g']], 
-#          'B': [['r', 'r', 'r'], ['r', 'r', 'r'], ['r', 'r', 'y']], # extra y here!
-#          'R': [['b', 'b', 'b'], ['b', 'b', 'b'], ['b', 'b', 'b']], 
-#          'F': [['o', 'o', 'o'], ['o', 'o', 'o'], ['o', 'o', 'o']], 
-#          'D': [['y', 'y', 'y'], ['y', 'y', 'y'], ['y', 'y', 'y']]}
-#     assert not isValid(d, 3)
-
-# def test_validate_corner_existence():
-#     colors = 'ejimda'
-
-#     for n in range(2,11):
-#         bad = CubeN(n, colors)
-#         bad.state['U'][n-1][n-1] = bad.state['U'][n-1][0]
-#         bad.state['R'][0][0]     = bad.state['F'][0][0]
-#         bad.state['F'][0][n-1]   = bad.state['L'][0][0]
-#         assert not _validateCornerExistence(bad.state, n, colors)
-
-#         bad.scramble()
-#         assert not _validateCornerExistence(bad.state, n, colors)
-
-#         bad2 = CubeN(n, colors)
-#         bad2.state['D'][0][0]     = bad2.state['U'][n-1][n-1]
-#         bad2.state['L'][n-1][n-1] = bad2.state['R'][0][0]
-#         bad2.state['F'][n-1][0]   = bad2.state['B'][0][n-1]
-#         assert not _validateCornerExistence(bad2.state, n, colors)
-
-#         bad2.scramble()
-#         assert not _validateCornerExistence(bad2.state, n, colors)
\ No newline at end of file
+import numpy as np
+import pytest
+
+from cubingtools.cube import *
+from cubingtools.valid import *
+from cubingtools.facelets import flatten
+
+def test_solved_is_valid():
+    for n in range(2, 12):
+        c = CubeN(n)
+        assert isValid(c.state, n)
+
+def test_scrambles_are_valid():
+    for n in [2, 3, 4, 5, 6, 7, 10]:
+        c = CubeN(n)
+        for _ in range(3):
+            c.scramble()
+            assert isValid(c.state, n)
+
+def test_scrambles_are_valid_big():
+    c = CubeN(21)
+    c.scramble()
+    assert isValidCube(c)
+
+def test_invalid_shape():
+    c = CubeN(3)
+    assert not isValid(c.state, 4)
+    c.state['U'].pop()
+    assert not isValid(c.state, 3)
+
+def test_invalid_color_num():
+    d = {'L': [['w', 'w', 'w'], ['w', 'w', 'w'], ['w', 'w', 'w']],
+         'U': [['g', 'g', 'g'], ['g', 'g', 'g'], ['g', 'g', 'g']],
+         'B': [['r', 'r', 'r'], ['r', 'r', 'r'], ['r', 'r', 'y']], # extra y here!
+         'R': [['b', 'b', 'b'], ['b', 'b', 'b'], ['b', 'b', 'b']],
+         'F': [['o', 'o', 'o'], ['o', 'o', 'o'], ['o', 'o', 'o']],
+         'D': [['y', 'y', 'y'], ['y', 'y', 'y'], ['y', 'y', 'y']]}
+    assert not isValid(d, 3)
+
+def test_validate_corner_existence():
+    colors = 'ejimda'
+
+    for n in range(2, 8):
+        bad = CubeN(n, colors)
+        bad.state['U'][n-1][n-1] = bad.state['U'][n-1][0]
+        bad.state['R'][0][0]     = bad.state['F'][0][0]
+        bad.state['F'][0][n-1]   = bad.state['L'][0][0]
+        assert not isValidCube(bad)
+
+        bad.scramble()
+        assert not isValidCube(bad)
+
+def test_twisted_corner():
+    for n in range(2, 7):
+        c = CubeN(n) >> "R U F'"
+        m = n - 1
+        s = c.state
+        s['U'][m][m], s['R'][0][0], s['F'][0][m] = s['F'][0][m], s['U'][m][m], s['R'][0][0]
+        assert not isValidCube(c)
+
+def test_flipped_and_swapped_edges():
+    for n in (3, 5):
+        m, k = n - 1, n // 2
+        c = CubeN(n)
+        c.state['U'][m][k], c.state['F'][0][k] = c.state['F'][0][k], c.state['U'][m][k]
+        assert not isValidCube(c)
+
+        # two edges swapped, corners untouched: odd permutation parity
+        c = CubeN(n)
+        c.state['U'][m][k], c.state['U'][k][m] = c.state['U'][k][m], c.state['U'][m][k]
+        c.state['F'][0][k], c.state['R'][0][k] = c.state['R'][0][k], c.state['F'][0][k]
+        assert not isValidCube(c)
+
+        # ... but fine together with two swapped corners (a T perm)
+        assert isValidCube(CubeN(n) >> "R U R' U' R' F R2 U' R' U' R U R' F'")
+
+def test_wings_cannot_flip():
+    for n in (4, 5, 6):
+        c = CubeN(n)
+        c.state['U'][n-1][1], c.state['F'][0][1] = c.state['F'][0][1], c.state['U'][n-1][1]
+        assert not isValidCube(c)
+
+        # the OLL parity of big cubes is a real state
+        assert isValidCube(CubeN(n) >> "Rw U2 x Rw U2 Rw U2 Rw' U2 Lw U2 Rw' U2 Rw U2 Rw' U2 Rw'")
+
+def test_centre_counts():
+    c = CubeN(4)
+    c.state['U'][1][1], c.state['F'][1][1] = c.state['F'][1][1], c.state['U'][1][1]
+    assert isValidCube(c)
+    c = CubeN(5)
+    c.state['U'][1][1], c.state['F'][1][2] = c.state['F'][1][2], c.state['U'][1][1]
+    assert not isValidCube(c)
+
+def test_validate_many():
+    states = []
+    for k in range(200):
+        c = CubeN(3)
+        c.scramble()
+        if k % 2:
+            s = c.state
+            s['U'][2][2], s['R'][0][0], s['F'][0][2] = s['F'][0][2], s['U'][2][2], s['R'][0][0]
+        states.append(flatten(c))
+    valid = validateMany(states, 3)
+    assert valid.tolist() == [k % 2 == 0 for k in range(200)]
+    assert validateMany(np.empty((0, 54)), 3).shape == (0,)
+    with pytest.raises(ValueError):
+        validateMany(states, 4)